@@ -0,0 +1,60 @@
+"""Add recipe_embeddings pgvector table
+
+Revision ID: 5d2e7a91c4b3
+Revises: 041640134cb5
+Create Date: 2026-10-17 10:12:34.118240
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d2e7a91c4b3"
+down_revision: Union[str, Sequence[str], None] = "041640134cb5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Output dimension of intfloat/multilingual-e5-large-instruct
+EMBEDDING_DIMENSION = 1024
+
+
+def _pgvector_available() -> bool:
+    bind = op.get_bind()
+    return bool(
+        bind.execute(
+            sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'vector'")
+        ).scalar()
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _pgvector_available():
+        raise RuntimeError(
+            "The pgvector extension is not installed on this PostgreSQL server. "
+            "Install it (e.g. use the pgvector/pgvector image) and run the "
+            "migrations again."
+        )
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    op.execute(f"""
+        CREATE TABLE recipe_embeddings (
+            collection VARCHAR(255) NOT NULL,
+            recipe_id INTEGER NOT NULL REFERENCES recipes (id) ON DELETE CASCADE,
+            embedding VECTOR({EMBEDDING_DIMENSION}) NOT NULL,
+            PRIMARY KEY (collection, recipe_id)
+        )
+    """)
+    op.execute("""
+        CREATE INDEX ix_recipe_embeddings_embedding_hnsw
+        ON recipe_embeddings USING hnsw (embedding vector_l2_ops)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS recipe_embeddings")
@@ -0,0 +1,31 @@
+"""Add recipe embedding_hash
+
+Revision ID: 8a4c1f0e2b6d
+Revises: 5d2e7a91c4b3
+Create Date: 2026-10-17 11:02:48.530117
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8a4c1f0e2b6d"
+down_revision: Union[str, Sequence[str], None] = "5d2e7a91c4b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "recipes", sa.Column("embedding_hash", sa.String(length=64), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("recipes", "embedding_hash")
@@ -0,0 +1,35 @@
+"""Add word_forms vocabulary table
+
+Revision ID: a9c2d5e7f3b8
+Revises: e2f8b4c6a9d1
+Create Date: 2026-10-17 16:21:07.318544
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a9c2d5e7f3b8"
+down_revision: Union[str, Sequence[str], None] = "e2f8b4c6a9d1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "word_forms",
+        sa.Column("word", sa.String(length=255), nullable=False),
+        sa.Column("forms", postgresql.ARRAY(sa.String()), nullable=False),
+        sa.PrimaryKeyConstraint("word"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("word_forms")
@@ -0,0 +1,55 @@
+"""Add vector_outbox table
+
+Revision ID: b8e5f2c9d7a3
+Revises: f6a3c8d2b9e4
+Create Date: 2026-10-17 18:32:51.640298
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b8e5f2c9d7a3"
+down_revision: Union[str, Sequence[str], None] = "f6a3c8d2b9e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "vector_outbox",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("recipe_id", sa.Integer(), nullable=False),
+        sa.Column("operation", sa.String(length=10), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "available_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_vector_outbox_available_at_id",
+        "vector_outbox",
+        ["available_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_vector_outbox_available_at_id", table_name="vector_outbox")
+    op.drop_table("vector_outbox")
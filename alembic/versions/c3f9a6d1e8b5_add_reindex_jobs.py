@@ -0,0 +1,59 @@
+"""Add reindex_jobs table
+
+Revision ID: c3f9a6d1e8b5
+Revises: b8e5f2c9d7a3
+Create Date: 2026-10-17 19:15:08.927413
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f9a6d1e8b5"
+down_revision: Union[str, Sequence[str], None] = "b8e5f2c9d7a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "reindex_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("base_collection", sa.String(length=255), nullable=False),
+        sa.Column("target_collection", sa.String(length=255), nullable=False),
+        sa.Column("model_id", sa.String(length=255), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("last_recipe_id", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("processed", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("total", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("docs_per_second", sa.Float(), server_default="0", nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column(
+            "started_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_reindex_jobs_base_collection", "reindex_jobs", ["base_collection"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_reindex_jobs_base_collection", table_name="reindex_jobs")
+    op.drop_table("reindex_jobs")
@@ -0,0 +1,135 @@
+"""Add recipe ingredient_terms
+
+Revision ID: c7d3e9a1f5b2
+Revises: 8a4c1f0e2b6d
+Create Date: 2026-10-17 14:21:05.318442
+
+"""
+
+import re
+from typing import Callable, Iterable, Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c7d3e9a1f5b2"
+down_revision: Union[str, Sequence[str], None] = "8a4c1f0e2b6d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+# The term derivation of this revision is kept here instead of importing
+# app.core.text_utils, so later changes to the app don't alter the migration
+def _word_forms_factory() -> Callable[[str], set[str]]:
+    import inflect
+    import pymorphy3
+
+    inflect_engine = inflect.engine()
+    morph = pymorphy3.MorphAnalyzer()
+
+    def word_forms(word: str) -> set[str]:
+        forms = {word}
+        if re.search("[а-яА-Я]", word):
+            parsed = morph.parse(word)[0]
+            forms.add(parsed.normal_form)
+            try:
+                plural = parsed.inflect({"plur", "nomn"})
+                if plural:
+                    forms.add(plural.word)
+            except Exception:
+                pass
+        else:
+            singular = inflect_engine.singular_noun(word)
+            if singular:
+                forms.add(singular)
+            plural = inflect_engine.plural(word)
+            if plural:
+                forms.add(plural)
+        return forms
+
+    return word_forms
+
+
+def _ingredient_terms(
+    names: Iterable[str], word_forms: Callable[[str], set[str]]
+) -> list[str]:
+    terms: set[str] = set()
+    for name in names:
+        words = re.findall(r"\w+", name.lower())
+        for start in range(len(words)):
+            for end in range(start + 1, len(words) + 1):
+                terms |= word_forms(" ".join(words[start:end]))
+    return sorted(terms)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "recipes",
+        sa.Column(
+            "ingredient_terms",
+            postgresql.ARRAY(sa.String()),
+            server_default=sa.text("'{}'"),
+            nullable=False,
+        ),
+    )
+
+    conn = op.get_bind()
+    recipes = sa.table(
+        "recipes",
+        sa.column("id", sa.Integer),
+        sa.column("ingredients", postgresql.JSONB),
+        sa.column("ingredient_terms", postgresql.ARRAY(sa.String())),
+    )
+    update = (
+        sa.update(recipes)
+        .where(recipes.c.id == sa.bindparam("recipe_id"))
+        .values(ingredient_terms=sa.bindparam("terms"))
+    )
+
+    word_forms = _word_forms_factory()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(recipes.c.id, recipes.c.ingredients)
+            .where(recipes.c.id > last_id)
+            .order_by(recipes.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        conn.execute(
+            update,
+            [
+                {
+                    "recipe_id": recipe_id,
+                    "terms": _ingredient_terms(
+                        (item.get("name", "") for item in ingredients or []),
+                        word_forms,
+                    ),
+                }
+                for recipe_id, ingredients in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+    op.create_index(
+        "ix_recipes_ingredient_terms",
+        "recipes",
+        ["ingredient_terms"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_recipes_ingredient_terms", table_name="recipes", postgresql_using="gin"
+    )
+    op.drop_column("recipes", "ingredient_terms")
@@ -0,0 +1,40 @@
+"""Add recipe list composite indexes
+
+Revision ID: d4b7e1a8c5f2
+Revises: a9c2d5e7f3b8
+Create Date: 2026-10-17 17:04:33.712905
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d4b7e1a8c5f2"
+down_revision: Union[str, Sequence[str], None] = "a9c2d5e7f3b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "ix_recipes_cooking_time_id": ["cooking_time_in_minutes", "id"],
+    "ix_recipes_title_id": ["title", "id"],
+    "ix_recipes_cuisine_cooking_time_id": ["cuisine", "cooking_time_in_minutes", "id"],
+    "ix_recipes_difficulty_cooking_time_id": [
+        "difficulty",
+        "cooking_time_in_minutes",
+        "id",
+    ],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, columns in INDEXES.items():
+        op.create_index(name, "recipes", columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in INDEXES:
+        op.drop_index(name, table_name="recipes")
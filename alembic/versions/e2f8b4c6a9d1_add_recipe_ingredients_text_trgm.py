@@ -0,0 +1,97 @@
+"""Add recipe ingredients_text with trigram index
+
+Revision ID: e2f8b4c6a9d1
+Revises: c7d3e9a1f5b2
+Create Date: 2026-10-17 15:08:42.906173
+
+"""
+
+import re
+from typing import Iterable, Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e2f8b4c6a9d1"
+down_revision: Union[str, Sequence[str], None] = "c7d3e9a1f5b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _flatten_ingredients(names: Iterable[str]) -> str:
+    """
+    Lowercase words of every ingredient name, names separated by " | ".
+    A copy of the app helper at this revision, migrations don't import app code
+    """
+    normalized = (" ".join(re.findall(r"\w+", name.lower())) for name in names)
+    return " | ".join(filter(None, normalized))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column(
+        "recipes",
+        sa.Column("ingredients_text", sa.Text(), server_default="", nullable=False),
+    )
+
+    conn = op.get_bind()
+    recipes = sa.table(
+        "recipes",
+        sa.column("id", sa.Integer),
+        sa.column("ingredients", postgresql.JSONB),
+        sa.column("ingredients_text", sa.Text),
+    )
+    update = (
+        sa.update(recipes)
+        .where(recipes.c.id == sa.bindparam("recipe_id"))
+        .values(ingredients_text=sa.bindparam("flat_text"))
+    )
+
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(recipes.c.id, recipes.c.ingredients)
+            .where(recipes.c.id > last_id)
+            .order_by(recipes.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        conn.execute(
+            update,
+            [
+                {
+                    "recipe_id": recipe_id,
+                    "flat_text": _flatten_ingredients(
+                        item.get("name", "") for item in ingredients or []
+                    ),
+                }
+                for recipe_id, ingredients in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+    op.create_index(
+        "ix_recipes_ingredients_text_trgm",
+        "recipes",
+        ["ingredients_text"],
+        postgresql_using="gin",
+        postgresql_ops={"ingredients_text": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_recipes_ingredients_text_trgm",
+        table_name="recipes",
+        postgresql_using="gin",
+    )
+    op.drop_column("recipes", "ingredients_text")
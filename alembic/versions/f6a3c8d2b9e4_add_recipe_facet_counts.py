@@ -0,0 +1,110 @@
+"""Add recipe_facet_counts summary table
+
+Revision ID: f6a3c8d2b9e4
+Revises: d4b7e1a8c5f2
+Create Date: 2026-10-17 17:46:19.204871
+
+"""
+
+import re
+from collections import Counter
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f6a3c8d2b9e4"
+down_revision: Union[str, Sequence[str], None] = "d4b7e1a8c5f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _normalize_ingredient(text: str) -> str:
+    """
+    Lowercase words of an ingredient name separated by single spaces.
+    A copy of the app helper at this revision, migrations don't import app code
+    """
+    return " ".join(re.findall(r"\w+", text.lower()))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "recipe_facet_counts",
+        sa.Column("facet", sa.String(length=20), nullable=False),
+        sa.Column("value", sa.String(length=255), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("facet", "value"),
+    )
+    op.create_index(
+        "ix_recipe_facet_counts_facet_count",
+        "recipe_facet_counts",
+        ["facet", "count"],
+    )
+
+    conn = op.get_bind()
+    recipes = sa.table(
+        "recipes",
+        sa.column("id", sa.Integer),
+        sa.column("cuisine", sa.String),
+        sa.column("difficulty", sa.String),
+        sa.column("ingredients", postgresql.JSONB),
+    )
+
+    counts: Counter[tuple[str, str]] = Counter()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(
+                recipes.c.id,
+                recipes.c.cuisine,
+                recipes.c.difficulty,
+                recipes.c.ingredients,
+            )
+            .where(recipes.c.id > last_id)
+            .order_by(recipes.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        for row in rows:
+            counts["total", ""] += 1
+            if row.cuisine:
+                counts["cuisine", row.cuisine] += 1
+            counts["difficulty", row.difficulty] += 1
+            names = {
+                _normalize_ingredient(item.get("name", ""))
+                for item in row.ingredients or []
+            }
+            for name in filter(None, names):
+                counts["ingredient", name] += 1
+        last_id = rows[-1].id
+
+    if counts:
+        facet_counts = sa.table(
+            "recipe_facet_counts",
+            sa.column("facet", sa.String),
+            sa.column("value", sa.String),
+            sa.column("count", sa.Integer),
+        )
+        conn.execute(
+            sa.insert(facet_counts),
+            [
+                {"facet": facet, "value": value, "count": count}
+                for (facet, value), count in counts.items()
+            ],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_recipe_facet_counts_facet_count", table_name="recipe_facet_counts"
+    )
+    op.drop_table("recipe_facet_counts")
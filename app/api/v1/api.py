@@ -1,5 +1,8 @@
 from fastapi import APIRouter
-from .endpoints import recipes
+
+from .endpoints import admin, metrics, recipes
 
 api_router = APIRouter()
 api_router.include_router(recipes.router, prefix="/recipes", tags=["recipes"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
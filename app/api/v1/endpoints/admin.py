@@ -0,0 +1,81 @@
+import secrets
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import schemas
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, get_db
+from app.services import reindex_service
+
+
+def require_admin_token(
+    x_admin_token: Annotated[Optional[str], Header()] = None,
+) -> None:
+    """
+    Admin endpoints need the shared ADMIN_TOKEN, they don't exist without one
+    """
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not secrets.compare_digest(
+        x_admin_token.encode(), settings.ADMIN_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+router = APIRouter(dependencies=[Depends(require_admin_token)])
+
+
+@router.post(
+    "/reindex",
+    response_model=schemas.ReindexStatus,
+    status_code=202,
+    operation_id="start_reindex",
+)
+async def start_reindex(
+    *,
+    restart: bool = Query(
+        False, description="Start over instead of resuming an unfinished job"
+    ),
+    batch_size: Optional[int] = Query(None, ge=1, le=10000),
+) -> schemas.ReindexStatus:
+    """
+    Re-embed all recipes into a new collection in the background,
+    resuming an interrupted job from its checkpoint.
+    A change of embedding model is refused (409), it needs the offline script
+    """
+    session = AsyncSessionLocal()
+    try:
+        job, should_run = await reindex_service.start_or_resume(
+            session, restart=restart
+        )
+        status = reindex_service.job_status(job)
+    except reindex_service.ModelChangeError as ex:
+        await session.close()
+        raise HTTPException(status_code=409, detail=str(ex)) from ex
+    except Exception:
+        await session.close()
+        raise
+
+    if should_run:
+        reindex_service.run_in_background(session, job=job, batch_size=batch_size)
+    else:
+        await session.close()
+    return status
+
+
+@router.get(
+    "/reindex/{job_id}",
+    response_model=schemas.ReindexStatus,
+    operation_id="read_reindex_status",
+)
+async def read_reindex_status(
+    *,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    job_id: int,
+) -> schemas.ReindexStatus:
+    job = await reindex_service.get_job(db, job_id=job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Reindex job not found")
+    return reindex_service.job_status(job)
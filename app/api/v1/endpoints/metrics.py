@@ -0,0 +1,67 @@
+from typing import Annotated, Any, Dict
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.ingredient_index import ingredient_index
+from app.core.text_utils import word_forms_stats
+from app.db.session import get_db
+from app.services import recipe_service
+
+router = APIRouter()
+
+
+@router.get(
+    "/vector-store",
+    response_model=Dict[str, Any],
+    operation_id="read_vector_store_metrics",
+)
+async def read_vector_store_metrics() -> Dict[str, Any]:
+    return recipe_service.vector_store.stats()
+
+
+@router.get(
+    "/search-cursors",
+    response_model=Dict[str, Any],
+    operation_id="read_search_cursor_metrics",
+)
+async def read_search_cursor_metrics() -> Dict[str, Any]:
+    return recipe_service.search_candidates.stats()
+
+
+@router.get(
+    "/similar-recipes",
+    response_model=Dict[str, Any],
+    operation_id="read_similar_recipes_metrics",
+)
+async def read_similar_recipes_metrics() -> Dict[str, Any]:
+    return recipe_service.similar_recipes.stats()
+
+
+@router.get(
+    "/ingredient-index",
+    response_model=Dict[str, Any],
+    operation_id="read_ingredient_index_metrics",
+)
+async def read_ingredient_index_metrics() -> Dict[str, Any]:
+    return ingredient_index.stats()
+
+
+@router.get(
+    "/word-forms",
+    response_model=Dict[str, Any],
+    operation_id="read_word_forms_metrics",
+)
+async def read_word_forms_metrics() -> Dict[str, Any]:
+    return word_forms_stats()
+
+
+@router.get(
+    "/vector-indexer",
+    response_model=Dict[str, Any],
+    operation_id="read_vector_indexer_metrics",
+)
+async def read_vector_indexer_metrics(
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> Dict[str, Any]:
+    return await recipe_service.get_vector_outbox_stats(db)
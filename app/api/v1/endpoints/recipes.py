@@ -1,11 +1,21 @@
 import asyncio
 import uuid
-from typing import Annotated, List, Optional
-
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from typing import Annotated, List, Optional, Sequence, Union
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models, schemas
+from app.api.v1.serialization import json_list_response
+from app.core.pagination import InvalidCursorError
 from app.core.s3_client import s3_client
 from app.db.session import get_db
 from app.services import image_service, recipe_service
@@ -25,27 +35,134 @@ async def create_new_recipe(
     return schemas.Recipe.model_validate(db_recipe)
 
 
-@router.get("/", response_model=List[schemas.Recipe], operation_id="read_recipes")
+def _recipes_response(
+    recipes: Sequence[models.Recipe],
+    view: recipe_service.RecipeView,
+    next_cursor: Optional[str],
+) -> Response:
+    model = schemas.RecipeSummary if view == "summary" else schemas.Recipe
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return json_list_response(model, recipes, headers=headers)
+
+
+@router.get(
+    "/",
+    response_model=Union[List[schemas.Recipe], List[schemas.RecipeSummary]],
+    operation_id="read_recipes",
+)
 async def read_recipes(
     *,
     db: Annotated[AsyncSession, Depends(get_db)],
     skip: int = Query(0, qe=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None,
+        description="X-Next-Cursor header of the previous page",
+        max_length=200,
+    ),
+    include_ingredients: Optional[str] = Query(
+        None, description="Comma-separated ingredient to include", max_length=500
+    ),
+    exclude_ingredients: Optional[str] = Query(
+        None, description="Comma-separated ingredient to exclude", max_length=500
+    ),
+    match: Annotated[
+        recipe_service.IngredientMatch,
+        Query(description="Exact word forms, word prefix or fuzzy (typo tolerant)"),
+    ] = "exact",
+    max_cooking_time: Optional[int] = Query(
+        None, ge=0, description="Maximum cooking time in minutes"
+    ),
+    difficulty: Optional[str] = Query(
+        None, description="Exact difficulty, e.g. easy", max_length=50
+    ),
+    cuisine: Optional[str] = Query(
+        None, description="Exact cuisine, e.g. Italian", max_length=50
+    ),
+    sort: Annotated[
+        recipe_service.RecipeSort,
+        Query(description="Newest first, quickest first or by title"),
+    ] = "newest",
+    view: Annotated[
+        recipe_service.RecipeView,
+        Query(description="summary leaves out the instructions"),
+    ] = "full",
+) -> Response:
+    try:
+        recipes, next_cursor = await recipe_service.get_recipes_page(
+            db=db,
+            skip=skip,
+            limit=limit,
+            include_str=include_ingredients,
+            exclude_str=exclude_ingredients,
+            match=match,
+            max_cooking_time=max_cooking_time,
+            difficulty=difficulty,
+            cuisine=cuisine,
+            sort=sort,
+            view=view,
+            cursor=cursor,
+        )
+    except InvalidCursorError as ex:
+        raise HTTPException(status_code=400, detail=str(ex)) from ex
+
+    return _recipes_response(recipes, view, next_cursor)
+
+
+@router.get(
+    "/facets", response_model=schemas.RecipeFacets, operation_id="read_recipe_facets"
+)
+async def read_recipe_facets(
+    *,
+    db: Annotated[AsyncSession, Depends(get_db)],
     include_ingredients: Optional[str] = Query(
         None, description="Comma-separated ingredient to include", max_length=500
     ),
     exclude_ingredients: Optional[str] = Query(
         None, description="Comma-separated ingredient to exclude", max_length=500
     ),
-) -> list[schemas.Recipe]:
-    recipes = await recipe_service.get_all_recipes(
+    match: Annotated[
+        recipe_service.IngredientMatch,
+        Query(description="Exact word forms, word prefix or fuzzy (typo tolerant)"),
+    ] = "exact",
+    ingredients_limit: int = Query(
+        recipe_service.FACET_INGREDIENTS_LIMIT, ge=1, le=100
+    ),
+) -> schemas.RecipeFacets:
+    return await recipe_service.get_recipe_facets(
         db=db,
-        skip=skip,
-        limit=limit,
         include_str=include_ingredients,
         exclude_str=exclude_ingredients,
+        match=match,
+        ingredients_limit=ingredients_limit,
+    )
+
+
+@router.get(
+    "/{recipe_id}/similar",
+    response_model=Union[List[schemas.Recipe], List[schemas.RecipeSummary]],
+    operation_id="read_similar_recipes",
+)
+async def read_similar_recipes(
+    *,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    recipe_id: int,
+    limit: int = Query(
+        recipe_service.SIMILAR_RESULTS_LIMIT,
+        ge=1,
+        le=recipe_service.SIMILAR_MAX_RESULTS,
+    ),
+    view: Annotated[
+        recipe_service.RecipeView,
+        Query(description="summary leaves out the instructions"),
+    ] = "full",
+) -> Response:
+    recipes = await recipe_service.get_similar_recipes(
+        db=db, recipe_id=recipe_id, limit=limit, view=view
     )
-    return [schemas.Recipe.model_validate(r) for r in recipes]
+    if recipes is None:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    return _recipes_response(recipes, view, None)
 
 
 @router.get(
@@ -96,7 +213,9 @@ async def delete_existing_recipe(
 
 
 @router.get(
-    "/search/", response_model=List[schemas.Recipe], operation_id="search_recipes"
+    "/search/",
+    response_model=Union[List[schemas.Recipe], List[schemas.RecipeSummary]],
+    operation_id="search_recipes",
 )
 async def search_recipes(
     *,
@@ -110,14 +229,107 @@ async def search_recipes(
     exclude_ingredients: Optional[str] = Query(
         None, description="Comma-separated ingredient to exclude", max_length=500
     ),
-) -> list[schemas.Recipe]:
-    recipes = await recipe_service.search_recipes_by_vector(
-        db=db,
-        query_str=q,
-        include_str=include_ingredients,
-        exclude_str=exclude_ingredients,
+    match: Annotated[
+        recipe_service.IngredientMatch,
+        Query(description="Exact word forms, word prefix or fuzzy (typo tolerant)"),
+    ] = "exact",
+    max_cooking_time: Optional[int] = Query(
+        None, ge=0, description="Maximum cooking time in minutes"
+    ),
+    difficulty: Optional[str] = Query(
+        None, description="Exact difficulty, e.g. easy", max_length=50
+    ),
+    cuisine: Optional[str] = Query(
+        None, description="Exact cuisine, e.g. Italian", max_length=50
+    ),
+    limit: int = Query(recipe_service.SEARCH_RESULTS_LIMIT, ge=1, le=50),
+    cursor: Optional[str] = Query(
+        None, description="X-Next-Cursor header of the previous page", max_length=200
+    ),
+    view: Annotated[
+        recipe_service.RecipeView,
+        Query(description="summary leaves out the instructions"),
+    ] = "full",
+) -> Response:
+    try:
+        recipes, next_cursor = await recipe_service.search_recipes_page(
+            db=db,
+            query_str=q,
+            include_str=include_ingredients,
+            exclude_str=exclude_ingredients,
+            match=match,
+            max_cooking_time=max_cooking_time,
+            difficulty=difficulty,
+            cuisine=cuisine,
+            limit=limit,
+            view=view,
+            cursor=cursor,
+        )
+    except InvalidCursorError as ex:
+        raise HTTPException(status_code=400, detail=str(ex)) from ex
+
+    return _recipes_response(recipes, view, next_cursor)
+
+
+@router.post(
+    "/search/batch",
+    response_model=Union[
+        List[schemas.RecipeSearchResult], List[schemas.RecipeSummarySearchResult]
+    ],
+    operation_id="search_recipes_batch",
+)
+async def search_recipes_batch(
+    *,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    search_in: schemas.RecipeBatchSearch,
+) -> Response:
+    """
+    Run many searches at once, results are grouped in the order of the queries
+    """
+    results = await recipe_service.search_recipes_batch(
+        db=db, queries=search_in.queries, view=search_in.view
+    )
+    model = (
+        schemas.RecipeSummarySearchResult
+        if search_in.view == "summary"
+        else schemas.RecipeSearchResult
+    )
+    rows = [
+        {"q": query.q, "recipes": recipes}
+        for query, recipes in zip(search_in.queries, results, strict=True)
+    ]
+    return json_list_response(model, rows)
+
+
+@router.get(
+    "/pantry/",
+    response_model=List[schemas.PantryRecipe],
+    operation_id="search_recipes_by_pantry",
+)
+async def search_recipes_by_pantry(
+    *,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    ingredients: str = Query(
+        ..., description="Comma-separated ingredients you have", max_length=1000
+    ),
+    max_missing: int = Query(
+        0, ge=0, le=100, description="How many recipe ingredients may be missing"
+    ),
+    limit: int = Query(recipe_service.PANTRY_RESULTS_LIMIT, ge=1, le=100),
+) -> Response:
+    matches = await recipe_service.search_pantry(
+        db=db, pantry_str=ingredients, max_missing=max_missing, limit=limit
     )
-    return [schemas.Recipe.model_validate(r) for r in recipes]
+    rows = [
+        {
+            **{name: getattr(m.recipe, name) for name in schemas.Recipe.model_fields},
+            "covered_ingredients": m.covered,
+            "missing_ingredients": m.missing,
+            "coverage": m.coverage,
+        }
+        for m in matches
+    ]
+    return json_list_response(schemas.PantryRecipe, rows)
 
 
 @router.post(
@@ -0,0 +1,29 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: type[BaseModel]) -> TypeAdapter[List[Any]]:
+    return TypeAdapter(List[model])  # type: ignore[valid-type]
+
+
+def json_list_response(
+    model: type[BaseModel],
+    rows: Sequence[Any],
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Validate ORM rows (or dicts) against `model` once and dump them straight
+    to JSON bytes in pydantic-core. FastAPI returns a Response as is, so the
+    endpoint's response_model is then only used for the OpenAPI schema
+    """
+    adapter = _list_adapter(model)
+    items = adapter.validate_python(rows, from_attributes=True)
+    return Response(
+        content=adapter.dump_json(items),
+        media_type="application/json",
+        headers=headers,
+    )
@@ -1,4 +1,4 @@
-from typing import Self
+from typing import Literal, Self
 
 from pydantic import computed_field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -22,6 +22,10 @@ class Settings(BaseSettings):
     CHROMA_PORT: int = 8000
     CHROMA_COLLECTION_NAME: str = ""
 
+    VECTOR_BACKEND: Literal["chroma", "embedded", "pgvector"] = "chroma"
+    VECTOR_INDEX_PATH: str = "data/vector_index"
+    VECTOR_INDEX_SNAPSHOT_INTERVAL_SECONDS: float = 30.0
+
     HF_TOKEN: str = ""
 
     S3_ENDPOINT: str = "http://minio:9000"
@@ -36,6 +40,41 @@ class Settings(BaseSettings):
     MAX_IMAGE_HEIGHT: int = 8192
 
     EMBEDDING_MODEL: str = "intfloat/multilingual-e5-large-instruct"
+    EMBEDDING_DIMENSION: int = 1024
+    EMBEDDING_ENGINE: Literal["torch", "onnx"] = "torch"
+    EMBEDDING_ONNX_MODEL_PATH: str = "data/onnx_model"
+    EMBEDDING_ONNX_FILE_NAME: str = "onnx/model_qint8_avx512_vnni.onnx"
+    EMBEDDING_CACHE_SIZE: int = 2048
+    EMBEDDING_CACHE_TTL_SECONDS: float = 3600.0
+    EMBEDDING_BATCH_MAX_SIZE: int = 32
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = 5.0
+    EMBEDDING_ENCODE_BATCH_SIZE: int = 32
+    VECTOR_UPSERT_BATCH_SIZE: int = 256
+    SEMANTIC_DOCUMENT_MAX_CHUNKS: int = 1
+
+    WORD_FORMS_CACHE_SIZE: int = 50000
+    WORD_FORMS_VOCABULARY_ENABLED: bool = True
+
+    INGREDIENT_INDEX_ENABLED: bool = True
+    INGREDIENT_INDEX_BUILD_BATCH_SIZE: int = 5000
+
+    SEARCH_EXACT_MAX_CANDIDATES: int = 1000
+    SEARCH_MAX_CANDIDATES: int = 800
+    SEARCH_CURSOR_CACHE_SIZE: int = 1024
+    SEARCH_CURSOR_TTL_SECONDS: float = 300.0
+    SIMILAR_RECIPES_CACHE_SIZE: int = 4096
+    SIMILAR_RECIPES_TTL_SECONDS: float = 3600.0
+
+    VECTOR_SYNC_MODE: Literal["background", "inline"] = "background"
+    VECTOR_OUTBOX_BATCH_SIZE: int = 64
+    VECTOR_OUTBOX_POLL_SECONDS: float = 1.0
+    VECTOR_OUTBOX_RETRY_MAX_SECONDS: float = 300.0
+    VECTOR_OUTBOX_MAX_ATTEMPTS: int = 10
+
+    REINDEX_BATCH_SIZE: int = 256
+    REINDEX_STALE_SECONDS: float = 300.0
+
+    ADMIN_TOKEN: str = ""
 
     @model_validator(mode="after")
     def check_required_fields(self) -> Self:
@@ -0,0 +1,307 @@
+import logging
+import sys
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncIterable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ID_DTYPE = np.int32
+SLOT_DTYPE = np.int64
+
+# Ingredient slots are encoded as recipe_id * MAX_INGREDIENT_SLOTS + position,
+# recipes are limited to 100 ingredients by the schemas
+MAX_INGREDIENT_SLOTS = 128
+
+# Recipe id and the terms of each of its ingredients
+IndexRow = Tuple[int, Sequence[Sequence[str]]]
+
+
+def _intersect(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Intersection of two sorted unique id arrays, probing the larger one
+    """
+    if a.size > b.size:
+        a, b = b, a
+    if not a.size:
+        return a
+    positions = np.minimum(np.searchsorted(b, a), b.size - 1)
+    common: np.ndarray = a[b[positions] == a]
+    return common
+
+
+def _difference(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    if not a.size or not b.size:
+        return a
+    positions = np.minimum(np.searchsorted(b, a), b.size - 1)
+    remaining: np.ndarray = a[b[positions] != a]
+    return remaining
+
+
+def _union(arrays: Iterable[Optional[np.ndarray]], dtype: Any = ID_DTYPE) -> np.ndarray:
+    present = [a for a in arrays if a is not None and a.size]
+    if not present:
+        return np.zeros(0, dtype=dtype)
+    if len(present) == 1:
+        return present[0]
+    return np.unique(np.concatenate(present))
+
+
+def _merge(existing: Optional[np.ndarray], new_ids: np.ndarray) -> np.ndarray:
+    if existing is None or not existing.size:
+        return new_ids
+    if new_ids[0] > existing[-1]:
+        # New recipes get increasing ids, appending keeps the array sorted
+        return np.concatenate([existing, new_ids])
+    return np.union1d(existing, new_ids)
+
+
+def _slot_range(recipe_id: int, count: int) -> np.ndarray:
+    start = recipe_id * MAX_INGREDIENT_SLOTS
+    return np.arange(start, start + min(count, MAX_INGREDIENT_SLOTS), dtype=SLOT_DTYPE)
+
+
+@dataclass
+class _GroupedRows:
+    ids_by_term: Dict[str, List[int]] = field(default_factory=lambda: defaultdict(list))
+    slots_by_term: Dict[str, List[int]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    ids: List[int] = field(default_factory=list)
+    slots: List[int] = field(default_factory=list)
+
+    def add(self, recipe_id: int, ingredient_terms: Sequence[Sequence[str]]) -> None:
+        self.ids.append(recipe_id)
+        recipe_terms: Set[str] = set()
+        for position, terms in enumerate(ingredient_terms):
+            recipe_terms.update(terms)
+            if position >= MAX_INGREDIENT_SLOTS:
+                continue
+            slot = recipe_id * MAX_INGREDIENT_SLOTS + position
+            self.slots.append(slot)
+            for term in set(terms):
+                self.slots_by_term[term].append(slot)
+        for term in recipe_terms:
+            self.ids_by_term[term].append(recipe_id)
+
+
+@dataclass(frozen=True)
+class PantryCoverage:
+    """
+    Recipes sharing at least one ingredient with a pantry, as aligned arrays
+    """
+
+    recipe_ids: np.ndarray
+    covered: np.ndarray
+    totals: np.ndarray
+
+
+class IngredientIndex:
+    """
+    In-process inverted index from ingredient term to sorted arrays of recipe ids
+    and of ingredient slots (one slot per ingredient of a recipe).
+    Arrays are never modified in place: writers swap in new arrays under a lock,
+    so readers can use the arrays they picked up without holding it
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._postings: Dict[str, np.ndarray] = {}
+        self._slot_postings: Dict[str, np.ndarray] = {}
+        self._all_ids: np.ndarray = np.zeros(0, dtype=ID_DTYPE)
+        self._all_slots: np.ndarray = np.zeros(0, dtype=SLOT_DTYPE)
+        self.ready = False
+        self.build_seconds = 0.0
+
+    async def build(self, batches: AsyncIterable[Sequence[IndexRow]]) -> None:
+        """
+        Replace the index with the rows of `batches`
+        """
+        start_time = time.perf_counter()
+        id_chunks: Dict[str, List[np.ndarray]] = defaultdict(list)
+        slot_chunks: Dict[str, List[np.ndarray]] = defaultdict(list)
+        all_ids: List[np.ndarray] = []
+        all_slots: List[np.ndarray] = []
+
+        async for batch in batches:
+            grouped = _GroupedRows()
+            for recipe_id, ingredient_terms in batch:
+                grouped.add(recipe_id, ingredient_terms)
+            for term, ids in grouped.ids_by_term.items():
+                id_chunks[term].append(np.asarray(ids, dtype=ID_DTYPE))
+            for term, slots in grouped.slots_by_term.items():
+                slot_chunks[term].append(np.asarray(slots, dtype=SLOT_DTYPE))
+            all_ids.append(np.asarray(grouped.ids, dtype=ID_DTYPE))
+            all_slots.append(np.asarray(grouped.slots, dtype=SLOT_DTYPE))
+
+        postings = {
+            sys.intern(term): np.unique(np.concatenate(parts))
+            for term, parts in id_chunks.items()
+        }
+        slot_postings = {
+            sys.intern(term): np.unique(np.concatenate(parts))
+            for term, parts in slot_chunks.items()
+        }
+
+        with self._lock:
+            self._postings = postings
+            self._slot_postings = slot_postings
+            self._all_ids = _union(all_ids)
+            self._all_slots = _union(all_slots, dtype=SLOT_DTYPE)
+            self.ready = True
+        self.build_seconds = time.perf_counter() - start_time
+
+        logger.info(
+            f"Built ingredient index with {len(postings)} terms for "
+            f"{self._all_ids.size} recipes in {self.build_seconds:.2f}s."
+        )
+
+    def add(self, recipe_id: int, ingredient_terms: Sequence[Sequence[str]]) -> None:
+        self.add_many([(recipe_id, ingredient_terms)])
+
+    def add_many(self, rows: Sequence[IndexRow]) -> None:
+        if not self.ready or not rows:
+            return
+
+        grouped = _GroupedRows()
+        for recipe_id, ingredient_terms in rows:
+            grouped.add(recipe_id, ingredient_terms)
+
+        with self._lock:
+            for term, ids in grouped.ids_by_term.items():
+                self._postings[sys.intern(term)] = _merge(
+                    self._postings.get(term), np.unique(np.asarray(ids, ID_DTYPE))
+                )
+            for term, slots in grouped.slots_by_term.items():
+                self._slot_postings[sys.intern(term)] = _merge(
+                    self._slot_postings.get(term),
+                    np.unique(np.asarray(slots, SLOT_DTYPE)),
+                )
+            self._all_ids = _merge(
+                self._all_ids, np.unique(np.asarray(grouped.ids, ID_DTYPE))
+            )
+            if grouped.slots:
+                self._all_slots = _merge(
+                    self._all_slots, np.unique(np.asarray(grouped.slots, SLOT_DTYPE))
+                )
+
+    def remove(self, recipe_id: int, ingredient_terms: Sequence[Sequence[str]]) -> None:
+        if not self.ready:
+            return
+
+        removed_id = np.asarray([recipe_id], dtype=ID_DTYPE)
+        removed_slots = _slot_range(recipe_id, len(ingredient_terms))
+        recipe_terms = {term for terms in ingredient_terms for term in terms}
+
+        with self._lock:
+            for postings, removed in (
+                (self._postings, removed_id),
+                (self._slot_postings, removed_slots),
+            ):
+                for term in recipe_terms:
+                    posting = postings.get(term)
+                    if posting is None:
+                        continue
+                    remaining = _difference(posting, removed)
+                    if remaining.size:
+                        postings[term] = remaining
+                    else:
+                        del postings[term]
+            self._all_ids = _difference(self._all_ids, removed_id)
+            self._all_slots = _difference(self._all_slots, removed_slots)
+
+    def update(
+        self,
+        recipe_id: int,
+        old_terms: Sequence[Sequence[str]],
+        new_terms: Sequence[Sequence[str]],
+    ) -> None:
+        self.remove(recipe_id, old_terms)
+        self.add(recipe_id, new_terms)
+
+    def filter_ids(
+        self, include: Sequence[Sequence[str]], exclude: Sequence[str] = ()
+    ) -> np.ndarray:
+        """
+        Sorted ids of recipes holding a term of every `include` group
+        and none of the `exclude` terms
+        """
+        postings = self._postings
+
+        result: Optional[np.ndarray] = None
+        for group in include:
+            matched = _union(postings.get(term) for term in group)
+            result = matched if result is None else _intersect(result, matched)
+            if not result.size:
+                return result
+
+        if result is None:
+            result = self._all_ids
+        if exclude:
+            result = _difference(result, _union(postings.get(t) for t in exclude))
+        return result
+
+    def pantry_coverage(self, pantry_terms: Iterable[str]) -> PantryCoverage:
+        """
+        Per recipe, how many of its ingredients share a term with the pantry
+        and how many ingredients it has in total
+        """
+        slot_postings = self._slot_postings
+        all_slots = self._all_slots
+
+        covered_slots = _union(
+            (slot_postings.get(term) for term in set(pantry_terms)), dtype=SLOT_DTYPE
+        )
+        recipe_ids, covered = np.unique(
+            covered_slots // MAX_INGREDIENT_SLOTS, return_counts=True
+        )
+        first_slots = recipe_ids * MAX_INGREDIENT_SLOTS
+        totals = np.searchsorted(
+            all_slots, first_slots + MAX_INGREDIENT_SLOTS
+        ) - np.searchsorted(all_slots, first_slots)
+
+        return PantryCoverage(recipe_ids=recipe_ids, covered=covered, totals=totals)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            postings = list(self._postings.items())
+            slot_postings = list(self._slot_postings.items())
+            all_ids = self._all_ids
+            all_slots = self._all_slots
+
+        memory_bytes = sum(
+            sys.getsizeof(term) + sys.getsizeof(ids)
+            for term, ids in postings + slot_postings
+        )
+        memory_bytes += sys.getsizeof(self._postings) + sys.getsizeof(
+            self._slot_postings
+        )
+        memory_bytes += sys.getsizeof(all_ids) + sys.getsizeof(all_slots)
+
+        return {
+            "ready": self.ready,
+            "build_seconds": round(self.build_seconds, 3),
+            "recipes": int(all_ids.size),
+            "ingredients": int(all_slots.size),
+            "terms": len(postings),
+            "postings": sum(int(ids.size) for _, ids in postings),
+            "slot_postings": sum(int(slots.size) for _, slots in slot_postings),
+            "memory_bytes": memory_bytes,
+        }
+
+
+ingredient_index = IngredientIndex()
@@ -0,0 +1,28 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """
+    Opaque url-safe token for a pagination position
+    """
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error) as ex:
+        raise InvalidCursorError("Malformed cursor") from ex
+
+    if not isinstance(payload, dict):
+        raise InvalidCursorError("Malformed cursor")
+    return payload
@@ -1,12 +1,18 @@
 import re
-from typing import Any, cast
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Mapping, cast
 
 import inflect
 import pymorphy3
 
+from app.core.config import settings
+
 inflect_engine = inflect.engine()
 morph = pymorphy3.MorphAnalyzer()
 
+# Precomputed forms loaded from the word_forms table, see load_vocabulary
+_vocabulary: Dict[str, frozenset[str]] = {}
+
 
 def is_cyrillic(text: str) -> bool:
     """
@@ -24,6 +30,21 @@ def get_word_forms(word: str) -> set[str]:
     if not clean_word:
         return set()
 
+    forms = _vocabulary.get(clean_word)
+    if forms is None:
+        forms = _cached_word_forms(clean_word)
+    return set(forms)
+
+
+@lru_cache(maxsize=settings.WORD_FORMS_CACHE_SIZE)
+def _cached_word_forms(clean_word: str) -> frozenset[str]:
+    return frozenset(compute_word_forms(clean_word))
+
+
+def compute_word_forms(clean_word: str) -> set[str]:
+    """
+    Run the morphology for a lowercased, stripped word without any caching
+    """
     forms = {clean_word}
 
     if is_cyrillic(clean_word):
@@ -48,3 +69,68 @@ def get_word_forms(word: str) -> set[str]:
             forms.add(plural)
 
     return forms
+
+
+def load_vocabulary(entries: Mapping[str, Iterable[str]]) -> None:
+    """
+    Replace the precomputed word forms consulted before the morphology
+    """
+    global _vocabulary
+    _vocabulary = {word: frozenset(forms) for word, forms in entries.items()}
+
+
+def word_forms_stats() -> Dict[str, Any]:
+    cache_info = _cached_word_forms.cache_info()
+    return {
+        "vocabulary_size": len(_vocabulary),
+        "cache_size": cache_info.currsize,
+        "cache_max_size": cache_info.maxsize,
+        "cache_hits": cache_info.hits,
+        "cache_misses": cache_info.misses,
+    }
+
+
+def get_ingredient_phrases(names: Iterable[str]) -> set[str]:
+    """
+    Every word sequence of the normalized ingredient names
+    """
+    phrases: set[str] = set()
+    for name in names:
+        words = normalize_ingredient(name).split()
+        for start in range(len(words)):
+            for end in range(start + 1, len(words) + 1):
+                phrases.add(" ".join(words[start:end]))
+    return phrases
+
+
+def normalize_ingredient(text: str) -> str:
+    """
+    Lowercase words of an ingredient name separated by single spaces
+    """
+    return " ".join(re.findall(r"\w+", text.lower()))
+
+
+def get_ingredient_terms(names: Iterable[str]) -> list[str]:
+    """
+    Word forms of every word sequence of the ingredient names.
+    A filter item matches a recipe when its own forms intersect these terms
+    """
+    terms: set[str] = set()
+    for phrase in get_ingredient_phrases(names):
+        terms |= get_word_forms(phrase)
+
+    return sorted(terms)
+
+
+def get_ingredient_term_groups(names: Iterable[str]) -> list[list[str]]:
+    """
+    get_ingredient_terms of every ingredient name on its own
+    """
+    return [get_ingredient_terms([name]) for name in names]
+
+
+def flatten_ingredients(names: Iterable[str]) -> str:
+    """
+    Normalized ingredient names in one string, for trigram matching
+    """
+    return " | ".join(filter(None, (normalize_ingredient(name) for name in names)))
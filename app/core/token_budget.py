@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+from typing import Any, List, Sequence
+
+# Upper bound of characters per token, longer sections are cut before
+# tokenizing so a 50k character text does not go through the tokenizer
+MAX_CHARS_PER_TOKEN = 12
+
+# Joining sections with a space may cost a token the separate counts missed
+SECTION_SEPARATOR_TOKENS = 1
+
+
+@dataclass(frozen=True)
+class DocumentSection:
+    text: str
+    # Sections with a lower priority are truncated first
+    priority: int
+
+
+class TokenBudget:
+    """
+    Fits document sections into the max sequence length of an embedding model,
+    cutting the lowest priority sections at token boundaries
+    """
+
+    def __init__(self, tokenizer: Any, max_tokens: int) -> None:
+        self.tokenizer = tokenizer
+        self.max_tokens = max(1, max_tokens)
+
+    @classmethod
+    def for_model(cls, model: Any) -> "TokenBudget":
+        tokenizer = model.tokenizer
+        special_tokens = tokenizer.num_special_tokens_to_add(pair=False)
+        return cls(tokenizer, model.max_seq_length - special_tokens)
+
+    def _token_ends(self, text: str, limit: int) -> List[int]:
+        """
+        End offsets in `text` of its first tokens, at least `limit` of them
+        when the text is that long
+        """
+        text = text[: limit * MAX_CHARS_PER_TOKEN]
+        if getattr(self.tokenizer, "is_fast", False):
+            encoded = self.tokenizer(
+                text, add_special_tokens=False, return_offsets_mapping=True
+            )
+            return [end for _, end in encoded["offset_mapping"]]
+
+        # Slow tokenizers have no offsets, decoding prefixes is exact but slower
+        token_ids = self.tokenizer.encode(text, add_special_tokens=False)[:limit]
+        return [
+            len(self.tokenizer.decode(token_ids[: n + 1]))
+            for n in range(len(token_ids))
+        ]
+
+    def _allocate(self, counts: Sequence[int], priorities: Sequence[int]) -> List[int]:
+        budget = self.max_tokens - SECTION_SEPARATOR_TOKENS * (len(counts) - 1)
+        allocation = [0] * len(counts)
+        for index in sorted(range(len(counts)), key=lambda i: -priorities[i]):
+            allocation[index] = max(0, min(counts[index], budget))
+            budget -= allocation[index]
+        return allocation
+
+    def fit(
+        self, sections: Sequence[DocumentSection], max_chunks: int = 1
+    ) -> List[str]:
+        """
+        Texts within the budget, the first keeps every section it can.
+        With `max_chunks` above 1 the overflow of the lowest priority section
+        goes to further chunks, each repeating the other sections
+        """
+        ends = [
+            self._token_ends(s.text, self.max_tokens * max_chunks) for s in sections
+        ]
+        counts = [len(e) for e in ends]
+        allocation = self._allocate(counts, [s.priority for s in sections])
+        if allocation == counts:
+            return [" ".join(s.text for s in sections if s.text)]
+
+        def cut(index: int, start: int, stop: int) -> str:
+            text, section_ends = sections[index].text, ends[index]
+            begin = section_ends[start - 1] if start else 0
+            return text[begin : section_ends[stop - 1]].strip() if stop else ""
+
+        def join(texts: Sequence[str]) -> str:
+            return " ".join(text for text in texts if text)
+
+        document = [cut(i, 0, allocation[i]) for i in range(len(sections))]
+        chunks = [join(document)]
+
+        overflow = min(range(len(sections)), key=lambda i: sections[i].priority)
+        window = allocation[overflow]
+        start = window
+        while window and start < counts[overflow] and len(chunks) < max_chunks:
+            stop = min(start + window, counts[overflow])
+            document[overflow] = cut(overflow, start, stop)
+            chunks.append(join(document))
+            start = stop
+        return chunks
@@ -0,0 +1,812 @@
+import json
+import logging
+import operator
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, cast
+
+import chromadb
+import numpy as np
+from chromadb.api.models.Collection import Collection
+from chromadb.types import VectorQueryResult
+from sqlalchemy import (
+    String,
+    and_,
+    bindparam,
+    create_engine,
+    delete,
+    func,
+    or_,
+    select,
+    true,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import settings
+from app.db.types import vector_text
+from app.models import Recipe, RecipeEmbedding
+
+logger = logging.getLogger(__name__)
+
+Where = Dict[str, Any]
+
+# Bounds of pgvector's hnsw.ef_search, 40 is its default
+HNSW_MIN_EF_SEARCH = 40
+HNSW_MAX_EF_SEARCH = 1000
+
+
+def rank_by_distance(
+    embedding: np.ndarray, ids: Sequence[int], vectors: np.ndarray, n_results: int
+) -> List[int]:
+    """
+    Ids of the `n_results` rows of `vectors` closest to `embedding` (squared L2)
+    """
+    if not len(ids) or n_results <= 0:
+        return []
+    query = np.asarray(embedding, dtype=np.float32).ravel()
+    vectors = np.asarray(vectors, dtype=np.float32)
+    distances = np.einsum("ij,ij->i", vectors, vectors) - 2 * (vectors @ query)
+
+    k = min(n_results, len(ids))
+    top = np.argpartition(distances, k - 1)[:k]
+    top = top[np.argsort(distances[top])]
+    return [int(ids[i]) for i in top]
+
+
+class VectorBackend(ABC):
+    """
+    Storage and nearest-neighbour lookup for recipe embeddings of one collection.
+    Methods are blocking and are called by VectorStore through asyncio.to_thread
+    """
+
+    name: str
+    # Embeddings live in the application database and can be joined with recipes
+    supports_sql_join: bool = False
+
+    def __init__(self, collection_name: str) -> None:
+        self.collection_name = collection_name
+
+    @abstractmethod
+    def upsert(
+        self,
+        ids: Sequence[int],
+        embeddings: np.ndarray,
+        metadatas: Sequence[Dict[str, Any]],
+        documents: Sequence[str],
+    ) -> None: ...
+
+    @abstractmethod
+    def query(
+        self, embeddings: np.ndarray, n_results: int, where: Optional[Where] = None
+    ) -> List[List[int]]:
+        """
+        Return the ids of the nearest recipes for each row of `embeddings`
+        """
+
+    @abstractmethod
+    def get_embeddings(self, ids: Sequence[int]) -> Dict[int, np.ndarray]:
+        """
+        Stored embeddings of the given recipes, unknown ids are skipped
+        """
+
+    def query_subset(
+        self, embedding: np.ndarray, ids: Sequence[int], n_results: int
+    ) -> List[int]:
+        """
+        Exact ranking restricted to `ids`, brute force over the stored embeddings
+        """
+        stored = self.get_embeddings(ids)
+        if not stored:
+            return []
+        candidate_ids = list(stored)
+        vectors = np.stack([stored[i] for i in candidate_ids])
+        return rank_by_distance(embedding, candidate_ids, vectors, n_results)
+
+    @abstractmethod
+    def update_metadata(
+        self, ids: Sequence[int], metadatas: Sequence[Dict[str, Any]]
+    ) -> None:
+        """
+        Replace stored metadata without touching the embeddings
+        """
+
+    @abstractmethod
+    def delete(self, ids: Sequence[int]) -> None: ...
+
+    @abstractmethod
+    def count(self) -> int: ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        """
+        Remove every vector but keep the collection usable
+        """
+
+    @abstractmethod
+    def drop(self) -> None:
+        """
+        Remove the collection and everything stored for it
+        """
+
+    def flush(self) -> None:
+        """
+        Persist pending writes, for backends that buffer them
+        """
+        return None
+
+
+class ChromaBackend(VectorBackend):
+    name = "chroma"
+
+    def __init__(self, collection_name: str) -> None:
+        super().__init__(collection_name)
+        try:
+            self.client = chromadb.HttpClient(
+                host=settings.CHROMA_HOST, port=settings.CHROMA_PORT
+            )
+        except Exception as ex:
+            logger.error(f"Failed to connect to ChromaDB: {ex}")
+
+    @property
+    def collection(self) -> Collection:
+        return self.client.get_or_create_collection(name=self.collection_name)
+
+    def upsert(
+        self,
+        ids: Sequence[int],
+        embeddings: np.ndarray,
+        metadatas: Sequence[Dict[str, Any]],
+        documents: Sequence[str],
+    ) -> None:
+        self.collection.upsert(
+            ids=[str(i) for i in ids],
+            embeddings=embeddings.tolist(),
+            metadatas=list(metadatas),
+            documents=list(documents),
+        )
+
+    def query(
+        self, embeddings: np.ndarray, n_results: int, where: Optional[Where] = None
+    ) -> List[List[int]]:
+        query_result = self.collection.query(
+            query_embeddings=embeddings.tolist(), n_results=n_results, where=where
+        )
+        results: Any = cast(VectorQueryResult, query_result)
+
+        if not results.get("ids"):
+            return [[] for _ in range(len(embeddings))]
+
+        return [[int(id_str) for id_str in row] for row in results["ids"]]
+
+    def query_subset(
+        self, embedding: np.ndarray, ids: Sequence[int], n_results: int
+    ) -> List[int]:
+        """
+        Ranked by the server within `ids`, the vectors don't leave Chroma
+        """
+        if not ids or n_results <= 0:
+            return []
+        collection = self.collection
+        # Querying ids that aren't stored (yet) fails, keep the stored ones
+        stored_ids = collection.get(ids=[str(i) for i in ids], include=[])["ids"]
+        if not stored_ids:
+            return []
+        query_result = collection.query(
+            query_embeddings=np.asarray(embedding, dtype=np.float32).reshape(1, -1),
+            ids=stored_ids,
+            n_results=min(n_results, len(stored_ids)),
+            include=[],
+        )
+        result_ids = query_result.get("ids")
+        return [int(id_str) for id_str in result_ids[0]] if result_ids else []
+
+    def get_embeddings(self, ids: Sequence[int]) -> Dict[int, np.ndarray]:
+        if not ids:
+            return {}
+        result = self.collection.get(ids=[str(i) for i in ids], include=["embeddings"])
+        embeddings = result.get("embeddings")
+        if embeddings is None:
+            return {}
+        return {
+            int(id_str): np.asarray(embedding, dtype=np.float32)
+            for id_str, embedding in zip(result["ids"], embeddings, strict=True)
+        }
+
+    def update_metadata(
+        self, ids: Sequence[int], metadatas: Sequence[Dict[str, Any]]
+    ) -> None:
+        self.collection.update(ids=[str(i) for i in ids], metadatas=list(metadatas))
+
+    def delete(self, ids: Sequence[int]) -> None:
+        self.collection.delete(ids=[str(i) for i in ids])
+
+    def count(self) -> int:
+        return self.collection.count()
+
+    def clear(self) -> None:
+        self.drop()
+        self.client.get_or_create_collection(name=self.collection_name)
+
+    def drop(self) -> None:
+        try:
+            self.client.delete_collection(self.collection_name)
+        except Exception as ex:
+            logger.error(f"Failed to delete collection: {ex}")
+
+
+RANGE_OPERATORS: Dict[str, Callable[[Any, Any], Any]] = {
+    "$gt": operator.gt,
+    "$gte": operator.ge,
+    "$lt": operator.lt,
+    "$lte": operator.le,
+}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or value == "" or (isinstance(value, float) and value != value)
+
+
+def _equals(column: np.ndarray, target: Any) -> np.ndarray:
+    if column.dtype != object:
+        if _is_number(target):
+            return np.asarray(column == target)
+        return np.zeros(len(column), dtype=bool)
+    return np.asarray(column == target, dtype=bool)
+
+
+def _compare(column: np.ndarray, op: str, target: Any) -> np.ndarray:
+    """
+    One `where` operator over a metadata column, missing values ("" or None)
+    never pass a range comparison
+    """
+    if op == "$eq":
+        return _equals(column, target)
+    if op == "$ne":
+        return ~_equals(column, target)
+    if op in ("$in", "$nin"):
+        mask = np.zeros(len(column), dtype=bool)
+        for value in target:
+            mask |= _equals(column, value)
+        return mask if op == "$in" else ~mask
+
+    compare = RANGE_OPERATORS.get(op)
+    if compare is None:
+        return np.ones(len(column), dtype=bool)
+    if column.dtype != object and _is_number(target):
+        # NaN marks a missing value and compares False
+        return np.asarray(compare(column, target))
+    passes = np.frompyfunc(
+        lambda value: not _is_missing(value) and compare(value, target), 1, 1
+    )
+    return np.asarray(passes(column), dtype=bool)
+
+
+def _where_mask(columns: Dict[str, np.ndarray], where: Where, size: int) -> np.ndarray:
+    """
+    Rows passing the subset of the Chroma `where` syntax used by the application
+    """
+    mask = np.ones(size, dtype=bool)
+    for key, condition in where.items():
+        if key == "$and":
+            for c in condition:
+                mask &= _where_mask(columns, c, size)
+            continue
+        if key == "$or":
+            any_mask = np.zeros(size, dtype=bool)
+            for c in condition:
+                any_mask |= _where_mask(columns, c, size)
+            mask &= any_mask
+            continue
+
+        column = columns.get(key)
+        values = (
+            column[:size] if column is not None else np.full(size, None, dtype=object)
+        )
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        for op, target in condition.items():
+            mask &= _compare(values, op, target)
+
+    return mask
+
+
+class EmbeddedBackend(VectorBackend):
+    """
+    In-process exact nearest-neighbour index over a float32 matrix.
+    Snapshots are stored as an .npy matrix (memory-mapped on load) plus a JSON
+    sidecar with ids and metadata
+    """
+
+    name = "embedded"
+
+    def __init__(self, collection_name: str, index_path: Optional[str] = None) -> None:
+        super().__init__(collection_name)
+        self.index_dir = Path(index_path or settings.VECTOR_INDEX_PATH)
+        self.snapshot_interval = settings.VECTOR_INDEX_SNAPSHOT_INTERVAL_SECONDS
+
+        self._lock = threading.RLock()
+        self._vectors: np.ndarray = np.zeros((0, 0), dtype=np.float32)
+        self._norms: np.ndarray = np.zeros(0, dtype=np.float32)
+        self._ids: np.ndarray = np.zeros(0, dtype=np.int64)
+        self._metadatas: List[Dict[str, Any]] = []
+        # One array per metadata key for vectorized `where` filters, numbers
+        # are stored as float64 with NaN for missing values, the rest as objects
+        self._columns: Dict[str, np.ndarray] = {}
+        self._positions: Dict[int, int] = {}
+        self._size = 0
+        self._dirty = False
+        self._last_snapshot = time.monotonic()
+
+        self._load()
+
+    @property
+    def _matrix_path(self) -> Path:
+        return self.index_dir / f"{self.collection_name}.npy"
+
+    @property
+    def _meta_path(self) -> Path:
+        return self.index_dir / f"{self.collection_name}.json"
+
+    def _load(self) -> None:
+        if not self._matrix_path.exists() or not self._meta_path.exists():
+            return
+
+        with open(self._meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if not meta["ids"]:
+            return
+
+        self._vectors = np.load(self._matrix_path, mmap_mode="r")
+        self._ids = np.asarray(meta["ids"], dtype=np.int64)
+        self._metadatas = meta["metadatas"]
+        self._size = len(self._ids)
+        self._positions = {int(rid): pos for pos, rid in enumerate(self._ids)}
+        self._norms = np.einsum("ij,ij->i", self._vectors, self._vectors)
+        for pos, metadata in enumerate(self._metadatas):
+            self._set_columns(pos, metadata)
+        logger.info(
+            f"Loaded embedded vector index '{self.collection_name}' "
+            f"with {self._size} vectors."
+        )
+
+    def _set_columns(self, pos: int, metadata: Dict[str, Any]) -> None:
+        capacity = len(self._ids)
+        for key, value in metadata.items():
+            if key not in self._columns:
+                self._columns[key] = (
+                    np.full(capacity, np.nan)
+                    if _is_number(value)
+                    else np.full(capacity, None, dtype=object)
+                )
+            column = self._columns[key]
+            if column.dtype != object and not (_is_number(value) or _is_missing(value)):
+                column = self._columns[key] = column.astype(object)
+            if column.dtype != object:
+                column[pos] = np.nan if _is_missing(value) else float(value)
+            else:
+                column[pos] = value
+
+        for key, column in self._columns.items():
+            if key not in metadata:
+                column[pos] = None if column.dtype == object else np.nan
+
+    def _ensure_capacity(self, extra: int, dim: int) -> None:
+        capacity = self._vectors.shape[0]
+        is_snapshot = isinstance(self._vectors, np.memmap)
+        if (
+            not is_snapshot
+            and self._vectors.shape[1] == dim
+            and self._size + extra <= capacity
+        ):
+            return
+        if self._size and self._vectors.shape[1] != dim:
+            raise ValueError(
+                f"Embedding dimension {dim} does not match index dimension "
+                f"{self._vectors.shape[1]} of '{self.collection_name}'"
+            )
+
+        new_capacity = max(16, self._size + extra, capacity + capacity // 2)
+        vectors = np.zeros((new_capacity, dim), dtype=np.float32)
+        norms = np.zeros(new_capacity, dtype=np.float32)
+        ids = np.zeros(new_capacity, dtype=np.int64)
+        if self._size:
+            vectors[: self._size] = self._vectors[: self._size]
+            norms[: self._size] = self._norms[: self._size]
+            ids[: self._size] = self._ids[: self._size]
+        for key, column in self._columns.items():
+            grown = (
+                np.full(new_capacity, None, dtype=object)
+                if column.dtype == object
+                else np.full(new_capacity, np.nan)
+            )
+            grown[: self._size] = column[: self._size]
+            self._columns[key] = grown
+        # Replaced rather than resized, queries running on the old arrays
+        # keep a consistent view
+        self._vectors = vectors
+        self._norms = norms
+        self._ids = ids
+
+    def _mark_dirty(self) -> None:
+        self._dirty = True
+        if time.monotonic() - self._last_snapshot >= self.snapshot_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            matrix_tmp = self._matrix_path.with_suffix(".npy.tmp")
+            meta_tmp = self._meta_path.with_suffix(".json.tmp")
+
+            with open(matrix_tmp, "wb") as f:
+                np.save(f, self._vectors[: self._size])
+            with open(meta_tmp, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "ids": self._ids[: self._size].tolist(),
+                        "metadatas": self._metadatas,
+                    },
+                    f,
+                )
+
+            os.replace(matrix_tmp, self._matrix_path)
+            os.replace(meta_tmp, self._meta_path)
+
+            self._dirty = False
+            self._last_snapshot = time.monotonic()
+
+    def upsert(
+        self,
+        ids: Sequence[int],
+        embeddings: np.ndarray,
+        metadatas: Sequence[Dict[str, Any]],
+        documents: Sequence[str],
+    ) -> None:
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        with self._lock:
+            self._ensure_capacity(len(ids), vectors.shape[1])
+            for row, recipe_id in enumerate(ids):
+                pos = self._positions.get(recipe_id)
+                if pos is None:
+                    pos = self._size
+                    self._size += 1
+                    self._positions[recipe_id] = pos
+                    self._ids[pos] = recipe_id
+                    self._metadatas.append(dict(metadatas[row]))
+                else:
+                    self._metadatas[pos] = dict(metadatas[row])
+                self._set_columns(pos, metadatas[row])
+
+                self._vectors[pos] = vectors[row]
+                self._norms[pos] = float(vectors[row] @ vectors[row])
+
+            self._mark_dirty()
+
+    def query(
+        self, embeddings: np.ndarray, n_results: int, where: Optional[Where] = None
+    ) -> List[List[int]]:
+        queries = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+
+        with self._lock:
+            size = self._size
+            if size == 0 or n_results <= 0:
+                return [[] for _ in range(len(queries))]
+
+            # Views of the live arrays, the distances are computed after
+            # releasing the lock. A row rewritten meanwhile may be ranked by its
+            # old or new vector, and an id deleted meanwhile may still come
+            # back; callers load the hits from PostgreSQL, which drops it
+            vectors = self._vectors[:size]
+            norms = self._norms[:size]
+            ids = self._ids[:size].copy()
+            mask = _where_mask(self._columns, where, size) if where else None
+
+        if mask is not None:
+            rows = np.flatnonzero(mask)
+            if rows.size == 0:
+                return [[] for _ in range(len(queries))]
+            vectors, norms, ids = vectors[rows], norms[rows], ids[rows]
+
+        # Squared L2 distance, the same metric as Chroma's default space
+        distances = (
+            norms[:, None]
+            - 2 * (vectors @ queries.T)
+            + np.einsum("ij,ij->i", queries, queries)[None, :]
+        )
+
+        k = min(n_results, len(ids))
+        results = []
+        for column in distances.T:
+            top = np.argpartition(column, k - 1)[:k]
+            top = top[np.argsort(column[top])]
+            results.append([int(i) for i in ids[top]])
+        return results
+
+    def get_embeddings(self, ids: Sequence[int]) -> Dict[int, np.ndarray]:
+        with self._lock:
+            return {
+                recipe_id: np.array(self._vectors[self._positions[recipe_id]])
+                for recipe_id in ids
+                if recipe_id in self._positions
+            }
+
+    def query_subset(
+        self, embedding: np.ndarray, ids: Sequence[int], n_results: int
+    ) -> List[int]:
+        with self._lock:
+            rows = [self._positions[i] for i in ids if i in self._positions]
+            if not rows:
+                return []
+            vectors = self._vectors[rows]
+            candidate_ids = [int(self._ids[row]) for row in rows]
+        return rank_by_distance(embedding, candidate_ids, vectors, n_results)
+
+    def update_metadata(
+        self, ids: Sequence[int], metadatas: Sequence[Dict[str, Any]]
+    ) -> None:
+        with self._lock:
+            for recipe_id, metadata in zip(ids, metadatas, strict=True):
+                pos = self._positions.get(recipe_id)
+                if pos is not None:
+                    self._metadatas[pos] = dict(metadata)
+                    self._set_columns(pos, metadata)
+            self._mark_dirty()
+
+    def delete(self, ids: Sequence[int]) -> None:
+        with self._lock:
+            for recipe_id in ids:
+                pos = self._positions.pop(recipe_id, None)
+                if pos is None:
+                    continue
+
+                last = self._size - 1
+                if pos != last:
+                    if isinstance(self._vectors, np.memmap):
+                        self._ensure_capacity(0, self._vectors.shape[1])
+                    moved_id = int(self._ids[last])
+                    self._vectors[pos] = self._vectors[last]
+                    self._norms[pos] = self._norms[last]
+                    self._ids[pos] = moved_id
+                    self._metadatas[pos] = self._metadatas[last]
+                    for column in self._columns.values():
+                        column[pos] = column[last]
+                    self._positions[moved_id] = pos
+
+                self._metadatas.pop()
+                self._size -= 1
+
+            self._mark_dirty()
+
+    def count(self) -> int:
+        return self._size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vectors = np.zeros((0, 0), dtype=np.float32)
+            self._norms = np.zeros(0, dtype=np.float32)
+            self._ids = np.zeros(0, dtype=np.int64)
+            self._metadatas = []
+            self._columns = {}
+            self._positions = {}
+            self._size = 0
+            self._dirty = True
+            self.flush()
+
+    def drop(self) -> None:
+        with self._lock:
+            self.clear()
+            self._matrix_path.unlink(missing_ok=True)
+            self._meta_path.unlink(missing_ok=True)
+            self._dirty = False
+
+
+METADATA_COLUMNS: Dict[str, Any] = {
+    "title": Recipe.title,
+    "cooking_time": Recipe.cooking_time_in_minutes,
+    "difficulty": Recipe.difficulty,
+    "cuisine": Recipe.cuisine,
+}
+
+SQL_OPERATORS: Dict[str, Callable[[Any, Any], ColumnElement[bool]]] = {
+    "$eq": lambda column, value: column == value,
+    "$ne": lambda column, value: column != value,
+    "$gt": lambda column, value: column > value,
+    "$gte": lambda column, value: column >= value,
+    "$lt": lambda column, value: column < value,
+    "$lte": lambda column, value: column <= value,
+    "$in": lambda column, value: column.in_(value),
+    "$nin": lambda column, value: column.not_in(value),
+}
+
+
+def hnsw_search_settings(n_results: int) -> Select[Any]:
+    """
+    Settings for the current transaction so the HNSW scan goes on until
+    `n_results` rows pass the collection and `where` filters, which pgvector
+    only applies after the index scan (iterative scans need pgvector >= 0.8)
+    """
+    ef_search = min(max(n_results, HNSW_MIN_EF_SEARCH), HNSW_MAX_EF_SEARCH)
+    return select(
+        func.set_config("hnsw.iterative_scan", "strict_order", True),
+        func.set_config("hnsw.ef_search", str(ef_search), True),
+    )
+
+
+def where_to_sql(where: Where) -> ColumnElement[bool]:
+    """
+    Translate a Chroma `where` clause into conditions on the recipes table
+    """
+    clauses: List[ColumnElement[bool]] = []
+    for key, condition in where.items():
+        if key == "$and":
+            clauses.append(and_(*[where_to_sql(c) for c in condition]))
+            continue
+        if key == "$or":
+            clauses.append(or_(*[where_to_sql(c) for c in condition]))
+            continue
+
+        column = METADATA_COLUMNS[key]
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        for op, target in condition.items():
+            clauses.append(SQL_OPERATORS[op](column, target))
+
+    return and_(*clauses)
+
+
+class PgVectorBackend(VectorBackend):
+    """
+    Embeddings stored next to `recipes` in a pgvector table with an HNSW index,
+    so search can be joined with the recipe filters in a single SQL query
+    """
+
+    name = "pgvector"
+    supports_sql_join = True
+
+    def __init__(
+        self, collection_name: str, database_url: Optional[str] = None
+    ) -> None:
+        super().__init__(collection_name)
+        self.engine = create_engine(
+            database_url or settings.SYNC_DATABASE_URL, pool_pre_ping=True
+        )
+
+    def upsert(
+        self,
+        ids: Sequence[int],
+        embeddings: np.ndarray,
+        metadatas: Sequence[Dict[str, Any]],
+        documents: Sequence[str],
+    ) -> None:
+        rows = [
+            {
+                "collection": self.collection_name,
+                "recipe_id": recipe_id,
+                "embedding": embeddings[row].tolist(),
+            }
+            for row, recipe_id in enumerate(ids)
+        ]
+        statement = insert(RecipeEmbedding).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[RecipeEmbedding.collection, RecipeEmbedding.recipe_id],
+            set_={"embedding": statement.excluded.embedding},
+        )
+        with self.engine.begin() as conn:
+            conn.execute(statement)
+
+    def query(
+        self, embeddings: np.ndarray, n_results: int, where: Optional[Where] = None
+    ) -> List[List[int]]:
+        """
+        Nearest recipes of every query embedding in one LATERAL query
+        """
+        results: List[List[int]] = [[] for _ in range(len(embeddings))]
+        if not len(embeddings) or n_results <= 0:
+            return results
+
+        vector_type = RecipeEmbedding.__table__.c.embedding.type
+        query_vectors = (
+            func.unnest(
+                bindparam(
+                    "query_vectors",
+                    [vector_text(row) for row in embeddings],
+                    type_=ARRAY(String),
+                ).cast(ARRAY(vector_type))
+            )
+            .table_valued("embedding", with_ordinality="position")
+            .render_derived()
+            .alias("query_vectors")
+        )
+        distance = RecipeEmbedding.embedding.l2_distance(query_vectors.c.embedding)
+        nearest = (
+            select(RecipeEmbedding.recipe_id, distance.label("distance"))
+            .where(RecipeEmbedding.collection == self.collection_name)
+            .order_by(distance)
+            .limit(n_results)
+        )
+        if where:
+            nearest = nearest.join(
+                Recipe, Recipe.id == RecipeEmbedding.recipe_id
+            ).where(where_to_sql(where))
+        nearest_rows = nearest.lateral("nearest")
+        statement = (
+            select(query_vectors.c.position, nearest_rows.c.recipe_id)
+            .select_from(query_vectors.join(nearest_rows, true()))
+            .order_by(query_vectors.c.position, nearest_rows.c.distance)
+        )
+
+        with self.engine.begin() as conn:
+            conn.execute(hnsw_search_settings(n_results))
+            for position, recipe_id in conn.execute(statement):
+                results[position - 1].append(recipe_id)
+        return results
+
+    def get_embeddings(self, ids: Sequence[int]) -> Dict[int, np.ndarray]:
+        if not ids:
+            return {}
+        statement = select(RecipeEmbedding.recipe_id, RecipeEmbedding.embedding).where(
+            RecipeEmbedding.collection == self.collection_name,
+            RecipeEmbedding.recipe_id.in_(ids),
+        )
+        with self.engine.connect() as conn:
+            return {
+                recipe_id: np.asarray(embedding, dtype=np.float32)
+                for recipe_id, embedding in conn.execute(statement)
+            }
+
+    def update_metadata(
+        self, ids: Sequence[int], metadatas: Sequence[Dict[str, Any]]
+    ) -> None:
+        # Filters are evaluated against the recipes table, nothing to update
+        return None
+
+    def delete(self, ids: Sequence[int]) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(
+                delete(RecipeEmbedding).where(
+                    RecipeEmbedding.collection == self.collection_name,
+                    RecipeEmbedding.recipe_id.in_(ids),
+                )
+            )
+
+    def count(self) -> int:
+        with self.engine.connect() as conn:
+            statement = (
+                select(func.count())
+                .select_from(RecipeEmbedding)
+                .where(RecipeEmbedding.collection == self.collection_name)
+            )
+            return int(conn.execute(statement).scalar_one())
+
+    def clear(self) -> None:
+        self.drop()
+
+    def drop(self) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(
+                delete(RecipeEmbedding).where(
+                    RecipeEmbedding.collection == self.collection_name
+                )
+            )
+
+
+def create_backend(
+    collection_name: str, database_url: Optional[str] = None
+) -> VectorBackend:
+    if settings.VECTOR_BACKEND == "embedded":
+        return EmbeddedBackend(collection_name)
+    if settings.VECTOR_BACKEND == "pgvector":
+        return PgVectorBackend(collection_name, database_url=database_url)
+    return ChromaBackend(collection_name)
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Applies one batch of the outbox and returns how many entries it consumed
+SyncBatch = Callable[[], Awaitable[int]]
+
+
+class VectorIndexer:
+    """
+    Background task draining the vector outbox in batches.
+    Writers call notify() after committing so new entries are picked up
+    without waiting for the next poll
+    """
+
+    def __init__(self) -> None:
+        self._task: Optional[asyncio.Task[None]] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+        self.batches = 0
+        self.entries = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.last_batch_at: Optional[float] = None
+        self.last_batch_seconds = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, sync_batch: SyncBatch, poll_seconds: float) -> None:
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(
+            self._run(sync_batch, max(0.01, poll_seconds))
+        )
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self._wakeup = None
+
+    def notify(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self, sync_batch: SyncBatch, poll_seconds: float) -> None:
+        while True:
+            wakeup = self._wakeup
+            if wakeup is not None:
+                wakeup.clear()
+
+            started_at = time.monotonic()
+            try:
+                consumed = await sync_batch()
+            except Exception as ex:
+                # The batch is rescheduled with a backoff in the outbox itself
+                self.failures += 1
+                self.last_error = str(ex)
+                logger.error(f"Vector outbox batch failed: {ex}")
+                consumed = 0
+
+            if consumed:
+                self.batches += 1
+                self.entries += consumed
+                self.last_batch_at = time.time()
+                self.last_batch_seconds = time.monotonic() - started_at
+                # Keep draining while there is a backlog
+                continue
+
+            if wakeup is None:
+                await asyncio.sleep(poll_seconds)
+                continue
+            try:
+                await asyncio.wait_for(wakeup.wait(), poll_seconds)
+            except TimeoutError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "batches": self.batches,
+            "entries": self.entries,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "last_batch_at": self.last_batch_at,
+            "last_batch_seconds": round(self.last_batch_seconds, 3),
+        }
+
+
+vector_indexer = VectorIndexer()
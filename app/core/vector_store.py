@@ -2,20 +2,203 @@ import asyncio
 import logging
 import os
 import sys
-from typing import Any, Dict, List, Optional, Self, cast
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Self, Sequence, Tuple
 
-import chromadb
 import numpy as np
-from chromadb.api.models.Collection import Collection
-from chromadb.types import VectorQueryResult
 from sentence_transformers import SentenceTransformer
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.token_budget import TokenBudget
+from app.core.vector_backends import VectorBackend, Where, create_backend
 
 logging.basicConfig(level=logging.INFO, handlers=[logging.StreamHandler(sys.stdout)])
 
 logger = logging.getLogger(__name__)
 
+PendingEmbedding = Tuple[str, "asyncio.Future[np.ndarray]", float]
+
+
+def embedding_model_id() -> str:
+    """
+    Identifier of the model that produced the stored vectors, engine included
+    """
+    if settings.EMBEDDING_ENGINE == "onnx":
+        return f"{settings.EMBEDDING_MODEL}:onnx:{settings.EMBEDDING_ONNX_FILE_NAME}"
+    return settings.EMBEDDING_MODEL
+
+
+def load_embedding_model(engine: Optional[str] = None) -> SentenceTransformer:
+    engine = engine or settings.EMBEDDING_ENGINE
+
+    if engine == "onnx":
+        logger.info(
+            f"Loading ONNX embedding model from {settings.EMBEDDING_ONNX_MODEL_PATH} "
+            f"({settings.EMBEDDING_ONNX_FILE_NAME})..."
+        )
+        return SentenceTransformer(
+            settings.EMBEDDING_ONNX_MODEL_PATH,
+            backend="onnx",
+            model_kwargs={
+                "file_name": settings.EMBEDDING_ONNX_FILE_NAME,
+                "provider": "CPUExecutionProvider",
+            },
+            trust_remote_code=True,
+        )
+
+    return SentenceTransformer(
+        settings.EMBEDDING_MODEL,
+        trust_remote_code=True,
+        token=settings.HF_TOKEN,
+    )
+
+
+def _sanitize_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: ("" if v is None else v) for k, v in metadata.items()}
+
+
+@dataclass
+class RecipeDocument:
+    recipe_id: int
+    title: str
+    full_text: str
+    metadata: Optional[Dict[str, Any]] = None
+    # Further chunks of a long recipe, embedded and pooled with full_text
+    extra_texts: Sequence[str] = ()
+
+    @property
+    def safe_metadata(self) -> Dict[str, Any]:
+        metadata = self.metadata if self.metadata is not None else {"title": self.title}
+        return _sanitize_metadata(metadata)
+
+
+def _pool_chunks(embeddings: np.ndarray, batch: Sequence[RecipeDocument]) -> np.ndarray:
+    """
+    One vector per document: the normalized mean of its chunk embeddings
+    """
+    sizes = [1 + len(doc.extra_texts) for doc in batch]
+    starts = np.cumsum([0, *sizes[:-1]])
+    pooled = np.add.reduceat(embeddings, starts, axis=0) / np.asarray(sizes)[:, None]
+    norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+    result: np.ndarray = pooled / np.where(norms > 0, norms, 1.0)
+    return result
+
+
+class EmbeddingBatcher:
+    """
+    Merges concurrent embedding requests into a single batched encode call
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[List[str]], np.ndarray],
+        max_batch_size: int,
+        max_wait_ms: float,
+    ) -> None:
+        self._encode = encode
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+
+        self._queue: Optional[asyncio.Queue[PendingEmbedding]] = None
+        self._worker: Optional[asyncio.Task[None]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+
+    def _ensure_worker(self) -> asyncio.Queue[PendingEmbedding]:
+        loop = asyncio.get_running_loop()
+        if (
+            self._queue is None
+            or self._worker is None
+            or self._worker.done()
+            or self._loop is not loop
+        ):
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run(self._queue))
+        return self._queue
+
+    async def submit(self, text: str) -> np.ndarray:
+        queue = self._ensure_worker()
+        future: asyncio.Future[np.ndarray] = asyncio.get_running_loop().create_future()
+        queue.put_nowait((text, future, time.monotonic()))
+        return await future
+
+    async def _collect(
+        self, queue: asyncio.Queue[PendingEmbedding]
+    ) -> List[PendingEmbedding]:
+        batch = [await queue.get()]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self, queue: asyncio.Queue[PendingEmbedding]) -> None:
+        while True:
+            batch = await self._collect(queue)
+
+            started_at = time.monotonic()
+            for _, _, enqueued_at in batch:
+                wait = started_at - enqueued_at
+                self.total_queue_wait += wait
+                self.max_queue_wait = max(self.max_queue_wait, wait)
+            self.batches += 1
+            self.items += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+
+            texts = [text for text, _, _ in batch]
+            try:
+                embeddings = await asyncio.to_thread(self._encode, texts)
+            except Exception as ex:
+                logger.error(f"Batched embedding failed: {ex}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(ex)
+                continue
+
+            for row, (_, future, _) in enumerate(batch):
+                if not future.done():
+                    future.set_result(embeddings[row])
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+        self._worker = None
+        self._queue = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": (self.items / self.batches) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "avg_queue_wait_ms": (
+                (self.total_queue_wait / self.items) * 1000 if self.items else 0.0
+            ),
+            "max_queue_wait_ms": self.max_queue_wait * 1000,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+        }
+
 
 class VectorStore:
     _instance: Optional[Self] = None
@@ -30,7 +213,10 @@ class VectorStore:
         return cls._instance
 
     def __init__(
-        self, collection_name: Optional[str] = None, force_new: bool = False
+        self,
+        collection_name: Optional[str] = None,
+        force_new: bool = False,
+        database_url: Optional[str] = None,
     ) -> None:
         if getattr(self, "_initialized", False) and not force_new:
             return
@@ -43,30 +229,55 @@ class VectorStore:
         else:
             self.collection_name = "recipes"
 
-        try:
-            self.client = chromadb.HttpClient(
-                host=settings.CHROMA_HOST, port=settings.CHROMA_PORT
-            )
-        except Exception as ex:
-            logger.error(f"Failed to connect to ChromaDB: {ex}")
+        # Configured name, reindexing builds versioned collections derived from it
+        self.base_collection_name = self.collection_name
+        self._database_url = database_url
+        self.backend: VectorBackend = create_backend(
+            self.collection_name, database_url=database_url
+        )
+        self._backends: Dict[str, VectorBackend] = {self.collection_name: self.backend}
 
         self.model = None
+        self._token_budget: Optional[TokenBudget] = None
+        self.query_cache: TTLCache[tuple[str, str], np.ndarray] = TTLCache(
+            max_size=settings.EMBEDDING_CACHE_SIZE,
+            ttl_seconds=settings.EMBEDDING_CACHE_TTL_SECONDS,
+        )
+        self.batcher = EmbeddingBatcher(
+            self._encode_batch,
+            max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+            max_wait_ms=settings.EMBEDDING_BATCH_MAX_WAIT_MS,
+        )
 
         self._initialized = True
-        logger.info("Vector Store client initialized.")
-
-    @property
-    def collection(self) -> Collection:
-        return self.client.get_or_create_collection(name=self.collection_name)
+        logger.info(f"Vector Store initialized with '{self.backend.name}' backend.")
+
+    def get_backend(self, collection_name: str) -> VectorBackend:
+        """
+        Backend of another collection of the same kind, created once
+        """
+        backend = self._backends.get(collection_name)
+        if backend is None:
+            backend = create_backend(collection_name, database_url=self._database_url)
+            self._backends[collection_name] = backend
+        return backend
+
+    def use_collection(self, collection_name: str) -> None:
+        """
+        Serve searches and writes from another collection from now on
+        """
+        if collection_name == self.collection_name:
+            return
+        backend = self.get_backend(collection_name)
+        self.backend.flush()
+        # No await in between, coroutines never see a half switched store
+        self.backend, self.collection_name = backend, collection_name
+        logger.info(f"Vector Store switched to collection '{collection_name}'.")
 
     def preload_model(self) -> None:
         if self.model is None:
-            logger.info(f"Pre-load embedding model: {settings.EMBEDDING_MODEL}...")
-            self.model = SentenceTransformer(
-                settings.EMBEDDING_MODEL,
-                trust_remote_code=True,
-                token=settings.HF_TOKEN,
-            )
+            logger.info(f"Pre-load embedding model: {embedding_model_id()}...")
+            self.model = load_embedding_model()
             logger.info("Embedding model pre-loaded successfully.")
 
     def _get_model(self) -> SentenceTransformer:
@@ -77,66 +288,204 @@ class VectorStore:
                 raise RuntimeError("Failed to load SentenceTransformer model.")
         return self.model
 
-    async def embed_text(self, text: str) -> np.ndarray:
+    @property
+    def token_budget(self) -> TokenBudget:
+        """
+        Token limit and tokenizer of the embedding model, for building documents
+        """
+        if self._token_budget is None:
+            self._token_budget = TokenBudget.for_model(self._get_model())
+        return self._token_budget
+
+    def _encode_batch(
+        self, texts: List[str], batch_size: Optional[int] = None
+    ) -> np.ndarray:
         model = self._get_model()
+        # Helper to resolve overloaded model.encode for mypy
+        embeddings: np.ndarray = model.encode(
+            texts, batch_size=batch_size or len(texts), convert_to_numpy=True
+        )
+        return embeddings
+
+    async def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode many documents at once, bypassing the request micro-batcher
+        """
+        self._get_model()
+        return await asyncio.to_thread(
+            self._encode_batch, texts, settings.EMBEDDING_ENCODE_BATCH_SIZE
+        )
 
-        def _encode(t: str) -> np.ndarray:
-            # Helper to resolve overloaded model.encode for mypy
-            return model.encode(t, convert_to_numpy=True)
-
-        embedding = await asyncio.to_thread(_encode, text)
+    async def embed_text(self, text: str) -> np.ndarray:
+        self._get_model()
+        return await self.batcher.submit(text)
+
+    @staticmethod
+    def _query_cache_key(text: str) -> tuple[str, str]:
+        normalized = " ".join(text.lower().split())
+        return embedding_model_id(), normalized
+
+    async def embed_query(self, text: str) -> np.ndarray:
+        """
+        Embed a search query, serving repeated queries from the in-process cache
+        """
+        key = self._query_cache_key(text)
+        cached = self.query_cache.get(key)
+        if cached is not None:
+            return cached
+
+        embedding = await self.embed_text(text)
+        self.query_cache.set(key, embedding)
         return embedding
 
-    async def upsert_recipe(
-        self,
-        recipe_id: int,
-        title: str,
-        full_text: str,
-        metadata: Optional[Dict[str, Any]] = None,
-    ) -> None:
-        if metadata is None:
-            metadata = {"title": title}
-        safe_metadata = {k: ("" if v is None else v) for k, v in metadata.items()}
-
-        embedding_result = await self.embed_text(full_text)
-        embedding_list = embedding_result.tolist()
-
-        def _sync_upsert() -> None:
-            self.collection.upsert(
-                ids=[str(recipe_id)],
-                embeddings=[embedding_list],
-                metadatas=[safe_metadata],
-                documents=[full_text],
+    async def embed_queries(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed many search queries, encoding the uncached ones in a single call
+        """
+        keys = [self._query_cache_key(text) for text in texts]
+        found: Dict[tuple[str, str], np.ndarray] = {}
+        missing: Dict[tuple[str, str], str] = {}
+        for key, text in zip(keys, texts, strict=True):
+            cached = self.query_cache.get(key)
+            if cached is not None:
+                found[key] = cached
+            else:
+                missing.setdefault(key, text)
+
+        if missing:
+            self._get_model()
+            embeddings = await asyncio.to_thread(
+                self._encode_batch,
+                list(missing.values()),
+                settings.EMBEDDING_ENCODE_BATCH_SIZE,
             )
+            for key, embedding in zip(missing, embeddings, strict=True):
+                self.query_cache.set(key, embedding)
+                found[key] = embedding
 
-        await asyncio.to_thread(_sync_upsert)
+        return np.stack([found[key] for key in keys])
 
-    async def search(self, query: str, n_results: int = 5) -> List[int]:
-        query_vec_result = await self.embed_text(query)
-        query_embedding_list = query_vec_result.tolist()
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend.name,
+            "collection": self.collection_name,
+            "query_cache": self.query_cache.stats(),
+            "embedding_batcher": self.batcher.stats(),
+        }
 
-        def _sync_search() -> VectorQueryResult:
-            query_result = self.collection.query(
-                query_embeddings=[query_embedding_list], n_results=n_results
+    async def upsert_recipes(
+        self,
+        batch: Sequence[RecipeDocument],
+        backends: Optional[Sequence[VectorBackend]] = None,
+    ) -> None:
+        """
+        Embed and upsert many recipes with one encode and one upsert per chunk
+        into every backend of `backends` (the active one by default)
+        """
+        chunk_size = max(1, settings.VECTOR_UPSERT_BATCH_SIZE)
+        targets = backends if backends is not None else [self.backend]
+
+        for start in range(0, len(batch), chunk_size):
+            chunk = batch[start : start + chunk_size]
+            embeddings = await self.embed_texts(
+                [text for doc in chunk for text in (doc.full_text, *doc.extra_texts)]
+            )
+            if len(embeddings) > len(chunk):
+                embeddings = _pool_chunks(embeddings, chunk)
+
+            for backend in targets:
+                await asyncio.to_thread(
+                    backend.upsert,
+                    [doc.recipe_id for doc in chunk],
+                    embeddings,
+                    [doc.safe_metadata for doc in chunk],
+                    [doc.full_text for doc in chunk],
+                )
+
+    async def update_metadata(
+        self,
+        recipe_id: int,
+        metadata: Dict[str, Any],
+        backends: Optional[Sequence[VectorBackend]] = None,
+    ) -> None:
+        for backend in backends if backends is not None else [self.backend]:
+            await asyncio.to_thread(
+                backend.update_metadata, [recipe_id], [_sanitize_metadata(metadata)]
             )
-            return cast(VectorQueryResult, query_result)
-
-        results: Any = await asyncio.to_thread(_sync_search)
 
-        if not results.get("ids") or not results["ids"][0]:
+    async def search(
+        self, query: str, n_results: int = 5, where: Optional[Where] = None
+    ) -> List[int]:
+        query_vec_result = await self.embed_query(query)
+
+        results = await asyncio.to_thread(
+            self.backend.query, query_vec_result[np.newaxis, :], n_results, where
+        )
+        return results[0] if results else []
+
+    async def search_embeddings(
+        self, embeddings: np.ndarray, n_results: int = 5, where: Optional[Where] = None
+    ) -> List[List[int]]:
+        """
+        Nearest recipes for every row of `embeddings` in one vector store query
+        """
+        return await asyncio.to_thread(self.backend.query, embeddings, n_results, where)
+
+    async def search_similar(
+        self, recipe_id: int, n_results: int = 5
+    ) -> Optional[List[int]]:
+        """
+        Nearest recipes to the stored vector of a recipe, without the recipe itself.
+        None when the recipe has no vector
+        """
+        stored = await asyncio.to_thread(self.backend.get_embeddings, [recipe_id])
+        embedding = stored.get(recipe_id)
+        if embedding is None:
+            return None
+
+        results = await asyncio.to_thread(
+            self.backend.query, embedding[np.newaxis, :], n_results + 1, None
+        )
+        neighbours = [
+            rid for rid in (results[0] if results else []) if rid != recipe_id
+        ]
+        return neighbours[:n_results]
+
+    async def search_subset(
+        self, query: str, ids: Sequence[int], n_results: int = 5
+    ) -> List[int]:
+        """
+        Exact nearest recipes among `ids`, for filters that leave few candidates
+        """
+        if not ids:
             return []
+        query_vec_result = await self.embed_query(query)
 
-        return [int(id_str) for id_str in results["ids"][0]]
+        return await asyncio.to_thread(
+            self.backend.query_subset, query_vec_result, ids, n_results
+        )
 
     async def delete_recipe(self, recipe_id: int) -> None:
-        await asyncio.to_thread(self.collection.delete, ids=[str(recipe_id)])
+        await asyncio.to_thread(self.backend.delete, [recipe_id])
+
+    async def delete_recipes(
+        self,
+        recipe_ids: Sequence[int],
+        backends: Optional[Sequence[VectorBackend]] = None,
+    ) -> None:
+        if not recipe_ids:
+            return
+        for backend in backends if backends is not None else [self.backend]:
+            await asyncio.to_thread(backend.delete, list(recipe_ids))
 
     def clear(self) -> None:
-        try:
-            self.client.delete_collection(self.collection_name)
-        except Exception as ex:
-            logger.error(f"Failed to delete collection: {ex}")
-        self.client.get_or_create_collection(name=self.collection_name)
+        self.backend.clear()
+
+    def drop(self) -> None:
+        self.backend.drop()
+
+    def flush(self) -> None:
+        self.backend.flush()
 
 
 vector_store = VectorStore()
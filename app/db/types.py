@@ -0,0 +1,59 @@
+from typing import Any, Callable, Optional, Sequence
+
+from sqlalchemy import Float, String, cast
+from sqlalchemy.engine import Dialect
+from sqlalchemy.sql.elements import BindParameter, ColumnElement
+from sqlalchemy.types import UserDefinedType
+
+
+def vector_text(value: Sequence[float]) -> str:
+    """
+    Text form of a pgvector literal
+    """
+    return "[" + ",".join(str(float(v)) for v in value) + "]"
+
+
+class Vector(UserDefinedType[Sequence[float]]):
+    """
+    pgvector `vector(n)` column, exchanged with the driver in its text form
+    """
+
+    cache_ok = True
+
+    def __init__(self, dim: int) -> None:
+        self.dim = dim
+
+    def get_col_spec(self, **kw: Any) -> str:
+        return f"VECTOR({self.dim})"
+
+    def bind_processor(
+        self, dialect: Dialect
+    ) -> Callable[[Optional[Sequence[float]]], Optional[str]]:
+        def process(value: Optional[Sequence[float]]) -> Optional[str]:
+            if value is None:
+                return None
+            return vector_text(value)
+
+        return process
+
+    def bind_expression(
+        self, bindvalue: BindParameter[Sequence[float]]
+    ) -> ColumnElement[Sequence[float]]:
+        # Send the literal as text so drivers without a vector codec can bind it
+        return cast(cast(bindvalue, String), self)
+
+    def result_processor(
+        self, dialect: Dialect, coltype: object
+    ) -> Callable[[Any], Optional[list[float]]]:
+        def process(value: Any) -> Optional[list[float]]:
+            if value is None:
+                return None
+            if isinstance(value, str):
+                return [float(v) for v in value.strip("[]").split(",") if v]
+            return [float(v) for v in value]
+
+        return process
+
+    class comparator_factory(UserDefinedType.Comparator[Sequence[float]]):
+        def l2_distance(self, other: Any) -> ColumnElement[float]:
+            return self.expr.op("<->", return_type=Float)(other)
@@ -10,18 +10,40 @@ from pydantic import BaseModel
 from app.api.v1.api import api_router
 from app.core.config import settings
 from app.core.s3_client import s3_client
+from app.core.vector_indexer import vector_indexer
 from app.core.vector_store import vector_store
+from app.db.session import AsyncSessionLocal
+from app.services import recipe_service, reindex_service, word_form_service
 
 logger = logging.getLogger(__name__)
 
 logging.basicConfig(level=logging.INFO, handlers=[logging.StreamHandler(sys.stdout)])
 
 
+async def sync_vector_outbox_batch() -> int:
+    async with AsyncSessionLocal() as db:
+        # Picks up a collection switch made by a reindex in another process
+        await reindex_service.refresh_active_collection(db)
+        return await recipe_service.sync_vector_outbox(db)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     vector_store.preload_model()
     await s3_client.ensure_bucket_exists()
+    async with AsyncSessionLocal() as db:
+        await reindex_service.refresh_active_collection(db)
+        if settings.WORD_FORMS_VOCABULARY_ENABLED:
+            await word_form_service.load_vocabulary(db)
+        if settings.INGREDIENT_INDEX_ENABLED:
+            await recipe_service.build_ingredient_index(db)
+    vector_indexer.start(
+        sync_vector_outbox_batch, poll_seconds=settings.VECTOR_OUTBOX_POLL_SECONDS
+    )
     yield
+    await vector_indexer.stop()
+    await vector_store.batcher.close()
+    vector_store.flush()
 
 
 class RootResponse(BaseModel):
@@ -40,6 +62,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(api_router, prefix="/api/v1")
@@ -1,4 +1,17 @@
 from .base import Base
 from .recipe import Recipe
+from .recipe_embedding import RecipeEmbedding
+from .recipe_facet_count import RecipeFacetCount
+from .reindex_job import ReindexJob
+from .vector_outbox import VectorOutbox
+from .word_form import WordForm
 
-__all__ = ["Base", "Recipe"]
+__all__ = [
+    "Base",
+    "Recipe",
+    "RecipeEmbedding",
+    "RecipeFacetCount",
+    "ReindexJob",
+    "VectorOutbox",
+    "WordForm",
+]
@@ -1,6 +1,6 @@
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import Integer, String
+from sqlalchemy import Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import text
@@ -10,6 +10,32 @@ from .base import Base
 
 class Recipe(Base):
     __tablename__ = "recipes"
+    __table_args__ = (
+        Index(
+            "ix_recipes_ingredient_terms", "ingredient_terms", postgresql_using="gin"
+        ),
+        Index(
+            "ix_recipes_ingredients_text_trgm",
+            "ingredients_text",
+            postgresql_using="gin",
+            postgresql_ops={"ingredients_text": "gin_trgm_ops"},
+        ),
+        # Keyset ordering of the recipe list, see recipe_service.get_recipes_page
+        Index("ix_recipes_cooking_time_id", "cooking_time_in_minutes", "id"),
+        Index("ix_recipes_title_id", "title", "id"),
+        Index(
+            "ix_recipes_cuisine_cooking_time_id",
+            "cuisine",
+            "cooking_time_in_minutes",
+            "id",
+        ),
+        Index(
+            "ix_recipes_difficulty_cooking_time_id",
+            "difficulty",
+            "cooking_time_in_minutes",
+            "id",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     title: Mapped[str] = mapped_column(String(255), index=True, nullable=False)
@@ -23,3 +49,12 @@ class Recipe(Base):
     image_urls: Mapped[List[str]] = mapped_column(
         ARRAY(String), default=list, server_default=text("'{}'"), nullable=False
     )
+    embedding_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # Normalized ingredient word forms, see text_utils.get_ingredient_terms
+    ingredient_terms: Mapped[List[str]] = mapped_column(
+        ARRAY(String), default=list, server_default=text("'{}'"), nullable=False
+    )
+    # Normalized ingredient names joined with " | ", see text_utils
+    ingredients_text: Mapped[str] = mapped_column(
+        Text, default="", server_default="", nullable=False
+    )
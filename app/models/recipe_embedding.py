@@ -0,0 +1,21 @@
+from typing import Sequence
+
+from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.config import settings
+from app.db.types import Vector
+
+from .base import Base
+
+
+class RecipeEmbedding(Base):
+    __tablename__ = "recipe_embeddings"
+
+    collection: Mapped[str] = mapped_column(String(255), primary_key=True)
+    recipe_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("recipes.id", ondelete="CASCADE"), primary_key=True
+    )
+    embedding: Mapped[Sequence[float]] = mapped_column(
+        Vector(settings.EMBEDDING_DIMENSION), nullable=False
+    )
@@ -0,0 +1,17 @@
+from sqlalchemy import Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class RecipeFacetCount(Base):
+    """
+    Number of recipes per facet value, maintained by the recipe_service writes
+    """
+
+    __tablename__ = "recipe_facet_counts"
+    __table_args__ = (Index("ix_recipe_facet_counts_facet_count", "facet", "count"),)
+
+    facet: Mapped[str] = mapped_column(String(20), primary_key=True)
+    value: Mapped[str] = mapped_column(String(255), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -0,0 +1,46 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Float, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class ReindexJob(Base):
+    """
+    Full re-embedding of the recipes into a new versioned collection.
+    last_recipe_id is the checkpoint a resumed job continues after
+    """
+
+    __tablename__ = "reindex_jobs"
+    __table_args__ = (Index("ix_reindex_jobs_base_collection", "base_collection"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    base_collection: Mapped[str] = mapped_column(String(255), nullable=False)
+    target_collection: Mapped[str] = mapped_column(String(255), nullable=False)
+    model_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    # running, completed or failed
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    last_recipe_id: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    processed: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    total: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    docs_per_second: Mapped[float] = mapped_column(
+        Float, default=0.0, server_default="0", nullable=False
+    )
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    finished_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class VectorOutbox(Base):
+    """
+    Pending vector store change of a recipe, written in the same transaction
+    as the recipe itself and applied by the vector indexer
+    """
+
+    __tablename__ = "vector_outbox"
+    __table_args__ = (Index("ix_vector_outbox_available_at_id", "available_at", "id"),)
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    recipe_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    # upsert, metadata or delete
+    operation: Mapped[str] = mapped_column(String(10), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
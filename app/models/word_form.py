@@ -0,0 +1,18 @@
+from typing import List
+
+from sqlalchemy import String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class WordForm(Base):
+    """
+    Precomputed text_utils.get_word_forms of an ingredient word sequence
+    """
+
+    __tablename__ = "word_forms"
+
+    word: Mapped[str] = mapped_column(String(255), primary_key=True)
+    forms: Mapped[List[str]] = mapped_column(ARRAY(String), nullable=False)
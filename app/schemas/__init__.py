@@ -1,9 +1,19 @@
 from .ingredient import Ingredient
+from .pantry_recipe import PantryRecipe
 from .recipe import Recipe
 from .recipe_base import RecipeBase
+from .recipe_batch_search import (
+    RecipeBatchSearch,
+    RecipeSearchQuery,
+    RecipeSearchResult,
+    RecipeSummarySearchResult,
+)
 from .recipe_create import RecipeCreate
+from .recipe_facets import FacetCount, RecipeFacets
 from .recipe_images_delete import RecipeImagesDelete
+from .recipe_summary import RecipeSummary
 from .recipe_update import RecipeUpdate
+from .reindex_status import ReindexStatus
 
 __all__ = [
     "RecipeBase",
@@ -12,4 +22,13 @@ __all__ = [
     "Recipe",
     "Ingredient",
     "RecipeImagesDelete",
+    "PantryRecipe",
+    "FacetCount",
+    "RecipeFacets",
+    "RecipeSummary",
+    "ReindexStatus",
+    "RecipeSearchQuery",
+    "RecipeBatchSearch",
+    "RecipeSearchResult",
+    "RecipeSummarySearchResult",
 ]
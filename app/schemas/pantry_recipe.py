@@ -0,0 +1,9 @@
+from pydantic import Field
+
+from .recipe import Recipe
+
+
+class PantryRecipe(Recipe):
+    covered_ingredients: int
+    missing_ingredients: list[str] = Field(default_factory=list)
+    coverage: float
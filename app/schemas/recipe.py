@@ -6,6 +6,14 @@ from .ingredient import Ingredient
 from .recipe_base import RecipeBase
 
 
+def drop_empty_urls(v: Any) -> list[str]:
+    if not v:
+        return []
+    if isinstance(v, list):
+        return [url for url in v if url and isinstance(url, str) and url.strip()]
+    return []
+
+
 class Recipe(RecipeBase):
     id: int
     ingredients: list[Ingredient] = Field(default_factory=list, max_length=100)
@@ -15,11 +23,7 @@ class Recipe(RecipeBase):
 
     @field_validator("image_urls", mode="before")
     def filter_empty_urls(cls, v: Any) -> list[str]:
-        if not v:
-            return []
-        if isinstance(v, list):
-            return [url for url in v if url and isinstance(url, str) and url.strip()]
-        return []
+        return drop_empty_urls(v)
 
     # for reading data from SQLAlchemy objects
     class Config:
@@ -0,0 +1,33 @@
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from .recipe import Recipe
+from .recipe_summary import RecipeSummary
+
+
+class RecipeSearchQuery(BaseModel):
+    q: str = Field(..., min_length=1, max_length=200)
+    include_ingredients: Optional[str] = Field(None, max_length=500)
+    exclude_ingredients: Optional[str] = Field(None, max_length=500)
+    match: Literal["exact", "prefix", "fuzzy"] = "exact"
+    max_cooking_time: Optional[int] = Field(None, ge=0)
+    difficulty: Optional[str] = Field(None, max_length=50)
+    cuisine: Optional[str] = Field(None, max_length=50)
+    limit: int = Field(6, ge=1, le=50)
+
+
+class RecipeBatchSearch(BaseModel):
+    queries: List[RecipeSearchQuery] = Field(..., min_length=1, max_length=50)
+    # summary leaves out the instructions
+    view: Literal["full", "summary"] = "full"
+
+
+class RecipeSearchResult(BaseModel):
+    q: str
+    recipes: List[Recipe]
+
+
+class RecipeSummarySearchResult(BaseModel):
+    q: str
+    recipes: List[RecipeSummary]
@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class RecipeFacets(BaseModel):
+    total: int
+    cuisine: list[FacetCount] = Field(default_factory=list)
+    difficulty: list[FacetCount] = Field(default_factory=list)
+    ingredients: list[FacetCount] = Field(default_factory=list)
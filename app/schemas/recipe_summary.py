@@ -0,0 +1,30 @@
+from typing import Annotated, Any, Optional
+
+from pydantic import BaseModel, Field, HttpUrl, StringConstraints, field_validator
+
+from .ingredient import Ingredient
+from .recipe import drop_empty_urls
+
+
+class RecipeSummary(BaseModel):
+    """
+    Recipe card for list views, without the instructions
+    """
+
+    id: int
+    title: str
+    cooking_time_in_minutes: int
+    difficulty: str
+    cuisine: Optional[str] = None
+    ingredients: list[Ingredient] = Field(default_factory=list, max_length=100)
+    image_urls: list[Annotated[HttpUrl, StringConstraints(max_length=1024)]] = Field(
+        default_factory=list, max_length=10
+    )
+
+    @field_validator("image_urls", mode="before")
+    def filter_empty_urls(cls, v: Any) -> list[str]:
+        return drop_empty_urls(v)
+
+    # for reading data from SQLAlchemy objects
+    class Config:
+        from_attributes = True
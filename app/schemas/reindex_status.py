@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ReindexStatus(BaseModel):
+    id: int
+    status: str
+    base_collection: str
+    target_collection: str
+    model_id: str
+    processed: int
+    total: int
+    last_recipe_id: int
+    docs_per_second: float
+    eta_seconds: Optional[float] = None
+    error: Optional[str] = None
+    started_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
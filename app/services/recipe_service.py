@@ -1,34 +1,146 @@
-import re
-from typing import Any, List, Optional, Sequence, Tuple
+import hashlib
+import heapq
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, List, Literal, Optional, Sequence, Tuple, TypeVar
 from typing import cast as t_cast
 
 import inflect
-from sqlalchemy import String, not_, or_
-from sqlalchemy import cast as sa_cast
+import numpy as np
+from sqlalchemy import (
+    Integer,
+    and_,
+    delete,
+    func,
+    insert,
+    literal,
+    not_,
+    or_,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import load_only
+from sqlalchemy.sql.elements import ColumnElement
 from sqlalchemy.sql.selectable import Select
 
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.ingredient_index import IndexRow, ingredient_index
+from app.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
 from app.core.s3_client import s3_client
-from app.core.text_utils import get_word_forms
-from app.core.vector_store import vector_store
-from app.models import Recipe
-from app.schemas import RecipeCreate, RecipeUpdate
+from app.core.text_utils import (
+    flatten_ingredients,
+    get_ingredient_term_groups,
+    get_ingredient_terms,
+    get_word_forms,
+    normalize_ingredient,
+)
+from app.core.token_budget import DocumentSection
+from app.core.vector_backends import VectorBackend, Where, hnsw_search_settings
+from app.core.vector_indexer import vector_indexer
+from app.core.vector_store import RecipeDocument, embedding_model_id, vector_store
+from app.models import (
+    Recipe,
+    RecipeEmbedding,
+    RecipeFacetCount,
+    ReindexJob,
+    VectorOutbox,
+)
+from app.schemas import (
+    FacetCount,
+    RecipeCreate,
+    RecipeFacets,
+    RecipeSearchQuery,
+    RecipeUpdate,
+)
+
+logger = logging.getLogger(__name__)
 
 p = inflect.engine()
 
+RowT = TypeVar("RowT", bound=Tuple[Any, ...])
+
+SEARCH_CANDIDATES = 50
+SEARCH_RESULTS_LIMIT = 6
+SEARCH_OVERFETCH_FACTOR = 4
+PANTRY_RESULTS_LIMIT = 20
+# Rows per round trip when pantry coverage is counted without the index
+PANTRY_SCAN_BATCH_SIZE = 1000
+FACET_INGREDIENTS_LIMIT = 20
+SIMILAR_RESULTS_LIMIT = 6
+# Neighbour lists are cached at this depth and sliced to the requested limit
+SIMILAR_MAX_RESULTS = 20
+
+SearchStrategy = Literal["auto", "exact", "ann"]
+IngredientMatch = Literal["exact", "prefix", "fuzzy"]
+# newest sorts by id descending, the others ascending with id as tie-breaker
+RecipeSort = Literal["newest", "cooking_time", "title"]
+# summary leaves out the instructions and the columns only used for filtering
+RecipeView = Literal["full", "summary"]
+OutboxOperation = Literal["upsert", "metadata", "delete"]
+
+# Bump when the format of _semantic_sections or its truncation changes
+SEMANTIC_DOCUMENT_VERSION = 2
+
 __all__ = [
     "create_recipe",
+    "create_recipes_bulk",
     "get_all_recipes",
+    "get_recipes_page",
     "get_recipe_by_id",
     "update_recipe",
     "delete_recipe",
+    "build_ingredient_index",
     "search_recipes_by_vector",
+    "search_recipes_page",
+    "search_recipes_batch",
+    "search_pantry",
+    "get_similar_recipes",
+    "get_recipe_facets",
+    "sync_vector_outbox",
+    "drain_vector_outbox",
+    "get_vector_outbox_stats",
+    "build_recipe_document",
     "vector_store",
 ]
 
 
-def _create_semantic_document(recipe: Recipe) -> tuple[str, dict[str, Any]]:
+@dataclass(frozen=True)
+class SearchCandidates:
+    """
+    Ranked ids that passed every filter and how deep the vector index was read
+    """
+
+    recipe_ids: List[int]
+    depth: int
+    exhausted: bool
+
+
+SearchKey = Tuple[Any, ...]
+
+search_candidates: TTLCache[SearchKey, SearchCandidates] = TTLCache(
+    max_size=settings.SEARCH_CURSOR_CACHE_SIZE,
+    ttl_seconds=settings.SEARCH_CURSOR_TTL_SECONDS,
+)
+
+# Nearest neighbours per (collection, recipe id)
+similar_recipes: TTLCache[Tuple[str, int], List[int]] = TTLCache(
+    max_size=settings.SIMILAR_RECIPES_CACHE_SIZE,
+    ttl_seconds=settings.SIMILAR_RECIPES_TTL_SECONDS,
+)
+
+
+def _semantic_sections(recipe: Recipe) -> List[DocumentSection]:
+    """
+    Parts of the embedded document, instructions are truncated first
+    and the ingredients next when a recipe exceeds the model's token limit
+    """
     time_description = "Standard cooking time"
     t = recipe.cooking_time_in_minutes
     if t <= 15:
@@ -44,85 +156,434 @@ def _create_semantic_document(recipe: Recipe) -> tuple[str, dict[str, Any]]:
         names = [item.get("name", "") for item in ingredients]
         ingredients_str = ", ".join(names)
 
-    doc_to_embed = (
-        f"Title: {recipe.title}. "
-        f"Ingredients: {ingredients_str}. "
-        f"Instructions: {recipe.instructions}. "
-        f"Cooking time: {t} minutes ({time_description}). "
-        f"Difficulty: {recipe.difficulty}. "
-        f"Cuisine: {recipe.cuisine}."
-    )
-
-    metadata = {
+    return [
+        DocumentSection(f"Title: {recipe.title}.", priority=2),
+        DocumentSection(f"Ingredients: {ingredients_str}.", priority=1),
+        DocumentSection(f"Instructions: {recipe.instructions}.", priority=0),
+        DocumentSection(
+            f"Cooking time: {t} minutes ({time_description}). "
+            f"Difficulty: {recipe.difficulty}. "
+            f"Cuisine: {recipe.cuisine}.",
+            priority=2,
+        ),
+    ]
+
+
+def _semantic_metadata(recipe: Recipe) -> dict[str, Any]:
+    return {
         "title": recipe.title,
         "cooking_time": recipe.cooking_time_in_minutes,
         "difficulty": recipe.difficulty,
         "cuisine": recipe.cuisine or "",
     }
 
-    return doc_to_embed, metadata
+
+def _create_semantic_document(recipe: Recipe) -> tuple[str, dict[str, Any]]:
+    """
+    Untruncated document and metadata, the document only feeds the hash
+    deciding whether a write needs a new embedding
+    """
+    doc_to_embed = " ".join(section.text for section in _semantic_sections(recipe))
+    return doc_to_embed, _semantic_metadata(recipe)
+
+
+def build_recipe_document(recipe: Recipe) -> RecipeDocument:
+    """
+    Document to embed, fitted to the token limit of the embedding model
+    """
+    texts = vector_store.token_budget.fit(
+        _semantic_sections(recipe), max_chunks=settings.SEMANTIC_DOCUMENT_MAX_CHUNKS
+    )
+    return RecipeDocument(
+        recipe.id,
+        recipe.title,
+        texts[0],
+        _semantic_metadata(recipe),
+        extra_texts=texts[1:],
+    )
+
+
+def _ingredient_names(recipe: Recipe) -> List[str]:
+    return [item.get("name", "") for item in recipe.ingredients or []]
+
+
+SUMMARY_COLUMNS = (
+    Recipe.id,
+    Recipe.title,
+    Recipe.cooking_time_in_minutes,
+    Recipe.difficulty,
+    Recipe.cuisine,
+    Recipe.ingredients,
+    Recipe.image_urls,
+)
+
+
+def _select_recipes(view: RecipeView = "full") -> Select[Tuple[Recipe]]:
+    query = select(Recipe)
+    if view == "summary":
+        # raiseload turns an accidental lazy load of a skipped column into an error
+        query = query.options(load_only(*SUMMARY_COLUMNS, raiseload=True))
+    return query
+
+
+FacetKey = Tuple[str, str]
+
+
+def _recipe_facets(recipe: Recipe) -> Counter[FacetKey]:
+    """
+    Facet values a recipe adds to recipe_facet_counts, ingredients once each
+    """
+    facets: Counter[FacetKey] = Counter({("total", ""): 1})
+    if recipe.cuisine:
+        facets["cuisine", recipe.cuisine] += 1
+    facets["difficulty", recipe.difficulty] += 1
+    for name in {normalize_ingredient(n) for n in _ingredient_names(recipe)}:
+        if name:
+            facets["ingredient", name] += 1
+    return facets
+
+
+async def _apply_facet_delta(db: AsyncSession, delta: Counter[FacetKey]) -> None:
+    """
+    Add `delta` to recipe_facet_counts in the current transaction
+    """
+    # Sorted keys keep concurrent writers locking rows in the same order
+    rows = [
+        {"facet": facet, "value": value, "count": count}
+        for (facet, value), count in sorted(delta.items())
+        if count
+    ]
+    if not rows:
+        return
+
+    stmt = pg_insert(RecipeFacetCount)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[RecipeFacetCount.facet, RecipeFacetCount.value],
+        set_={"count": RecipeFacetCount.count + stmt.excluded.count},
+    )
+    await db.execute(stmt, rows)
+
+
+async def _enqueue_vector_sync(
+    db: AsyncSession, changes: Sequence[Tuple[int, OutboxOperation]]
+) -> None:
+    """
+    Queue vector store changes in the current transaction
+    """
+    if changes:
+        await db.execute(
+            insert(VectorOutbox),
+            [{"recipe_id": rid, "operation": op} for rid, op in changes],
+        )
+
+
+async def _sync_vectors(db: AsyncSession) -> None:
+    """
+    Apply the outbox right away in inline mode, otherwise wake up the indexer
+    """
+    if settings.VECTOR_SYNC_MODE != "inline":
+        vector_indexer.notify()
+        return
+
+    # A separate session keeps a failed batch from expiring the caller's objects
+    async with AsyncSession(bind=db.bind, expire_on_commit=False) as sync_db:
+        try:
+            await drain_vector_outbox(sync_db)
+        except Exception as ex:
+            logger.error(f"Inline vector sync failed, left to the indexer: {ex}")
+            vector_indexer.notify()
+
+
+def _semantic_hash(text: str) -> str:
+    """
+    Fingerprint of an embedded document together with the model that encoded it
+    """
+    payload = f"{embedding_model_id()}\n{SEMANTIC_DOCUMENT_VERSION}\n{text}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _split_filter_items(items_str: str) -> List[str]:
+    items = [normalize_ingredient(i) for i in items_str.split(",")]
+    return [item for item in items if item]
+
+
+def _ingredient_filter_terms(items_str: str) -> List[List[str]]:
+    """
+    Word forms of each comma-separated filter item
+    """
+    return [sorted(get_word_forms(item)) for item in _split_filter_items(items_str)]
+
+
+def _trigram_condition(item: str, match: IngredientMatch) -> ColumnElement[bool]:
+    """
+    Condition on ingredients_text that the pg_trgm GIN index can serve
+    """
+    if match == "prefix":
+        # Items are normalized to word characters and spaces, safe in a regex
+        return Recipe.ingredients_text.op("~")(f"\\y{item}")
+    return Recipe.ingredients_text.op("%>")(item)
 
 
 def _apply_ingredient_filter(
-    query: Select[Tuple[Recipe]],
+    query: Select[RowT],
     include_str: Optional[str] = None,
     exclude_str: Optional[str] = None,
-) -> Select[Tuple[Recipe]]:
+    match: IngredientMatch = "exact",
+) -> Select[RowT]:
     """
     Apply include/exclude filters to sqlalchemy object
     """
-    json_as_text = sa_cast(Recipe.ingredients, String)
+    if match != "exact":
+        if include_str:
+            for item in _split_filter_items(include_str):
+                query = query.where(_trigram_condition(item, match))
+        if exclude_str:
+            conditions = [
+                _trigram_condition(item, match)
+                for item in _split_filter_items(exclude_str)
+            ]
+            if conditions:
+                query = query.where(not_(or_(*conditions)))
+        return query
 
     if include_str:
-        raw_items = [i.strip() for i in include_str.split(",") if i.strip()]
-        for item in raw_items:
-            terms = get_word_forms(item)
+        for terms in _ingredient_filter_terms(include_str):
+            query = query.where(Recipe.ingredient_terms.overlap(terms))
 
-            term_conditions = []
-            for term in terms:
-                safe_term = re.escape(term)
-                pattern = f"\\y{safe_term}\\y"
-
-                term_conditions.append(json_as_text.op("~*")(pattern))
+    if exclude_str:
+        exclude_terms = sorted(
+            {term for terms in _ingredient_filter_terms(exclude_str) for term in terms}
+        )
+        if exclude_terms:
+            query = query.where(not_(Recipe.ingredient_terms.overlap(exclude_terms)))
 
-            query = query.where(or_(*term_conditions))
+    return query
 
-    if exclude_str:
-        raw_items = [i.strip() for i in exclude_str.split(",") if i.strip()]
-        exclude_conditions = []
-        for item in raw_items:
-            terms = get_word_forms(item)
-            for term in terms:
-                safe_term = re.escape(term)
-                pattern = f"\\y{safe_term}\\y"
-                exclude_conditions.append(json_as_text.op("~*")(pattern))
-
-        if exclude_conditions:
-            query = query.where(not_(or_(*exclude_conditions)))
 
+def _apply_attribute_filter(
+    query: Select[RowT],
+    max_cooking_time: Optional[int] = None,
+    difficulty: Optional[str] = None,
+    cuisine: Optional[str] = None,
+) -> Select[RowT]:
+    """
+    Apply cooking time / difficulty / cuisine filters to sqlalchemy object
+    """
+    if max_cooking_time is not None:
+        query = query.where(Recipe.cooking_time_in_minutes <= max_cooking_time)
+    if difficulty:
+        query = query.where(Recipe.difficulty == difficulty)
+    if cuisine:
+        query = query.where(Recipe.cuisine == cuisine)
     return query
 
 
+def _build_metadata_where(
+    max_cooking_time: Optional[int] = None,
+    difficulty: Optional[str] = None,
+    cuisine: Optional[str] = None,
+) -> Optional[Where]:
+    """
+    Same filters as _apply_attribute_filter, expressed on vector store metadata
+    """
+    conditions: List[Where] = []
+    if max_cooking_time is not None:
+        conditions.append({"cooking_time": {"$lte": max_cooking_time}})
+    if difficulty:
+        conditions.append({"difficulty": {"$eq": difficulty}})
+    if cuisine:
+        conditions.append({"cuisine": {"$eq": cuisine}})
+
+    if not conditions:
+        return None
+    if len(conditions) == 1:
+        return conditions[0]
+    return {"$and": conditions}
+
+
 async def create_recipe(db: AsyncSession, *, recipe_in: RecipeCreate) -> Recipe:
     recipe_data = recipe_in.model_dump(exclude={"ingredients"})
     json_ingredients = [{"name": name} for name in recipe_in.ingredients]
 
-    db_recipe = Recipe(**recipe_data, ingredients=json_ingredients)
+    db_recipe = Recipe(
+        **recipe_data,
+        ingredients=json_ingredients,
+        ingredient_terms=get_ingredient_terms(recipe_in.ingredients),
+        ingredients_text=flatten_ingredients(recipe_in.ingredients),
+    )
+
+    text, _ = _create_semantic_document(db_recipe)
+    db_recipe.embedding_hash = _semantic_hash(text)
 
     db.add(db_recipe)
+    await db.flush()
+    await _apply_facet_delta(db, _recipe_facets(db_recipe))
+    await _enqueue_vector_sync(db, [(db_recipe.id, "upsert")])
     await db.commit()
     await db.refresh(db_recipe)
+    search_candidates.clear()
+    ingredient_index.add(
+        db_recipe.id, get_ingredient_term_groups(recipe_in.ingredients)
+    )
 
-    text, meta = _create_semantic_document(db_recipe)
+    await _sync_vectors(db)
+    return db_recipe
 
-    await vector_store.upsert_recipe(
-        recipe_id=db_recipe.id,
-        title=db_recipe.title,
-        full_text=text,
-        metadata=meta,
+
+async def create_recipes_bulk(
+    db: AsyncSession, *, recipes_in: Sequence[RecipeCreate]
+) -> List[Recipe]:
+    """
+    Insert many recipes in one transaction and index them in batches
+    """
+    if not recipes_in:
+        return []
+
+    rows = []
+    facets: Counter[FacetKey] = Counter()
+    for recipe_in in recipes_in:
+        row = {
+            **recipe_in.model_dump(exclude={"ingredients"}),
+            "ingredients": [{"name": name} for name in recipe_in.ingredients],
+            "ingredient_terms": get_ingredient_terms(recipe_in.ingredients),
+            "ingredients_text": flatten_ingredients(recipe_in.ingredients),
+        }
+        draft = Recipe(**row)
+        text, _ = _create_semantic_document(draft)
+        row["embedding_hash"] = _semantic_hash(text)
+        facets.update(_recipe_facets(draft))
+
+        rows.append(row)
+
+    result = await db.scalars(
+        insert(Recipe).returning(Recipe, sort_by_parameter_order=True), rows
+    )
+    db_recipes = list(result.all())
+    await _apply_facet_delta(db, facets)
+    await _enqueue_vector_sync(db, [(r.id, "upsert") for r in db_recipes])
+    await db.commit()
+    search_candidates.clear()
+    ingredient_index.add_many(
+        [
+            (db_recipe.id, get_ingredient_term_groups(recipe_in.ingredients))
+            for db_recipe, recipe_in in zip(db_recipes, recipes_in, strict=True)
+        ]
     )
 
-    return db_recipe
+    await _sync_vectors(db)
+    return db_recipes
+
+
+_SORT_COLUMNS: dict[str, Any] = {
+    "cooking_time": Recipe.cooking_time_in_minutes,
+    "title": Recipe.title,
+}
+# Python type of the sort key a cursor carries for each sort
+_SORT_KEY_TYPES: dict[str, type] = {"cooking_time": int, "title": str}
+
+
+def _decode_list_cursor(cursor: str, sort: RecipeSort) -> Tuple[Any, int]:
+    payload = decode_cursor(cursor)
+    last_id = payload.get("id")
+    last_key = payload.get("k")
+    if (
+        payload.get("sort", "newest") != sort
+        or not isinstance(last_id, int)
+        or isinstance(last_id, bool)
+        or (
+            sort != "newest"
+            and (
+                not isinstance(last_key, _SORT_KEY_TYPES[sort])
+                or isinstance(last_key, bool)
+            )
+        )
+    ):
+        raise InvalidCursorError("Cursor does not belong to the recipe list")
+    return last_key, last_id
+
+
+def _apply_list_order(
+    query: Select[RowT], sort: RecipeSort, after: Optional[Tuple[Any, int]]
+) -> Select[RowT]:
+    """
+    Keyset ordering matching the (column, id) composite indexes,
+    `after` is the sort key and id of the last row of the previous page
+    """
+    if sort == "newest":
+        if after is not None:
+            query = query.where(Recipe.id < after[1])
+        return query.order_by(Recipe.id.desc())
+
+    column = _SORT_COLUMNS[sort]
+    if after is not None:
+        last_key, last_id = after
+        query = query.where(
+            tuple_(column, Recipe.id) > tuple_(literal(last_key), literal(last_id))
+        )
+    return query.order_by(column, Recipe.id)
+
+
+async def get_recipes_page(
+    db: AsyncSession,
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    include_str: Optional[str] = None,
+    exclude_str: Optional[str] = None,
+    match: IngredientMatch = "exact",
+    max_cooking_time: Optional[int] = None,
+    difficulty: Optional[str] = None,
+    cuisine: Optional[str] = None,
+    sort: RecipeSort = "newest",
+    view: RecipeView = "full",
+    cursor: Optional[str] = None,
+) -> Tuple[Sequence[Recipe], Optional[str]]:
+    """
+    One page of recipes and the cursor of the next page, if any.
+    The cursor holds the sort key and id of the last returned recipe, so deep
+    pages stay an index range scan instead of an ever growing offset
+    """
+    after = _decode_list_cursor(cursor, sort) if cursor else None
+    has_attribute_filter = (
+        max_cooking_time is not None or bool(difficulty) or bool(cuisine)
+    )
+
+    if (
+        ingredient_index.ready
+        and match == "exact"
+        and (include_str or exclude_str)
+        and sort == "newest"
+        and not has_attribute_filter
+    ):
+        recipes = await _get_recipes_from_index(
+            db,
+            skip=skip,
+            limit=limit + 1,
+            last_id=after[1] if after else None,
+            include_str=include_str,
+            exclude_str=exclude_str,
+            view=view,
+        )
+    else:
+        query = _select_recipes(view)
+
+        query = _apply_ingredient_filter(query, include_str, exclude_str, match)
+        query = _apply_attribute_filter(query, max_cooking_time, difficulty, cuisine)
+        query = _apply_list_order(query, sort, after)
+
+        query = query.offset(skip).limit(limit + 1)
+        result = await db.execute(query)
+        recipes = result.scalars().all()
+
+    next_cursor = None
+    if len(recipes) > limit:
+        recipes = recipes[:limit]
+        last = recipes[-1]
+        payload: dict[str, Any] = {"sort": sort, "id": last.id}
+        if sort != "newest":
+            payload["k"] = getattr(last, _SORT_COLUMNS[sort].key)
+        next_cursor = encode_cursor(payload)
+    return recipes, next_cursor
 
 
 async def get_all_recipes(
@@ -132,17 +593,94 @@ async def get_all_recipes(
     limit: int = 100,
     include_str: Optional[str] = None,
     exclude_str: Optional[str] = None,
+    match: IngredientMatch = "exact",
+    max_cooking_time: Optional[int] = None,
+    difficulty: Optional[str] = None,
+    cuisine: Optional[str] = None,
+    sort: RecipeSort = "newest",
+    view: RecipeView = "full",
 ) -> Sequence[Recipe]:
-    query = select(Recipe)
+    recipes, _ = await get_recipes_page(
+        db,
+        skip=skip,
+        limit=limit,
+        include_str=include_str,
+        exclude_str=exclude_str,
+        match=match,
+        max_cooking_time=max_cooking_time,
+        difficulty=difficulty,
+        cuisine=cuisine,
+        sort=sort,
+        view=view,
+    )
+    return recipes
 
-    query = _apply_ingredient_filter(query, include_str, exclude_str)
 
-    query = query.order_by(Recipe.id.desc())
-    query = query.offset(skip).limit(limit)
+async def _get_recipes_from_index(
+    db: AsyncSession,
+    *,
+    skip: int,
+    limit: int,
+    last_id: Optional[int] = None,
+    include_str: Optional[str] = None,
+    exclude_str: Optional[str] = None,
+    view: RecipeView = "full",
+) -> Sequence[Recipe]:
+    """
+    Ingredient filters resolved by the in-memory index, then a primary key fetch
+    """
+    include = _ingredient_filter_terms(include_str) if include_str else []
+    exclude = [
+        term
+        for terms in (_ingredient_filter_terms(exclude_str) if exclude_str else [])
+        for term in terms
+    ]
+    recipe_ids = ingredient_index.filter_ids(include, exclude)
+    if last_id is not None:
+        recipe_ids = recipe_ids[: np.searchsorted(recipe_ids, last_id)]
+
+    # Newest first, same order as the SQL path
+    page_ids = recipe_ids[::-1][skip : skip + limit]
+    if not page_ids.size:
+        return []
+
+    query = (
+        _select_recipes(view)
+        .where(Recipe.id.in_(page_ids.tolist()))
+        .order_by(Recipe.id.desc())
+    )
     result = await db.execute(query)
     return result.scalars().all()
 
 
+async def build_ingredient_index(db: AsyncSession) -> None:
+    """
+    Load the ingredient terms of every recipe into the in-memory index
+    """
+
+    # Ingredient names repeat a lot across recipes, expand each one once
+    terms_by_name: dict[str, List[str]] = {}
+
+    def name_terms(name: str) -> List[str]:
+        if name not in terms_by_name:
+            terms_by_name[name] = get_ingredient_terms([name])
+        return terms_by_name[name]
+
+    async def batches() -> AsyncIterator[List[IndexRow]]:
+        result = await db.stream(
+            select(Recipe.id, Recipe.ingredients)
+            .order_by(Recipe.id)
+            .execution_options(yield_per=settings.INGREDIENT_INDEX_BUILD_BATCH_SIZE)
+        )
+        async for partition in result.partitions():
+            yield [
+                (row.id, [name_terms(i.get("name", "")) for i in row.ingredients])
+                for row in partition
+            ]
+
+    await ingredient_index.build(batches())
+
+
 async def get_recipe_by_id(db: AsyncSession, *, recipe_id: int) -> Optional[Recipe]:
     query = select(Recipe).where(Recipe.id == recipe_id)
     result = await db.execute(query)
@@ -153,6 +691,10 @@ async def update_recipe(
     db: AsyncSession, *, db_recipe: Recipe, recipe_in: RecipeUpdate
 ) -> Recipe:
     update_data = recipe_in.model_dump(exclude_unset=True)
+    _, previous_meta = _create_semantic_document(db_recipe)
+    previous_hash = db_recipe.embedding_hash
+    previous_names = _ingredient_names(db_recipe)
+    previous_facets = _recipe_facets(db_recipe)
 
     if "image_urls" in update_data:
         raw_urls = update_data.pop("image_urls")
@@ -177,6 +719,8 @@ async def update_recipe(
         json_ingredients = [{"name": i} for i in raw_ingredients]
 
         db_recipe.ingredients = json_ingredients
+        db_recipe.ingredient_terms = get_ingredient_terms(raw_ingredients)
+        db_recipe.ingredients_text = flatten_ingredients(raw_ingredients)
 
     if "image_urls" in update_data and update_data["image_urls"] is not None:
         update_data["image_urls"] = [str(url) for url in update_data["image_urls"]]
@@ -184,30 +728,49 @@ async def update_recipe(
     for field, value in update_data.items():
         setattr(db_recipe, field, value)
 
+    text, meta = _create_semantic_document(db_recipe)
+    new_hash = _semantic_hash(text)
+    db_recipe.embedding_hash = new_hash
+
+    facet_delta = _recipe_facets(db_recipe)
+    facet_delta.subtract(previous_facets)
+
     db.add(db_recipe)
+    await _apply_facet_delta(db, facet_delta)
+    if new_hash != previous_hash:
+        await _enqueue_vector_sync(db, [(db_recipe.id, "upsert")])
+    elif meta != previous_meta:
+        await _enqueue_vector_sync(db, [(db_recipe.id, "metadata")])
     await db.commit()
 
     await db.refresh(db_recipe)
-
-    text, meta = _create_semantic_document(db_recipe)
-
-    await vector_store.upsert_recipe(
-        recipe_id=db_recipe.id,
-        title=db_recipe.title,
-        full_text=text,
-        metadata=meta,
-    )
-
+    search_candidates.clear()
+    current_names = _ingredient_names(db_recipe)
+    if current_names != previous_names:
+        ingredient_index.update(
+            db_recipe.id,
+            get_ingredient_term_groups(previous_names),
+            get_ingredient_term_groups(current_names),
+        )
+
+    await _sync_vectors(db)
     return db_recipe
 
 
 async def delete_recipe(db: AsyncSession, *, recipe_id: int) -> Optional[Recipe]:
     db_recipe = await get_recipe_by_id(db=db, recipe_id=recipe_id)
     if db_recipe:
+        ingredient_names = _ingredient_names(db_recipe)
+        removed_facets: Counter[FacetKey] = Counter()
+        removed_facets.subtract(_recipe_facets(db_recipe))
+        await _apply_facet_delta(db, removed_facets)
+        await _enqueue_vector_sync(db, [(recipe_id, "delete")])
         await db.delete(db_recipe)
         await db.commit()
+        search_candidates.clear()
+        ingredient_index.remove(recipe_id, get_ingredient_term_groups(ingredient_names))
 
-        await vector_store.delete_recipe(recipe_id)
+        await _sync_vectors(db)
     return db_recipe
 
 
@@ -239,29 +802,843 @@ async def delete_recipe_images(
     return db_recipe
 
 
-async def search_recipes_by_vector(
+async def _search_recipes_in_db(
     db: AsyncSession,
     *,
     query_str: str,
     include_str: Optional[str] = None,
     exclude_str: Optional[str] = None,
+    match: IngredientMatch = "exact",
+    max_cooking_time: Optional[int] = None,
+    difficulty: Optional[str] = None,
+    cuisine: Optional[str] = None,
+    limit: int = SEARCH_RESULTS_LIMIT,
+    offset: int = 0,
+    view: RecipeView = "full",
 ) -> List[Recipe]:
-    recipe_ids = await vector_store.search(query=query_str, n_results=50)
+    """
+    Vector ranking, ingredient filters and limit in one SQL query (pgvector)
+    """
+    query_embedding = await vector_store.embed_query(query_str)
+
+    query = _select_recipes(view).join(
+        RecipeEmbedding,
+        and_(
+            RecipeEmbedding.recipe_id == Recipe.id,
+            RecipeEmbedding.collection == vector_store.collection_name,
+        ),
+    )
+    query = _apply_ingredient_filter(query, include_str, exclude_str, match)
+    query = _apply_attribute_filter(query, max_cooking_time, difficulty, cuisine)
+    query = (
+        query.order_by(RecipeEmbedding.embedding.l2_distance(query_embedding.tolist()))
+        .offset(offset)
+        .limit(limit)
+    )
+
+    await db.execute(hnsw_search_settings(offset + limit))
+    result = await db.execute(query)
+    return list(result.scalars().all())
+
+
+async def _plan_search(
+    db: AsyncSession,
+    *,
+    strategy: SearchStrategy,
+    include_str: Optional[str] = None,
+    exclude_str: Optional[str] = None,
+    match: IngredientMatch = "exact",
+    max_cooking_time: Optional[int] = None,
+    difficulty: Optional[str] = None,
+    cuisine: Optional[str] = None,
+) -> Tuple[SearchStrategy, List[int]]:
+    """
+    Choose between exact scoring of the eligible recipes and an ANN query.
+    Selectivity is estimated by counting eligible ids up to
+    SEARCH_EXACT_MAX_CANDIDATES; below it every eligible vector is scored
+    """
+    if strategy == "ann":
+        return "ann", []
+    # Attribute filters alone are pushed into the vector store as `where`
+    if strategy == "auto" and not (include_str or exclude_str):
+        return "ann", []
+
+    query = select(Recipe.id)
+    query = _apply_ingredient_filter(query, include_str, exclude_str, match)
+    query = _apply_attribute_filter(query, max_cooking_time, difficulty, cuisine)
+    if strategy == "auto":
+        query = query.limit(settings.SEARCH_EXACT_MAX_CANDIDATES + 1)
 
+    eligible_ids = list((await db.scalars(query)).all())
+    if len(eligible_ids) > settings.SEARCH_EXACT_MAX_CANDIDATES and strategy == "auto":
+        return "ann", []
+    return "exact", eligible_ids
+
+
+async def _filter_recipe_ids(
+    db: AsyncSession,
+    recipe_ids: Sequence[int],
+    *,
+    include_str: Optional[str] = None,
+    exclude_str: Optional[str] = None,
+    match: IngredientMatch = "exact",
+    max_cooking_time: Optional[int] = None,
+    difficulty: Optional[str] = None,
+    cuisine: Optional[str] = None,
+) -> List[int]:
+    """
+    Ids from `recipe_ids` passing the filters, in the same order
+    """
+    has_filter = include_str or exclude_str or difficulty or cuisine
+    if not recipe_ids or not (has_filter or max_cooking_time is not None):
+        return list(recipe_ids)
+
+    query = select(Recipe.id).where(Recipe.id.in_(recipe_ids))
+    query = _apply_ingredient_filter(query, include_str, exclude_str, match)
+    query = _apply_attribute_filter(query, max_cooking_time, difficulty, cuisine)
+
+    passed = set((await db.scalars(query)).all())
+    return [rid for rid in recipe_ids if rid in passed]
+
+
+async def _fetch_ranked_recipes(
+    db: AsyncSession, recipe_ids: Sequence[int], view: RecipeView = "full"
+) -> List[Recipe]:
+    """
+    Load recipes keeping the order of `recipe_ids`
+    """
     if not recipe_ids:
         return []
 
-    query = select(Recipe).where(Recipe.id.in_(recipe_ids))
+    result = await db.execute(_select_recipes(view).where(Recipe.id.in_(recipe_ids)))
+    recipes_map = {r.id: r for r in result.scalars().unique().all()}
 
-    query = _apply_ingredient_filter(query, include_str, exclude_str)
+    return [recipes_map[rid] for rid in recipe_ids if rid in recipes_map]
 
-    result = await db.execute(query)
-    recipes = result.scalars().unique().all()
 
-    recipes_map = {r.id: r for r in recipes}
-    ordered_recipes = []
-    for rid in recipe_ids:
-        if rid in recipes_map:
-            ordered_recipes.append(recipes_map[rid])
+async def _load_search_candidates(
+    db: AsyncSession,
+    key: SearchKey,
+    *,
+    needed: int,
+    query_str: str,
+    strategy: SearchStrategy,
+    include_str: Optional[str] = None,
+    exclude_str: Optional[str] = None,
+    match: IngredientMatch = "exact",
+    max_cooking_time: Optional[int] = None,
+    difficulty: Optional[str] = None,
+    cuisine: Optional[str] = None,
+) -> SearchCandidates:
+    """
+    Cached ranked candidates, read deeper from the vector index only when
+    fewer than `needed` are known
+    """
+    filters: dict[str, Any] = {
+        "include_str": include_str,
+        "exclude_str": exclude_str,
+        "match": match,
+        "max_cooking_time": max_cooking_time,
+        "difficulty": difficulty,
+        "cuisine": cuisine,
+    }
+
+    candidates = search_candidates.get(key)
+    if candidates is None:
+        plan, eligible_ids = await _plan_search(db, strategy=strategy, **filters)
+        if plan == "exact":
+            ranked_ids = await vector_store.search_subset(
+                query=query_str, ids=eligible_ids, n_results=len(eligible_ids)
+            )
+            candidates = SearchCandidates(ranked_ids, len(ranked_ids), True)
+        else:
+            candidates = SearchCandidates([], 0, False)
+
+    where = _build_metadata_where(max_cooking_time, difficulty, cuisine)
+    while len(candidates.recipe_ids) < needed and not candidates.exhausted:
+        # Over-fetch until the post-filter leaves enough ids or the index runs dry
+        depth = min(
+            max(candidates.depth * SEARCH_OVERFETCH_FACTOR, SEARCH_CANDIDATES, needed),
+            settings.SEARCH_MAX_CANDIDATES,
+        )
+        recipe_ids = await vector_store.search(
+            query=query_str, n_results=depth, where=where
+        )
+
+        known = set(candidates.recipe_ids)
+        fresh_ids = [rid for rid in recipe_ids[candidates.depth :] if rid not in known]
+        passed = await _filter_recipe_ids(db, fresh_ids, **filters)
+
+        candidates = SearchCandidates(
+            recipe_ids=candidates.recipe_ids + passed,
+            depth=depth,
+            exhausted=len(recipe_ids) < depth
+            or depth >= settings.SEARCH_MAX_CANDIDATES,
+        )
+
+    search_candidates.set(key, candidates)
+    return candidates
+
+
+def _search_scope(key: SearchKey) -> str:
+    return hashlib.sha256(repr(key).encode("utf-8")).hexdigest()[:16]
+
+
+def _decode_search_cursor(cursor: str, scope: str) -> int:
+    payload = decode_cursor(cursor)
+    offset = payload.get("o")
+    if payload.get("s") != scope or not isinstance(offset, int) or offset < 0:
+        raise InvalidCursorError("Cursor does not belong to this search")
+    return offset
+
+
+async def search_recipes_page(
+    db: AsyncSession,
+    *,
+    query_str: str,
+    include_str: Optional[str] = None,
+    exclude_str: Optional[str] = None,
+    match: IngredientMatch = "exact",
+    max_cooking_time: Optional[int] = None,
+    difficulty: Optional[str] = None,
+    cuisine: Optional[str] = None,
+    strategy: SearchStrategy = "auto",
+    limit: int = SEARCH_RESULTS_LIMIT,
+    view: RecipeView = "full",
+    cursor: Optional[str] = None,
+) -> Tuple[List[Recipe], Optional[str]]:
+    """
+    One page of search results and the cursor of the next page, if any.
+    Later pages only load rows from Postgres until the cached candidates run out
+    """
+    key: SearchKey = (
+        vector_store.collection_name,
+        query_str,
+        include_str,
+        exclude_str,
+        match,
+        max_cooking_time,
+        difficulty,
+        cuisine,
+        strategy,
+    )
+    scope = _search_scope(key)
+    offset = _decode_search_cursor(cursor, scope) if cursor else 0
+
+    # pgvector evaluates every filter inside the ranking query, no planning needed
+    if vector_store.backend.supports_sql_join:
+        recipes = await _search_recipes_in_db(
+            db,
+            query_str=query_str,
+            include_str=include_str,
+            exclude_str=exclude_str,
+            match=match,
+            max_cooking_time=max_cooking_time,
+            difficulty=difficulty,
+            cuisine=cuisine,
+            limit=limit + 1,
+            offset=offset,
+            view=view,
+        )
+        has_more = len(recipes) > limit
+        recipes = recipes[:limit]
+    else:
+        candidates = await _load_search_candidates(
+            db,
+            key,
+            needed=offset + limit + 1,
+            query_str=query_str,
+            strategy=strategy,
+            include_str=include_str,
+            exclude_str=exclude_str,
+            match=match,
+            max_cooking_time=max_cooking_time,
+            difficulty=difficulty,
+            cuisine=cuisine,
+        )
+        page_ids = candidates.recipe_ids[offset : offset + limit]
+        recipes = await _fetch_ranked_recipes(db, page_ids, view)
+        has_more = len(candidates.recipe_ids) > offset + limit
+
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor({"s": scope, "o": offset + limit})
+    return recipes, next_cursor
+
+
+async def search_recipes_by_vector(
+    db: AsyncSession,
+    *,
+    query_str: str,
+    include_str: Optional[str] = None,
+    exclude_str: Optional[str] = None,
+    match: IngredientMatch = "exact",
+    max_cooking_time: Optional[int] = None,
+    difficulty: Optional[str] = None,
+    cuisine: Optional[str] = None,
+    strategy: SearchStrategy = "auto",
+    view: RecipeView = "full",
+) -> List[Recipe]:
+    recipes, _ = await search_recipes_page(
+        db,
+        query_str=query_str,
+        include_str=include_str,
+        exclude_str=exclude_str,
+        match=match,
+        max_cooking_time=max_cooking_time,
+        difficulty=difficulty,
+        cuisine=cuisine,
+        strategy=strategy,
+        view=view,
+    )
+    return recipes
+
+
+async def search_recipes_batch(
+    db: AsyncSession,
+    *,
+    queries: Sequence[RecipeSearchQuery],
+    view: RecipeView = "full",
+) -> List[List[Recipe]]:
+    """
+    First page of results for every query, in the order of `queries`.
+    All queries are embedded in one encode call and sent in one vector store
+    query per distinct set of attribute filters, and the hits of every query
+    are loaded with a single IN fetch
+    """
+    if not queries:
+        return []
+
+    embeddings = await vector_store.embed_queries([query.q for query in queries])
+
+    groups: dict[Tuple[Optional[int], Optional[str], Optional[str]], List[int]] = {}
+    for index, query in enumerate(queries):
+        where_key = (query.max_cooking_time, query.difficulty, query.cuisine)
+        groups.setdefault(where_key, []).append(index)
+
+    ranked_ids: List[List[int]] = [[] for _ in queries]
+    for (max_cooking_time, difficulty, cuisine), indexes in groups.items():
+        # Ingredient filters are applied afterwards, over-fetch for them
+        depth = max(
+            queries[i].limit
+            * (
+                SEARCH_OVERFETCH_FACTOR
+                if queries[i].include_ingredients or queries[i].exclude_ingredients
+                else 1
+            )
+            for i in indexes
+        )
+        hits = await vector_store.search_embeddings(
+            embeddings[indexes],
+            n_results=min(depth, settings.SEARCH_MAX_CANDIDATES),
+            where=_build_metadata_where(max_cooking_time, difficulty, cuisine),
+        )
+        for index, recipe_ids in zip(indexes, hits, strict=True):
+            ranked_ids[index] = recipe_ids
+
+    # Ingredient filters of every query in one statement, tagged by query index
+    filtered = [
+        index
+        for index, query in enumerate(queries)
+        if ranked_ids[index]
+        and (query.include_ingredients or query.exclude_ingredients)
+    ]
+    if filtered:
+        parts = [
+            _apply_ingredient_filter(
+                select(literal(index, Integer).label("query_index"), Recipe.id).where(
+                    Recipe.id.in_(ranked_ids[index])
+                ),
+                queries[index].include_ingredients,
+                queries[index].exclude_ingredients,
+                queries[index].match,
+            )
+            for index in filtered
+        ]
+        passed: dict[int, set[int]] = {index: set() for index in filtered}
+        for index, recipe_id in await db.execute(union_all(*parts)):
+            passed[index].add(recipe_id)
+        for index in filtered:
+            ranked_ids[index] = [
+                rid for rid in ranked_ids[index] if rid in passed[index]
+            ]
+
+    for index, query in enumerate(queries):
+        ranked_ids[index] = ranked_ids[index][: query.limit]
+
+    all_ids = list(dict.fromkeys(rid for ids in ranked_ids for rid in ids))
+    recipes_map = {r.id: r for r in await _fetch_ranked_recipes(db, all_ids, view)}
+    return [
+        [recipes_map[rid] for rid in ids if rid in recipes_map] for ids in ranked_ids
+    ]
+
+
+async def get_similar_recipes(
+    db: AsyncSession,
+    *,
+    recipe_id: int,
+    limit: int = SIMILAR_RESULTS_LIMIT,
+    view: RecipeView = "full",
+) -> Optional[List[Recipe]]:
+    """
+    Recipes nearest to the stored vector of a recipe, None if it does not exist.
+    The neighbour list is cached until the recipe or one of its neighbours
+    gets a new vector
+    """
+    key = (vector_store.collection_name, recipe_id)
+    neighbour_ids = similar_recipes.get(key)
+    if neighbour_ids is None:
+        neighbour_ids = await vector_store.search_similar(
+            recipe_id, n_results=SIMILAR_MAX_RESULTS
+        )
+        if neighbour_ids is None:
+            # Not embedded yet, or gone
+            if await get_recipe_by_id(db, recipe_id=recipe_id) is None:
+                return None
+            return []
+        similar_recipes.set(key, neighbour_ids)
+
+    return await _fetch_ranked_recipes(db, neighbour_ids[:limit], view)
+
+
+def _invalidate_similar_recipes(recipe_ids: Sequence[int]) -> None:
+    changed = set(recipe_ids)
+    if changed:
+        similar_recipes.discard(
+            lambda key, neighbour_ids: (
+                key[1] in changed or not changed.isdisjoint(neighbour_ids)
+            )
+        )
+
+
+@dataclass(frozen=True)
+class PantryMatch:
+    recipe: Recipe
+    covered: int
+    missing: List[str]
+
+    @property
+    def coverage(self) -> float:
+        total = self.covered + len(self.missing)
+        return self.covered / total if total else 0.0
+
+
+def _pantry_coverage(
+    names: Sequence[str],
+    pantry_terms: set[str],
+    terms_by_name: Optional[dict[str, List[str]]] = None,
+) -> Tuple[int, List[str]]:
+    """
+    Number of ingredients the pantry covers and the names of the missing ones
+    """
+    terms_by_name = {} if terms_by_name is None else terms_by_name
+    covered = 0
+    missing = []
+    for name in names:
+        if name not in terms_by_name:
+            terms_by_name[name] = get_ingredient_terms([name])
+        if pantry_terms.intersection(terms_by_name[name]):
+            covered += 1
+        else:
+            missing.append(name)
+    return covered, missing
+
+
+def _pantry_rank(covered: int, missing: Sequence[str], recipe_id: int) -> Any:
+    """
+    Fewest missing, then largest covered share, most covered, newest
+    """
+    total = covered + len(missing)
+    return (len(missing), -(covered / total if total else 0.0), -covered, -recipe_id)
+
+
+async def _scan_pantry_matches(
+    db: AsyncSession, pantry_terms: set[str], max_missing: int, limit: int
+) -> List[PantryMatch]:
+    """
+    Coverage counted from the database rows while the ingredient index
+    isn't built. Only ids and ingredients are streamed and at most `limit`
+    matches are kept between batches
+    """
+    terms_by_name: dict[str, List[str]] = {}
+    best: List[Tuple[Any, int, int, List[str]]] = []
+
+    result = await db.stream(
+        select(Recipe.id, Recipe.ingredients)
+        .where(Recipe.ingredient_terms.overlap(sorted(pantry_terms)))
+        .execution_options(yield_per=PANTRY_SCAN_BATCH_SIZE)
+    )
+    async for rows in result.partitions():
+        for recipe_id, ingredients in rows:
+            names = [item.get("name", "") for item in ingredients or []]
+            covered, missing = _pantry_coverage(names, pantry_terms, terms_by_name)
+            if len(missing) <= max_missing:
+                rank = _pantry_rank(covered, missing, recipe_id)
+                best.append((rank, recipe_id, covered, missing))
+        best = heapq.nsmallest(limit, best, key=lambda match: match[0])
+
+    recipes = await _fetch_ranked_recipes(db, [match[1] for match in best])
+    recipes_map = {recipe.id: recipe for recipe in recipes}
+    return [
+        PantryMatch(recipe=recipes_map[recipe_id], covered=covered, missing=missing)
+        for _, recipe_id, covered, missing in best
+        if recipe_id in recipes_map
+    ]
+
+
+async def search_pantry(
+    db: AsyncSession,
+    *,
+    pantry_str: str,
+    max_missing: int = 0,
+    limit: int = PANTRY_RESULTS_LIMIT,
+) -> List[PantryMatch]:
+    """
+    Recipes ranked by how many of their ingredients the pantry covers,
+    keeping those that miss at most `max_missing` ingredients
+    """
+    pantry_terms = {
+        term for terms in _ingredient_filter_terms(pantry_str) for term in terms
+    }
+    if not pantry_terms:
+        return []
+    if not ingredient_index.ready:
+        return await _scan_pantry_matches(db, pantry_terms, max_missing, limit)
+
+    coverage = ingredient_index.pantry_coverage(pantry_terms)
+    keep = coverage.totals - coverage.covered <= max_missing
+    recipe_ids = coverage.recipe_ids[keep]
+    covered = coverage.covered[keep]
+    totals = coverage.totals[keep]
+
+    # Fewest missing, then largest covered share, most covered, newest
+    order = np.lexsort((-recipe_ids, -covered, -covered / totals, totals - covered))
+    recipes = await _fetch_ranked_recipes(db, recipe_ids[order][:limit].tolist())
+
+    matches = []
+    for recipe in recipes:
+        covered_count, missing = _pantry_coverage(
+            _ingredient_names(recipe), pantry_terms
+        )
+        if len(missing) <= max_missing:
+            matches.append(
+                PantryMatch(recipe=recipe, covered=covered_count, missing=missing)
+            )
+    matches.sort(key=lambda m: _pantry_rank(m.covered, m.missing, m.recipe.id))
+    return matches
+
+
+async def _count_filtered_facets(
+    db: AsyncSession, scope: Select[Tuple[int]], ingredients_limit: int
+) -> RecipeFacets:
+    """
+    Facet counts of the recipes whose ids `scope` selects
+    """
+    filtered = (
+        select(Recipe.id, Recipe.cuisine, Recipe.difficulty, Recipe.ingredients_text)
+        .where(Recipe.id.in_(scope.scalar_subquery()))
+        .subquery()
+    )
+
+    total = 0
+    cuisines: Counter[str] = Counter()
+    difficulties: Counter[str] = Counter()
+    result = await db.execute(
+        select(filtered.c.cuisine, filtered.c.difficulty, func.count()).group_by(
+            filtered.c.cuisine, filtered.c.difficulty
+        )
+    )
+    for cuisine, difficulty, count in result:
+        total += count
+        if cuisine:
+            cuisines[cuisine] += count
+        difficulties[difficulty] += count
+
+    names = (
+        select(
+            filtered.c.id,
+            func.unnest(func.string_to_array(filtered.c.ingredients_text, " | ")).label(
+                "name"
+            ),
+        )
+        .distinct()
+        .subquery()
+    )
+    ingredient_count = func.count().label("count")
+    ingredients = await db.execute(
+        select(names.c.name, ingredient_count)
+        .group_by(names.c.name)
+        .order_by(ingredient_count.desc(), names.c.name)
+        .limit(ingredients_limit)
+    )
+
+    def ranked(counts: Counter[str]) -> List[FacetCount]:
+        return [
+            FacetCount(value=value, count=count)
+            for value, count in sorted(counts.items(), key=lambda vc: (-vc[1], vc[0]))
+        ]
+
+    return RecipeFacets(
+        total=total,
+        cuisine=ranked(cuisines),
+        difficulty=ranked(difficulties),
+        ingredients=[
+            FacetCount(value=name, count=count) for name, count in ingredients
+        ],
+    )
+
+
+async def get_recipe_facets(
+    db: AsyncSession,
+    *,
+    include_str: Optional[str] = None,
+    exclude_str: Optional[str] = None,
+    match: IngredientMatch = "exact",
+    ingredients_limit: int = FACET_INGREDIENTS_LIMIT,
+) -> RecipeFacets:
+    """
+    Recipe counts per cuisine, difficulty and top ingredients.
+    Unfiltered counts are read from recipe_facet_counts, filtered ones are
+    aggregated over the recipes matched by the ingredient index
+    """
+    if include_str or exclude_str:
+        if ingredient_index.ready and match == "exact":
+            include = _ingredient_filter_terms(include_str) if include_str else []
+            exclude = [
+                term
+                for terms in (
+                    _ingredient_filter_terms(exclude_str) if exclude_str else []
+                )
+                for term in terms
+            ]
+            recipe_ids = ingredient_index.filter_ids(include, exclude)
+            if not recipe_ids.size:
+                return RecipeFacets(total=0)
+            scope = select(func.unnest(literal(recipe_ids.tolist(), ARRAY(Integer))))
+        else:
+            scope = _apply_ingredient_filter(
+                select(Recipe.id), include_str, exclude_str, match
+            )
+        return await _count_filtered_facets(db, scope, ingredients_limit)
+
+    counts = RecipeFacetCount
+    result = await db.execute(
+        select(counts.facet, counts.value, counts.count)
+        .where(counts.facet.in_(["total", "cuisine", "difficulty"]), counts.count > 0)
+        .order_by(counts.facet, counts.count.desc(), counts.value)
+    )
+    facets: dict[str, List[FacetCount]] = {"total": [], "cuisine": [], "difficulty": []}
+    for facet, value, count in result:
+        facets[facet].append(FacetCount(value=value, count=count))
+
+    ingredients = await db.execute(
+        select(counts.value, counts.count)
+        .where(counts.facet == "ingredient", counts.count > 0)
+        .order_by(counts.count.desc(), counts.value)
+        .limit(ingredients_limit)
+    )
 
-    return ordered_recipes[:6]
+    return RecipeFacets(
+        total=facets["total"][0].count if facets["total"] else 0,
+        cuisine=facets["cuisine"],
+        difficulty=facets["difficulty"],
+        ingredients=[
+            FacetCount(value=value, count=count) for value, count in ingredients
+        ],
+    )
+
+
+async def _vector_sync_backends(db: AsyncSession) -> List[VectorBackend]:
+    """
+    The active collection and the targets of running reindex jobs,
+    so a reindex does not miss writes made after its cursor passed them
+    """
+    result = await db.execute(
+        select(ReindexJob.target_collection).where(
+            ReindexJob.base_collection == vector_store.base_collection_name,
+            ReindexJob.status == "running",
+        )
+    )
+    backends = [vector_store.backend]
+    for collection_name in result.scalars():
+        if collection_name != vector_store.collection_name:
+            backends.append(vector_store.get_backend(collection_name))
+    return backends
+
+
+async def _apply_vector_changes(
+    db: AsyncSession, operations: dict[int, set[str]]
+) -> List[int]:
+    """
+    Apply collapsed outbox operations from the current recipe rows,
+    returns the ids whose vectors were replaced or removed
+    """
+    result = await db.execute(select(Recipe).where(Recipe.id.in_(list(operations))))
+    recipes = {recipe.id: recipe for recipe in result.scalars()}
+
+    documents = []
+    metadata_updates = []
+    deleted_ids = []
+    for recipe_id, ops in operations.items():
+        recipe = recipes.get(recipe_id)
+        if recipe is None:
+            deleted_ids.append(recipe_id)
+            continue
+        document = build_recipe_document(recipe)
+        if "upsert" in ops:
+            documents.append(document)
+        else:
+            metadata_updates.append((recipe_id, document.safe_metadata))
+
+    backends = await _vector_sync_backends(db)
+    await vector_store.upsert_recipes(documents, backends=backends)
+    for recipe_id, meta in metadata_updates:
+        await vector_store.update_metadata(
+            recipe_id=recipe_id, metadata=meta, backends=backends
+        )
+    await vector_store.delete_recipes(deleted_ids, backends=backends)
+    return [doc.recipe_id for doc in documents] + deleted_ids
+
+
+async def _reschedule_vector_changes(
+    db: AsyncSession, entry_ids: Sequence[int], recipe_id: int, error: Exception
+) -> None:
+    """
+    Retry entries with an exponential backoff, past VECTOR_OUTBOX_MAX_ATTEMPTS
+    they stay in the outbox as failed and are no longer claimed
+    """
+    delay = func.least(
+        func.power(2, VectorOutbox.attempts),
+        settings.VECTOR_OUTBOX_RETRY_MAX_SECONDS,
+    )
+    attempts = await db.scalars(
+        update(VectorOutbox)
+        .where(VectorOutbox.id.in_(entry_ids))
+        .values(
+            attempts=VectorOutbox.attempts + 1,
+            available_at=func.now() + func.make_interval(0, 0, 0, 0, 0, 0, delay),
+            last_error=str(error)[:1000],
+        )
+        .returning(VectorOutbox.attempts)
+    )
+    if max(attempts.all(), default=0) >= settings.VECTOR_OUTBOX_MAX_ATTEMPTS:
+        logger.error(f"Vector sync of recipe {recipe_id} gave up: {error}")
+    else:
+        logger.warning(f"Vector sync of recipe {recipe_id} failed: {error}")
+
+
+async def sync_vector_outbox(
+    db: AsyncSession, *, batch_size: Optional[int] = None
+) -> int:
+    """
+    Apply one batch of the vector outbox, returns the number of entries consumed.
+    Entries are claimed with SKIP LOCKED, collapsed per recipe and applied from
+    the current recipe rows, so replaying an entry is harmless.
+    A failed batch is retried one recipe at a time, so a bad entry only
+    reschedules itself
+    """
+    claimed = (
+        await db.execute(
+            select(VectorOutbox.id, VectorOutbox.recipe_id, VectorOutbox.operation)
+            .where(
+                VectorOutbox.available_at <= func.now(),
+                VectorOutbox.attempts < settings.VECTOR_OUTBOX_MAX_ATTEMPTS,
+            )
+            .order_by(VectorOutbox.id)
+            .limit(batch_size or settings.VECTOR_OUTBOX_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+    ).all()
+    if not claimed:
+        await db.commit()
+        return 0
+
+    operations: dict[int, set[str]] = {}
+    for row in claimed:
+        operations.setdefault(row.recipe_id, set()).add(row.operation)
+
+    changed_ids: List[int] = []
+    failed: dict[int, Exception] = {}
+    try:
+        changed_ids = await _apply_vector_changes(db, operations)
+    except Exception as ex:
+        if len(operations) == 1:
+            failed = dict.fromkeys(operations, ex)
+        else:
+            for recipe_id, ops in operations.items():
+                try:
+                    changed_ids += await _apply_vector_changes(db, {recipe_id: ops})
+                except Exception as recipe_ex:
+                    failed[recipe_id] = recipe_ex
+
+    if failed:
+        await db.rollback()
+        for recipe_id, error in failed.items():
+            entry_ids = [row.id for row in claimed if row.recipe_id == recipe_id]
+            await _reschedule_vector_changes(db, entry_ids, recipe_id, error)
+
+    applied_ids = [row.id for row in claimed if row.recipe_id not in failed]
+    # The current row also supersedes entries of the recipe that gave up earlier
+    synced_recipe_ids = [rid for rid in operations if rid not in failed]
+    await db.execute(
+        delete(VectorOutbox).where(
+            or_(
+                VectorOutbox.id.in_(applied_ids),
+                and_(
+                    VectorOutbox.recipe_id.in_(synced_recipe_ids),
+                    VectorOutbox.attempts >= settings.VECTOR_OUTBOX_MAX_ATTEMPTS,
+                ),
+            )
+        )
+    )
+    await db.commit()
+    if changed_ids:
+        search_candidates.clear()
+        _invalidate_similar_recipes(changed_ids)
+
+    if len(failed) == len(operations):
+        raise next(iter(failed.values()))
+    return len(claimed)
+
+
+async def drain_vector_outbox(db: AsyncSession) -> int:
+    """
+    Apply the outbox until no entry is ready, for inline mode and scripts
+    """
+    total = 0
+    while consumed := await sync_vector_outbox(db):
+        total += consumed
+    return total
+
+
+async def get_vector_outbox_stats(db: AsyncSession) -> dict[str, Any]:
+    """
+    Backlog of the vector outbox, lag is the age of its oldest pending entry.
+    Failed entries gave up after VECTOR_OUTBOX_MAX_ATTEMPTS
+    """
+    is_failed = VectorOutbox.attempts >= settings.VECTOR_OUTBOX_MAX_ATTEMPTS
+    row = (
+        await db.execute(
+            select(
+                func.count().filter(not_(is_failed)),
+                func.count().filter(VectorOutbox.attempts > 0, not_(is_failed)),
+                func.count().filter(is_failed),
+                func.coalesce(func.max(VectorOutbox.attempts), 0),
+                func.extract(
+                    "epoch",
+                    func.now()
+                    - func.min(VectorOutbox.created_at).filter(not_(is_failed)),
+                ),
+            )
+        )
+    ).one()
+    pending, retrying, failed, max_attempts, lag_seconds = row
+    return {
+        "mode": settings.VECTOR_SYNC_MODE,
+        "pending": pending,
+        "retrying": retrying,
+        "failed": failed,
+        "max_attempts": max_attempts,
+        "lag_seconds": float(lag_seconds or 0.0),
+        "indexer": vector_indexer.stats(),
+    }
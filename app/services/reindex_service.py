@@ -0,0 +1,277 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.core.vector_store import embedding_model_id
+from app.models import Recipe, ReindexJob
+from app.schemas import ReindexStatus
+from app.services import recipe_service
+
+logger = logging.getLogger(__name__)
+
+
+class ModelChangeError(RuntimeError):
+    """
+    The configured embedding model differs from the one of the served vectors
+    """
+
+
+# Jobs run by this process, keeps the tasks referenced until they finish
+_running: Dict[int, "asyncio.Task[None]"] = {}
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def job_status(job: ReindexJob) -> ReindexStatus:
+    remaining = max(job.total - job.processed, 0)
+    eta_seconds: Optional[float] = None
+    if job.status == "running" and job.docs_per_second > 0:
+        eta_seconds = round(remaining / job.docs_per_second, 1)
+    elif job.status == "completed":
+        eta_seconds = 0.0
+
+    return ReindexStatus(
+        id=job.id,
+        status=job.status,
+        base_collection=job.base_collection,
+        target_collection=job.target_collection,
+        model_id=job.model_id,
+        processed=job.processed,
+        total=job.total,
+        last_recipe_id=job.last_recipe_id,
+        docs_per_second=round(job.docs_per_second, 1),
+        eta_seconds=eta_seconds,
+        error=job.error,
+        started_at=job.started_at,
+        updated_at=job.updated_at,
+        finished_at=job.finished_at,
+    )
+
+
+async def get_job(db: AsyncSession, *, job_id: int) -> Optional[ReindexJob]:
+    return await db.get(ReindexJob, job_id)
+
+
+async def _latest_job(
+    db: AsyncSession, *, status: Optional[str] = None
+) -> Optional[ReindexJob]:
+    query = select(ReindexJob).where(
+        ReindexJob.base_collection == recipe_service.vector_store.base_collection_name
+    )
+    if status is not None:
+        query = query.where(ReindexJob.status == status)
+    result = await db.execute(query.order_by(ReindexJob.id.desc()).limit(1))
+    return result.scalars().first()
+
+
+async def active_model_id(db: AsyncSession) -> Optional[str]:
+    """
+    Model of the collection being served, None before the first reindex
+    """
+    job = await _latest_job(db, status="completed")
+    return job.model_id if job is not None else None
+
+
+async def _claim(db: AsyncSession, job: ReindexJob, *, stale_only: bool) -> bool:
+    """
+    Take over a job, a running one only once its heartbeat went stale
+    """
+    query = update(ReindexJob).where(ReindexJob.id == job.id)
+    if stale_only:
+        query = query.where(
+            ReindexJob.updated_at
+            < func.now()
+            - func.make_interval(0, 0, 0, 0, 0, 0, settings.REINDEX_STALE_SECONDS)
+        )
+    claimed_id = await db.scalar(
+        query.values(status="running", error=None, updated_at=func.now()).returning(
+            ReindexJob.id
+        )
+    )
+    await db.commit()
+    await db.refresh(job)
+    return claimed_id is not None
+
+
+async def start_or_resume(
+    db: AsyncSession, *, restart: bool = False, allow_model_change: bool = False
+) -> tuple[ReindexJob, bool]:
+    """
+    The job to run next and whether the caller should run it.
+    An interrupted or failed job is resumed from its checkpoint unless
+    `restart` is set or the embedding model changed since it started.
+    A job with a fresh heartbeat is still being run elsewhere.
+    Queries are embedded with the configured model only, so a reindex into
+    another model than the served collection's is refused unless
+    `allow_model_change` is set by an offline run
+    """
+    model_id = embedding_model_id()
+    active_model = await active_model_id(db)
+    if not allow_model_change and active_model not in (None, model_id):
+        raise ModelChangeError(
+            f"The served collection was embedded with '{active_model}' but the "
+            f"configured model is '{model_id}'. Stop the app and run "
+            "scripts/reindex.py --allow-model-change to switch models."
+        )
+
+    job = await _latest_job(db)
+    if job is not None and job.status in ("running", "failed"):
+        if not restart and job.model_id == model_id:
+            if job.id in _running:
+                return job, False
+            if not await _claim(db, job, stale_only=job.status == "running"):
+                return job, False
+            logger.info(
+                f"Resuming reindex job {job.id} after recipe {job.last_recipe_id}."
+            )
+            return job, True
+
+        job.status = "failed"
+        job.error = "Superseded by a new reindex"
+        job.finished_at = _now()
+        await db.commit()
+
+    job = ReindexJob(
+        base_collection=recipe_service.vector_store.base_collection_name,
+        target_collection="",
+        model_id=model_id,
+        status="running",
+    )
+    db.add(job)
+    await db.flush()
+    job.target_collection = (
+        f"{recipe_service.vector_store.base_collection_name}_v{job.id}"
+    )
+    await db.commit()
+    await db.refresh(job)
+    logger.info(f"Started reindex job {job.id} into '{job.target_collection}'.")
+    return job, True
+
+
+async def run_reindex(
+    db: AsyncSession, *, job: ReindexJob, batch_size: Optional[int] = None
+) -> ReindexJob:
+    """
+    Embed every recipe after the job's checkpoint into its target collection,
+    then switch the vector store to it.
+    Recipes are streamed in id order through a server-side cursor held by
+    a separate session, `db` commits a checkpoint after every batch
+    """
+    batch_size = batch_size or settings.REINDEX_BATCH_SIZE
+    job_id = job.id
+    target = recipe_service.vector_store.get_backend(job.target_collection)
+
+    remaining = await db.scalar(
+        select(func.count()).where(Recipe.id > job.last_recipe_id)
+    )
+    job.total = job.processed + (remaining or 0)
+    await db.commit()
+
+    started_at = time.perf_counter()
+    processed_in_run = 0
+    try:
+        async with AsyncSession(bind=db.bind) as stream_db:
+            result = await stream_db.stream(
+                select(Recipe)
+                .where(Recipe.id > job.last_recipe_id)
+                .order_by(Recipe.id)
+                .execution_options(yield_per=batch_size)
+            )
+            async for recipes in result.scalars().partitions():
+                documents = [
+                    recipe_service.build_recipe_document(recipe) for recipe in recipes
+                ]
+                await recipe_service.vector_store.upsert_recipes(
+                    documents, backends=[target]
+                )
+                stream_db.expunge_all()
+
+                await db.refresh(job, attribute_names=["status"])
+                if job.status != "running":
+                    logger.info(f"Reindex job {job_id} was superseded, stopping.")
+                    return job
+
+                processed_in_run += len(documents)
+                elapsed = time.perf_counter() - started_at
+                job.last_recipe_id = documents[-1].recipe_id
+                job.processed += len(documents)
+                job.docs_per_second = processed_in_run / elapsed if elapsed else 0.0
+                job.updated_at = _now()
+                await db.commit()
+
+                status = job_status(job)
+                logger.info(
+                    f"Reindex job {job.id}: {job.processed}/{job.total} recipes, "
+                    f"{status.docs_per_second} docs/s, ETA {status.eta_seconds}s."
+                )
+        target.flush()
+    except Exception as ex:
+        await db.rollback()
+        job.status = "failed"
+        job.error = str(ex)[:1000]
+        job.updated_at = _now()
+        await db.commit()
+        logger.error(f"Reindex job {job_id} failed: {ex}")
+        raise
+
+    job.status = "completed"
+    job.total = job.processed
+    job.finished_at = job.updated_at = _now()
+    await db.commit()
+
+    recipe_service.vector_store.use_collection(job.target_collection)
+    recipe_service.search_candidates.clear()
+    logger.info(
+        f"Reindex job {job.id} completed, serving from '{job.target_collection}'."
+    )
+    return job
+
+
+async def refresh_active_collection(db: AsyncSession) -> None:
+    """
+    Follow the collection of the latest completed reindex,
+    which may have been run by another process
+    """
+    job = await _latest_job(db, status="completed")
+    if (
+        job is not None
+        and job.target_collection != recipe_service.vector_store.collection_name
+    ):
+        if job.model_id != embedding_model_id():
+            logger.warning(
+                f"Collection '{job.target_collection}' was embedded with "
+                f"'{job.model_id}' but queries use '{embedding_model_id()}', "
+                "run scripts/reindex.py --allow-model-change."
+            )
+        recipe_service.vector_store.use_collection(job.target_collection)
+        recipe_service.search_candidates.clear()
+
+
+def run_in_background(
+    session: AsyncSession, *, job: ReindexJob, batch_size: Optional[int] = None
+) -> None:
+    """
+    Run a claimed job as a task of this process, `session` is closed afterwards
+    """
+
+    async def run() -> None:
+        try:
+            await run_reindex(session, job=job, batch_size=batch_size)
+        except Exception:
+            # Already recorded on the job, it can be resumed from its checkpoint
+            pass
+        finally:
+            await session.close()
+
+    task = asyncio.get_running_loop().create_task(run())
+    _running[job.id] = task
+    task.add_done_callback(lambda _: _running.pop(job.id, None))
@@ -0,0 +1,60 @@
+import logging
+from typing import Iterable, List, Set
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import text_utils
+from app.models.recipe import Recipe
+from app.models.word_form import WordForm
+
+logger = logging.getLogger(__name__)
+
+WORD_FORMS_INSERT_BATCH_SIZE = 1000
+
+
+async def load_vocabulary(db: AsyncSession) -> int:
+    """
+    Load the word_forms table into text_utils, returns the number of words
+    """
+    result = await db.execute(select(WordForm.word, WordForm.forms))
+    entries = {row.word: row.forms for row in result}
+    text_utils.load_vocabulary(entries)
+
+    logger.info(f"Loaded {len(entries)} precomputed word forms.")
+    return len(entries)
+
+
+async def collect_ingredient_names(db: AsyncSession) -> Set[str]:
+    result = await db.stream(
+        select(Recipe.ingredients).execution_options(yield_per=1000)
+    )
+    names: Set[str] = set()
+    async for ingredients in result.scalars():
+        names.update(item.get("name", "") for item in ingredients)
+    return names
+
+
+async def build_vocabulary(db: AsyncSession, *, names: Iterable[str]) -> int:
+    """
+    Store the word forms of every word sequence of the ingredient names,
+    returns the number of words written
+    """
+    phrases: List[str] = sorted(text_utils.get_ingredient_phrases(names))
+    stmt = insert(WordForm)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[WordForm.word], set_={"forms": stmt.excluded.forms}
+    )
+
+    for start in range(0, len(phrases), WORD_FORMS_INSERT_BATCH_SIZE):
+        chunk = phrases[start : start + WORD_FORMS_INSERT_BATCH_SIZE]
+        await db.execute(
+            stmt,
+            [
+                {"word": phrase, "forms": sorted(text_utils.compute_word_forms(phrase))}
+                for phrase in chunk
+            ],
+        )
+    await db.commit()
+    return len(phrases)
@@ -0,0 +1,76 @@
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import select
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.config import settings
+from app.core.vector_backends import ChromaBackend, PgVectorBackend
+from app.db.session import AsyncSessionLocal
+from app.models.recipe import Recipe
+
+
+async def backfill(collection_name: str, batch_size: int) -> None:
+    """
+    Copies embeddings from a Chroma collection into the pgvector table.
+    """
+    source = ChromaBackend(collection_name)
+    target = PgVectorBackend(collection_name)
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(Recipe.id))
+        existing_ids = set(result.scalars().all())
+
+    total = source.count()
+    print(f"Backfilling {total} embeddings from Chroma '{collection_name}'...")
+
+    copied = 0
+    skipped = 0
+    for offset in range(0, total, batch_size):
+        page = source.collection.get(
+            limit=batch_size, offset=offset, include=["embeddings"]
+        )
+        embeddings = page["embeddings"]
+        if embeddings is None:
+            continue
+
+        ids = []
+        rows = []
+        for id_str, embedding in zip(page["ids"], embeddings, strict=True):
+            recipe_id = int(id_str)
+            if recipe_id not in existing_ids:
+                skipped += 1
+                continue
+            ids.append(recipe_id)
+            rows.append(embedding)
+
+        if ids:
+            target.upsert(ids, np.asarray(rows, dtype=np.float32), [], [])
+            copied += len(ids)
+        print(f" - {min(offset + batch_size, total)}/{total} processed...")
+
+    print(f"Copied {copied} embeddings, skipped {skipped} without a recipe row.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Backfill the pgvector embeddings table from ChromaDB."
+    )
+    parser.add_argument(
+        "--collection",
+        type=str,
+        default=settings.CHROMA_COLLECTION_NAME,
+        help="Collection to copy (defaults to CHROMA_COLLECTION_NAME).",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Number of embeddings fetched from Chroma per request.",
+    )
+    args = parser.parse_args()
+    asyncio.run(backfill(args.collection, args.batch_size))
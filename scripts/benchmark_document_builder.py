@@ -0,0 +1,102 @@
+import argparse
+import statistics
+import sys
+import time
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app import models
+from app.core.config import settings
+from app.core.vector_store import vector_store
+from app.services import recipe_service
+
+
+def make_recipes(count: int, instructions_chars: int) -> List[models.Recipe]:
+    """
+    Transient recipes with instructions close to the 50k character limit
+    """
+    step = "Stir the sauce gently and let it simmer until it thickens. "
+    instructions = (step * (instructions_chars // len(step) + 1))[:instructions_chars]
+    return [
+        models.Recipe(
+            id=recipe_id,
+            title=f"Benchmark Stew {recipe_id}",
+            instructions=instructions,
+            cooking_time_in_minutes=150,
+            difficulty="hard",
+            cuisine="French",
+            ingredients=[{"name": f"ingredient {i}"} for i in range(12)],
+        )
+        for recipe_id in range(1, count + 1)
+    ]
+
+
+def measure(call: Callable[[], object], iterations: int) -> List[float]:
+    call()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def benchmark(rows: int, instructions_chars: int, iterations: int) -> None:
+    recipes = make_recipes(rows, instructions_chars)
+    vector_store.preload_model()
+    budget = vector_store.token_budget
+
+    untruncated = [recipe_service._create_semantic_document(r)[0] for r in recipes]
+
+    def build_and_encode(max_chunks: int) -> None:
+        texts = [
+            text
+            for r in recipes
+            for text in budget.fit(recipe_service._semantic_sections(r), max_chunks)
+        ]
+        vector_store._encode_batch(texts)
+
+    print(
+        f"Encoding {rows} recipes with {instructions_chars} characters of "
+        f"instructions, model limit {budget.max_tokens} tokens, "
+        f"{iterations} runs each:"
+    )
+    paths: Dict[str, Callable[[], object]] = {
+        "untruncated": partial(vector_store._encode_batch, untruncated),
+        "budgeted": partial(build_and_encode, 1),
+    }
+    if settings.SEMANTIC_DOCUMENT_MAX_CHUNKS > 1:
+        paths["chunked"] = partial(
+            build_and_encode, settings.SEMANTIC_DOCUMENT_MAX_CHUNKS
+        )
+
+    results = {}
+    for name, call in paths.items():
+        timings = measure(call, iterations)
+        results[name] = statistics.median(timings)
+        print(f" - {name:<12} median {results[name]:9.2f} ms")
+
+    print(f"Speedup: {results['untruncated'] / results['budgeted']:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare encode time of untruncated and token-budgeted documents."
+    )
+    parser.add_argument("--rows", type=int, default=32, help="Recipes per batch.")
+    parser.add_argument(
+        "--instructions-chars",
+        type=int,
+        default=50000,
+        help="Length of the instructions of every recipe.",
+    )
+    parser.add_argument("--iterations", type=int, default=5, help="Runs per path.")
+    args = parser.parse_args()
+    benchmark(
+        rows=args.rows,
+        instructions_chars=args.instructions_chars,
+        iterations=args.iterations,
+    )
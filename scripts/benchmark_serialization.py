@@ -0,0 +1,94 @@
+import argparse
+import statistics
+import sys
+import time
+from functools import partial
+from pathlib import Path
+from typing import Callable, List
+
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app import models, schemas
+from app.api.v1.serialization import json_list_response
+
+
+def make_recipes(count: int) -> List[models.Recipe]:
+    """
+    Transient recipes shaped like a full list page: long instructions,
+    a dozen ingredients and the maximum of 10 image URLs
+    """
+    return [
+        models.Recipe(
+            id=recipe_id,
+            title=f"Benchmark Recipe {recipe_id}",
+            instructions="Stir and simmer until thick. " * 200,
+            cooking_time_in_minutes=30 + recipe_id % 60,
+            difficulty="medium",
+            cuisine="Italian",
+            ingredients=[{"name": f"ingredient {i}"} for i in range(12)],
+            image_urls=[
+                f"https://images.example.com/recipes/{recipe_id}/{i}.jpg"
+                for i in range(10)
+            ],
+        )
+        for recipe_id in range(1, count + 1)
+    ]
+
+
+def build_app(recipes: List[models.Recipe]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/model-validate", response_model=List[schemas.Recipe])
+    def model_validate_path() -> list[schemas.Recipe]:
+        return [schemas.Recipe.model_validate(r) for r in recipes]
+
+    @app.get("/fast", response_model=List[schemas.Recipe])
+    def fast_path() -> Response:
+        return json_list_response(schemas.Recipe, recipes)
+
+    return app
+
+
+def measure(call: Callable[[], object], iterations: int) -> List[float]:
+    call()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def benchmark(rows: int, iterations: int) -> None:
+    recipes = make_recipes(rows)
+    client = TestClient(build_app(recipes))
+
+    legacy = client.get("/model-validate")
+    fast = client.get("/fast")
+    if legacy.json() != fast.json():
+        raise SystemExit("Serialization paths returned different bodies")
+
+    print(f"Serializing {rows} recipes per request, {iterations} requests each:")
+    results = {}
+    for name in ("model-validate", "fast"):
+        timings = measure(partial(client.get, f"/{name}"), iterations)
+        results[name] = statistics.median(timings)
+        p95 = statistics.quantiles(timings, n=20)[-1]
+        print(f" - {name:<15} median {results[name]:7.2f} ms, p95 {p95:7.2f} ms")
+
+    print(f"Speedup: {results['model-validate'] / results['fast']:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare the response serialization paths of list endpoints."
+    )
+    parser.add_argument("--rows", type=int, default=100, help="Recipes per page.")
+    parser.add_argument(
+        "--iterations", type=int, default=200, help="Requests per path."
+    )
+    args = parser.parse_args()
+    benchmark(rows=args.rows, iterations=args.iterations)
@@ -0,0 +1,53 @@
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Set
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.db.session import AsyncSessionLocal
+from app.services import word_form_service
+
+DATASETS_PATH = Path(__file__).resolve().parents[1] / "datasets"
+
+
+def dataset_ingredient_names() -> Set[str]:
+    names: Set[str] = set()
+    for recipes_path in sorted(DATASETS_PATH.glob("*/recipe_samples.json")):
+        print(f" - Reading ingredient names from {recipes_path}...")
+        with open(recipes_path, encoding="utf-8") as f:
+            for recipe in json.load(f):
+                for item in recipe["ingredients"]:
+                    # Datasets hold plain names, the API also accepts objects
+                    names.add(item if isinstance(item, str) else item.get("name", ""))
+    return names
+
+
+async def build(datasets: bool) -> None:
+    """
+    Precompute word forms of all known ingredient names into word_forms
+    """
+    async with AsyncSessionLocal() as db:
+        print(" - Collecting ingredient names from the database...")
+        names = await word_form_service.collect_ingredient_names(db)
+        if datasets:
+            names |= dataset_ingredient_names()
+
+        print(f" - Expanding {len(names)} ingredient names...")
+        written = await word_form_service.build_vocabulary(db, names=names)
+        print(f"Successfully stored word forms for {written} words.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Precompute ingredient word forms into the word_forms table."
+    )
+    parser.add_argument(
+        "--datasets",
+        action="store_true",
+        help="Also include ingredient names from the bundled datasets.",
+    )
+    args = parser.parse_args()
+    asyncio.run(build(datasets=args.datasets))
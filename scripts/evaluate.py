@@ -4,6 +4,7 @@ import json
 import os
 import sys
 import time
+from functools import partial
 from pathlib import Path
 from statistics import mean
 from typing import Any, Callable, Sequence
@@ -28,10 +29,12 @@ sys.path.append(os.getcwd())
 import matplotlib
 
 from app.core import text_utils
+from app.core.ingredient_index import ingredient_index
 from app.core.vector_store import VectorStore
 from app.models.recipe import Recipe
 from app.schemas.recipe_create import RecipeCreate
 from app.services import recipe_service
+from app.services.recipe_service import SearchStrategy
 from tests.testing_config import testing_settings
 
 matplotlib.use("Agg")
@@ -78,14 +81,16 @@ async def seed_eval_data(session: AsyncSession, recipes_path: Path) -> None:
         recipe_samples = json.load(f)
 
     print("Seeding recipes into test DB...")
+    recipes_in = []
     for r_data in recipe_samples:
         r_input = r_data.copy()
         if "id" in r_input:
             del r_input["id"]
 
-        recipe_in = RecipeCreate(**r_input)
+        recipes_in.append(RecipeCreate(**r_input))
 
-        await recipe_service.create_recipe(db=session, recipe_in=recipe_in)
+    await recipe_service.create_recipes_bulk(db=session, recipes_in=recipes_in)
+    await recipe_service.drain_vector_outbox(session)
 
 
 async def slow_smart_jsonb_filter(
@@ -159,7 +164,12 @@ async def evaluate_nls_method(
             category_stats[category] = {"total": 0, "passed": 0, "total_f1": 0.0}
 
         start_time = time.time()
-        results = await search_func(db=db, query_str=query_text)
+        results = await search_func(
+            db=db,
+            query_str=query_text,
+            include_str=q.get("include"),
+            exclude_str=q.get("exclude"),
+        )
         end_time = time.time()
         latencies.append((end_time - start_time) * 1000)
 
@@ -457,7 +467,9 @@ async def main() -> None:
     await setup_test_db()
 
     eval_vector_store = VectorStore(
-        collection_name=TEST_COLLECTION_NAME, force_new=True
+        collection_name=TEST_COLLECTION_NAME,
+        force_new=True,
+        database_url=testing_settings.SYNC_TEST_DATABASE_ADMIN_URL,
     )
     original_vector_store = recipe_service.vector_store
     recipe_service.vector_store = eval_vector_store
@@ -494,16 +506,54 @@ async def main() -> None:
             if not check_quality_gates("Vector Search", vec_res):
                 success = False
 
-            jsonb_fast_smart_fil_res = await evaluate_filters(
+            strategies: list[tuple[SearchStrategy, str]] = [
+                ("exact", "Exact"),
+                ("ann", "ANN"),
+            ]
+            for strategy, label in strategies:
+                strategy_res = await evaluate_nls_method(
+                    db,
+                    f"Vector Search ({label})",
+                    partial(recipe_service.search_recipes_by_vector, strategy=strategy),
+                    nls_queries,
+                    id_to_title,
+                )
+                nls_results.append(strategy_res)
+
+            terms_fil_res = await evaluate_filters(
                 db,
-                "JSONB GIN Filter",
+                "Ingredient Terms GIN Filter",
                 recipe_service.get_all_recipes,
                 filter_queries,
             )
-            filter_results.append(jsonb_fast_smart_fil_res)
-            if not check_quality_gates("JSONB GIN Filter", jsonb_fast_smart_fil_res):
+            filter_results.append(terms_fil_res)
+            if not check_quality_gates("Ingredient Terms GIN Filter", terms_fil_res):
                 success = False
 
+            # From here on exact filters of get_all_recipes use the in-memory index
+            await recipe_service.build_ingredient_index(db)
+            index_fil_res = await evaluate_filters(
+                db,
+                "In-Memory Ingredient Index",
+                recipe_service.get_all_recipes,
+                filter_queries,
+            )
+            filter_results.append(index_fil_res)
+            print(f"Ingredient index: {ingredient_index.stats()}")
+
+            trigram_modes: list[tuple[recipe_service.IngredientMatch, str]] = [
+                ("prefix", "Trigram Prefix Filter"),
+                ("fuzzy", "Trigram Fuzzy Filter"),
+            ]
+            for match, label in trigram_modes:
+                trigram_fil_res = await evaluate_filters(
+                    db,
+                    label,
+                    partial(recipe_service.get_all_recipes, match=match),
+                    filter_queries,
+                )
+                filter_results.append(trigram_fil_res)
+
             jsonb_slow_smart_fil_res = await evaluate_filters(
                 db,
                 "Slow JSONB Accurate Word Boundary Filter",
@@ -519,7 +569,7 @@ async def main() -> None:
         recipe_service.vector_store = original_vector_store
 
         try:
-            eval_vector_store.client.delete_collection(TEST_COLLECTION_NAME)
+            eval_vector_store.drop()
         except Exception:
             pass
 
@@ -0,0 +1,148 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.config import settings
+from app.core.vector_store import load_embedding_model
+from app.models.recipe import Recipe
+from app.services.recipe_service import _create_semantic_document
+
+DATASETS_PATH = Path(__file__).resolve().parents[1] / "datasets"
+
+QUANTIZATION_CONFIGS = ["arm64", "avx2", "avx512", "avx512_vnni"]
+
+
+def load_validation_texts() -> list[str]:
+    """
+    Recipe documents and search queries from all bundled datasets.
+    """
+    texts = []
+    for lang_dir in sorted(DATASETS_PATH.iterdir()):
+        with open(lang_dir / "recipe_samples.json", encoding="utf-8") as f:
+            recipes: list[dict[str, Any]] = json.load(f)
+        with open(lang_dir / "evaluation_nls_queries.json", encoding="utf-8") as f:
+            queries: list[dict[str, Any]] = json.load(f)
+
+        for r_data in recipes:
+            recipe = Recipe(
+                title=r_data["title"],
+                instructions=r_data["instructions"],
+                cooking_time_in_minutes=r_data["cooking_time_in_minutes"],
+                difficulty=r_data["difficulty"],
+                cuisine=r_data.get("cuisine"),
+                ingredients=[{"name": name} for name in r_data["ingredients"]],
+            )
+            text, _ = _create_semantic_document(recipe)
+            texts.append(text)
+
+        texts.extend(q["query"] for q in queries)
+
+    return texts
+
+
+def export(output_path: Path, quantization_config: str) -> str:
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+
+    print(f"Exporting {settings.EMBEDDING_MODEL} to ONNX in {output_path}...")
+    model = SentenceTransformer(
+        settings.EMBEDDING_MODEL,
+        backend="onnx",
+        trust_remote_code=True,
+        token=settings.HF_TOKEN,
+    )
+    model.save(str(output_path))
+
+    print(f"Quantizing with dynamic int8 config '{quantization_config}'...")
+    export_dynamic_quantized_onnx_model(
+        model,
+        quantization_config=quantization_config,
+        model_name_or_path=str(output_path),
+    )
+    return f"onnx/model_qint8_{quantization_config}.onnx"
+
+
+def encode_timed(
+    model: SentenceTransformer, texts: list[str]
+) -> tuple[np.ndarray, float]:
+    start_time = time.perf_counter()
+    embeddings: np.ndarray = model.encode(
+        texts, batch_size=1, convert_to_numpy=True, normalize_embeddings=True
+    )
+    latency_ms = (time.perf_counter() - start_time) * 1000 / len(texts)
+    return embeddings, latency_ms
+
+
+def validate(output_path: Path, file_name: str, min_cosine: float) -> bool:
+    texts = load_validation_texts()
+    print(f"Validating on {len(texts)} dataset texts...")
+
+    reference = load_embedding_model("torch")
+    quantized = SentenceTransformer(
+        str(output_path),
+        backend="onnx",
+        model_kwargs={"file_name": file_name, "provider": "CPUExecutionProvider"},
+        trust_remote_code=True,
+    )
+
+    reference_vectors, reference_latency = encode_timed(reference, texts)
+    quantized_vectors, quantized_latency = encode_timed(quantized, texts)
+
+    cosines = np.sum(reference_vectors * quantized_vectors, axis=1)
+    print(f"Cosine agreement: mean {cosines.mean():.5f}, min {cosines.min():.5f}")
+    print(f"Average latency torch: {reference_latency:.2f} ms per text")
+    print(f"Average latency onnx : {quantized_latency:.2f} ms per text")
+
+    return bool(cosines.min() >= min_cosine)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export the embedding model to a quantized ONNX graph."
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path(settings.EMBEDDING_ONNX_MODEL_PATH),
+        help="Directory for the exported model.",
+    )
+    parser.add_argument(
+        "--quantization",
+        type=str,
+        default="avx512_vnni",
+        choices=QUANTIZATION_CONFIGS,
+        help="Target CPU instruction set for dynamic int8 quantization.",
+    )
+    parser.add_argument(
+        "--min-cosine",
+        type=float,
+        default=0.98,
+        help="Lowest accepted cosine similarity between torch and onnx vectors.",
+    )
+    parser.add_argument(
+        "--skip-export",
+        action="store_true",
+        help="Only validate an already exported model.",
+    )
+    args = parser.parse_args()
+
+    file_name = f"onnx/model_qint8_{args.quantization}.onnx"
+    if not args.skip_export:
+        file_name = export(args.output, args.quantization)
+
+    if not validate(args.output, file_name, args.min_cosine):
+        print("Validation FAILED.")
+        sys.exit(1)
+
+    print("Validation PASSED.")
+    print(
+        f"Set EMBEDDING_ENGINE=onnx, EMBEDDING_ONNX_MODEL_PATH={args.output} and "
+        f"EMBEDDING_ONNX_FILE_NAME={file_name} to use it."
+    )
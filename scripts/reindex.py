@@ -0,0 +1,73 @@
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.db.session import AsyncSessionLocal
+from app.services import reindex_service
+
+
+async def reindex(
+    batch_size: Optional[int], restart: bool, allow_model_change: bool
+) -> None:
+    """
+    Re-embed all recipes into a new versioned collection and switch to it
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            job, should_run = await reindex_service.start_or_resume(
+                db, restart=restart, allow_model_change=allow_model_change
+            )
+        except reindex_service.ModelChangeError as ex:
+            print(ex)
+            sys.exit(1)
+        if not should_run:
+            print(
+                f"Reindex job {job.id} is already running "
+                f"({job.processed}/{job.total} recipes), try again later."
+            )
+            return
+
+        print(
+            f" - Job {job.id}: embedding into '{job.target_collection}' "
+            f"after recipe {job.last_recipe_id}..."
+        )
+        job = await reindex_service.run_reindex(db, job=job, batch_size=batch_size)
+        status = reindex_service.job_status(job)
+        print(
+            f"Reindex job {status.id} {status.status}: {status.processed} recipes "
+            f"in '{status.target_collection}'."
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Rebuild the vector collection, resuming an interrupted run."
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Recipes embedded per checkpoint (defaults to REINDEX_BATCH_SIZE).",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Start a new job instead of resuming an unfinished one.",
+    )
+    parser.add_argument(
+        "--allow-model-change",
+        action="store_true",
+        help="Reindex with a different embedding model, run it with the app stopped.",
+    )
+    args = parser.parse_args()
+    asyncio.run(
+        reindex(
+            batch_size=args.batch_size,
+            restart=args.restart,
+            allow_model_change=args.allow_model_change,
+        )
+    )
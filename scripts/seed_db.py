@@ -11,11 +11,15 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from app.core.vector_store import vector_store
 from app.db.session import AsyncSessionLocal
 from app.models.recipe import Recipe
+from app.models.recipe_facet_count import RecipeFacetCount
+from app.models.vector_outbox import VectorOutbox
 from app.schemas.recipe_create import RecipeCreate
 from app.services import recipe_service
 
 DATASETS_PATH = Path(__file__).resolve().parents[1] / "datasets"
 
+SEED_CHUNK_SIZE = 1000
+
 
 async def seed(lang: str) -> None:
     """
@@ -36,20 +40,30 @@ async def seed(lang: str) -> None:
     async with AsyncSessionLocal() as db:
         print(" - Cleaning old data...")
         await db.execute(delete(Recipe))
+        await db.execute(delete(RecipeFacetCount))
+        await db.execute(delete(VectorOutbox))
         await db.commit()
 
         print(f" - Loading recipes from {recipes_path}...")
         with open(recipes_path, encoding="utf-8") as f:
             recipes_data = json.load(f)
 
+        recipes_in = []
         for r_data in recipes_data:
             r_input = r_data.copy()
             if "id" in r_input:
                 del r_input["id"]
 
-            recipe_in = RecipeCreate(**r_input)
-            await recipe_service.create_recipe(db=db, recipe_in=recipe_in)
+            recipes_in.append(RecipeCreate(**r_input))
+
+        for start in range(0, len(recipes_in), SEED_CHUNK_SIZE):
+            chunk = recipes_in[start : start + SEED_CHUNK_SIZE]
+            await recipe_service.create_recipes_bulk(db=db, recipes_in=chunk)
+            print(f" - Inserted {start + len(chunk)}/{len(recipes_in)} recipes...")
+            indexed = await recipe_service.drain_vector_outbox(db)
+            print(f" - Indexed {indexed} vector store changes...")
 
+        vector_store.flush()
         print(f"Successfully inserted {len(recipes_data)} recipes.")
 
 
@@ -7,10 +7,15 @@ from httpx import AsyncClient
 from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
+from app.core.config import settings
+from app.core.ingredient_index import IngredientIndex
+from app.core.pagination import encode_cursor
 from app.core.vector_store import VectorStore
 from app.models.recipe import Recipe
+from app.models.recipe_facet_count import RecipeFacetCount
+from app.models.reindex_job import ReindexJob
 from app.schemas import RecipeCreate
-from app.services import recipe_service
+from app.services import recipe_service, reindex_service
 
 BASE_DIR = Path(__file__).parents[3]
 DATASETS_DIR = BASE_DIR / "datasets"
@@ -75,6 +80,27 @@ class TestRecipeOperations:
         assert response.status_code == 201
         return cast(Dict[str, Any], response.json())
 
+    @pytest.fixture
+    async def built_ingredient_index(
+        self,
+        async_client: AsyncClient,
+        db_engine: AsyncEngine,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> IngredientIndex:
+        # The lifespan doesn't run under ASGITransport, build the index the
+        # way startup does, on the cleaned database
+        index = IngredientIndex()
+        monkeypatch.setattr(recipe_service, "ingredient_index", index)
+        async with async_sessionmaker(bind=db_engine)() as session:
+            await recipe_service.build_ingredient_index(session)
+        assert index.ready
+        return index
+
+    @pytest.fixture
+    def admin_headers(self, monkeypatch: pytest.MonkeyPatch) -> Dict[str, str]:
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", "test-admin-token")
+        return {"X-Admin-Token": "test-admin-token"}
+
     @pytest.mark.smoke
     async def test_create_recipe(self, async_client: AsyncClient) -> None:
         new_recipe = self.BASE_RECIPE_DATA.copy()
@@ -146,6 +172,87 @@ class TestRecipeOperations:
         actual_ingredients = set(ing["name"] for ing in data["ingredients"])
         assert actual_ingredients == set(new_ingredients)
 
+    async def test_update_image_urls_skips_reindexing(
+        self,
+        async_client: AsyncClient,
+        existing_recipe: Dict[str, Any],
+        test_vector_store: VectorStore,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        upserts: list[int] = []
+        original_upsert = test_vector_store.upsert_recipes
+
+        async def tracking_upsert(batch: Any, *args: Any, **kwargs: Any) -> None:
+            upserts.extend(doc.recipe_id for doc in batch)
+            await original_upsert(batch, *args, **kwargs)
+
+        monkeypatch.setattr(test_vector_store, "upsert_recipes", tracking_upsert)
+
+        recipe_id = existing_recipe["id"]
+        response = await async_client.patch(
+            f"/api/v1/recipes/{recipe_id}",
+            json={"image_urls": ["https://example.com/recipe.jpg"]},
+        )
+        assert response.status_code == 200
+        assert response.json()["image_urls"] == ["https://example.com/recipe.jpg"]
+        assert upserts == []
+
+        response = await async_client.patch(
+            f"/api/v1/recipes/{recipe_id}", json={"title": "Reworded Title"}
+        )
+        assert response.status_code == 200
+        assert upserts == [recipe_id]
+
+    async def test_update_embedded_attribute_reembeds_once(
+        self,
+        async_client: AsyncClient,
+        existing_recipe: Dict[str, Any],
+        test_vector_store: VectorStore,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        upserts: list[int] = []
+        metadata_updates: list[Dict[str, Any]] = []
+        original_upsert = test_vector_store.upsert_recipes
+        original_update_metadata = test_vector_store.update_metadata
+
+        async def tracking_upsert(batch: Any, *args: Any, **kwargs: Any) -> None:
+            upserts.extend(doc.recipe_id for doc in batch)
+            await original_upsert(batch, *args, **kwargs)
+
+        async def tracking_update_metadata(
+            recipe_id: int, metadata: Dict[str, Any], *args: Any, **kwargs: Any
+        ) -> None:
+            metadata_updates.append(metadata)
+            await original_update_metadata(recipe_id, metadata, *args, **kwargs)
+
+        monkeypatch.setattr(test_vector_store, "upsert_recipes", tracking_upsert)
+        monkeypatch.setattr(
+            test_vector_store, "update_metadata", tracking_update_metadata
+        )
+
+        # Cuisine is part of the embedded document, the new vector carries
+        # the new metadata and no separate metadata update is sent
+        recipe_id = existing_recipe["id"]
+        response = await async_client.patch(
+            f"/api/v1/recipes/{recipe_id}", json={"cuisine": "OtherCuisine"}
+        )
+        assert response.status_code == 200
+        assert upserts == [recipe_id]
+        assert metadata_updates == []
+
+        response = await async_client.patch(
+            f"/api/v1/recipes/{recipe_id}", json={"cuisine": "OtherCuisine"}
+        )
+        assert response.status_code == 200
+        assert upserts == [recipe_id]
+        assert metadata_updates == []
+
+        response = await async_client.get(
+            "/api/v1/recipes/search/",
+            params={"q": "standard", "cuisine": "OtherCuisine"},
+        )
+        assert [r["id"] for r in response.json()] == [recipe_id]
+
     async def test_update_recipe_not_found(
         self, async_client: AsyncClient, existing_recipe: Dict[str, Any]
     ) -> None:
@@ -156,6 +263,560 @@ class TestRecipeOperations:
         )
         assert response.status_code == 404
 
+    async def test_search_filters_by_attributes(
+        self, async_client: AsyncClient
+    ) -> None:
+        recipes = [
+            ("Quick Italian Pasta", "Italian", 15),
+            ("Slow Italian Stew", "Italian", 180),
+            ("Quick Thai Noodles", "Thai", 15),
+        ]
+        for title, cuisine, cooking_time in recipes:
+            payload = self.BASE_RECIPE_DATA.copy()
+            payload.update(
+                title=title, cuisine=cuisine, cooking_time_in_minutes=cooking_time
+            )
+            response = await async_client.post("/api/v1/recipes/", json=payload)
+            assert response.status_code == 201
+
+        response = await async_client.get(
+            "/api/v1/recipes/search/",
+            params={"q": "pasta", "cuisine": "Italian", "max_cooking_time": 30},
+        )
+        assert response.status_code == 200
+        assert [r["title"] for r in response.json()] == ["Quick Italian Pasta"]
+
+    async def test_batch_search_groups_results_per_query(
+        self, async_client: AsyncClient, test_vector_store: VectorStore
+    ) -> None:
+        recipes = [
+            ("Quick Italian Pasta", "Italian", 15),
+            ("Slow Italian Stew", "Italian", 180),
+            ("Quick Thai Noodles", "Thai", 15),
+        ]
+        for title, cuisine, cooking_time in recipes:
+            payload = self.BASE_RECIPE_DATA.copy()
+            payload.update(
+                title=title, cuisine=cuisine, cooking_time_in_minutes=cooking_time
+            )
+            response = await async_client.post("/api/v1/recipes/", json=payload)
+            assert response.status_code == 201
+
+        encoded: list[int] = []
+        original_encode = test_vector_store._encode_batch
+
+        def tracking_encode(texts: list[str], *args: Any) -> Any:
+            encoded.append(len(texts))
+            return original_encode(texts, *args)
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(test_vector_store, "_encode_batch", tracking_encode)
+            response = await async_client.post(
+                "/api/v1/recipes/search/batch",
+                json={
+                    "queries": [
+                        {"q": "noodles batch", "limit": 1},
+                        {"q": "pasta batch", "cuisine": "Italian", "limit": 5},
+                    ],
+                    "view": "summary",
+                },
+            )
+        assert response.status_code == 200
+        assert encoded == [2]
+
+        first, second = response.json()
+        assert first["q"] == "noodles batch"
+        assert len(first["recipes"]) == 1
+        assert second["q"] == "pasta batch"
+        assert {r["cuisine"] for r in second["recipes"]} == {"Italian"}
+        assert "instructions" not in second["recipes"][0]
+
+    async def test_similar_recipes_exclude_the_recipe_itself(
+        self, async_client: AsyncClient
+    ) -> None:
+        recipe_ids = []
+        for title in ("Tomato Soup", "Tomato Bisque", "Chocolate Cake"):
+            payload = self.BASE_RECIPE_DATA.copy()
+            payload["title"] = title
+            response = await async_client.post("/api/v1/recipes/", json=payload)
+            assert response.status_code == 201
+            recipe_ids.append(response.json()["id"])
+        soup_id, bisque_id, _ = recipe_ids
+
+        response = await async_client.get(
+            f"/api/v1/recipes/{soup_id}/similar", params={"view": "summary"}
+        )
+        assert response.status_code == 200
+        similar_ids = [r["id"] for r in response.json()]
+        assert sorted(similar_ids) == sorted(recipe_ids[1:])
+        assert "instructions" not in response.json()[0]
+
+        key = (recipe_service.vector_store.collection_name, soup_id)
+        assert recipe_service.similar_recipes.get(key) is not None
+
+        # Re-embedding a neighbour drops the cached list
+        response = await async_client.patch(
+            f"/api/v1/recipes/{bisque_id}", json={"title": "Creamy Tomato Bisque"}
+        )
+        assert response.status_code == 200
+        assert recipe_service.similar_recipes.get(key) is None
+
+        response = await async_client.get(f"/api/v1/recipes/{soup_id + 100}/similar")
+        assert response.status_code == 404
+
+    async def test_filter_prefix_and_fuzzy_match(
+        self, async_client: AsyncClient
+    ) -> None:
+        payload = self.BASE_RECIPE_DATA.copy()
+        payload.update(title="Cheese Plate", ingredients=["Parmesan cheese", "Grapes"])
+        response = await async_client.post("/api/v1/recipes/", json=payload)
+        assert response.status_code == 201
+
+        cases = [
+            ("parmes", "exact", []),
+            ("parmes", "prefix", ["Cheese Plate"]),
+            ("mesan", "prefix", []),
+            ("parmesan chese", "fuzzy", ["Cheese Plate"]),
+        ]
+        for include, match, expected_titles in cases:
+            response = await async_client.get(
+                "/api/v1/recipes/",
+                params={"include_ingredients": include, "match": match},
+            )
+            assert response.status_code == 200
+            assert [r["title"] for r in response.json()] == expected_titles
+
+    async def test_pantry_search_ranks_by_coverage(
+        self, async_client: AsyncClient
+    ) -> None:
+        recipes = [
+            ("Omelette Deluxe", ["eggs", "milk", "butter"]),
+            ("Plain Omelette", ["egg", "milk"]),
+            ("Tomato Salad", ["tomatoes", "onion", "olive oil"]),
+        ]
+        for title, ingredients in recipes:
+            payload = self.BASE_RECIPE_DATA.copy()
+            payload.update(title=title, ingredients=ingredients)
+            response = await async_client.post("/api/v1/recipes/", json=payload)
+            assert response.status_code == 201
+
+        response = await async_client.get(
+            "/api/v1/recipes/pantry/",
+            params={"ingredients": "Eggs, milk, tomato", "max_missing": 1},
+        )
+        assert response.status_code == 200
+        data = response.json()
+
+        assert [r["title"] for r in data] == ["Plain Omelette", "Omelette Deluxe"]
+        assert data[0]["coverage"] == 1.0
+        assert data[1]["covered_ingredients"] == 2
+        assert data[1]["missing_ingredients"] == ["butter"]
+
+    async def test_ingredient_index_matches_sql_after_writes(
+        self, async_client: AsyncClient, built_ingredient_index: IngredientIndex
+    ) -> None:
+        async def get_both(
+            path: str, params: Dict[str, Any]
+        ) -> tuple[list[Any], list[Any]]:
+            response = await async_client.get(path, params=params)
+            assert response.status_code == 200
+            indexed = response.json()
+            built_ingredient_index.ready = False
+            try:
+                response = await async_client.get(path, params=params)
+            finally:
+                built_ingredient_index.ready = True
+            assert response.status_code == 200
+            return indexed, response.json()
+
+        async def listed_ids(params: Dict[str, Any]) -> list[int]:
+            indexed, fallback = await get_both("/api/v1/recipes/", params)
+            assert [r["id"] for r in indexed] == [r["id"] for r in fallback]
+            return [r["id"] for r in indexed]
+
+        async def pantry_matches() -> list[tuple[int, list[str]]]:
+            indexed, fallback = await get_both(
+                "/api/v1/recipes/pantry/",
+                {"ingredients": "eggs, milk, tomato", "max_missing": 1},
+            )
+            matches = [(r["id"], r["missing_ingredients"]) for r in indexed]
+            assert matches == [(r["id"], r["missing_ingredients"]) for r in fallback]
+            return matches
+
+        ids = {}
+        for title, ingredients in [
+            ("Index Omelette", ["eggs", "milk", "butter"]),
+            ("Index Tomato Salad", ["tomatoes", "onion", "olive oil"]),
+            ("Index Shakshuka", ["egg", "tomato", "pepper"]),
+        ]:
+            payload = self.BASE_RECIPE_DATA.copy()
+            payload.update(title=title, ingredients=ingredients)
+            response = await async_client.post("/api/v1/recipes/", json=payload)
+            assert response.status_code == 201
+            ids[title] = response.json()["id"]
+        omelette, salad, shakshuka = ids.values()
+
+        assert await listed_ids({"include_ingredients": "egg"}) == [
+            shakshuka,
+            omelette,
+        ]
+        assert await listed_ids(
+            {"include_ingredients": "tomato", "exclude_ingredients": "onion"}
+        ) == [shakshuka]
+        assert await pantry_matches() == [
+            (shakshuka, ["pepper"]),
+            (omelette, ["butter"]),
+        ]
+
+        response = await async_client.patch(
+            f"/api/v1/recipes/{shakshuka}", json={"ingredients": ["tomato", "onion"]}
+        )
+        assert response.status_code == 200
+        assert await listed_ids({"include_ingredients": "egg"}) == [omelette]
+        assert await listed_ids({"include_ingredients": "onion"}) == [
+            shakshuka,
+            salad,
+        ]
+        assert await pantry_matches() == [
+            (omelette, ["butter"]),
+            (shakshuka, ["onion"]),
+        ]
+
+        response = await async_client.delete(f"/api/v1/recipes/{omelette}")
+        assert response.status_code == 200
+        assert await listed_ids({"include_ingredients": "egg"}) == []
+        assert await listed_ids({"exclude_ingredients": "milk"}) == [
+            shakshuka,
+            salad,
+        ]
+        assert await pantry_matches() == [(shakshuka, ["onion"])]
+
+    async def test_search_pages_with_cursor(
+        self, async_client: AsyncClient, test_vector_store: VectorStore
+    ) -> None:
+        for i in range(5):
+            payload = self.BASE_RECIPE_DATA.copy()
+            payload["title"] = f"Pasta Variation {i}"
+            response = await async_client.post("/api/v1/recipes/", json=payload)
+            assert response.status_code == 201
+
+        response = await async_client.get(
+            "/api/v1/recipes/search/", params={"q": "pasta", "limit": 5}
+        )
+        assert response.status_code == 200
+        expected_ids = [r["id"] for r in response.json()]
+
+        params: Dict[str, Any] = {"q": "pasta", "limit": 2}
+        response = await async_client.get("/api/v1/recipes/search/", params=params)
+        first_page = [r["id"] for r in response.json()]
+        cursor = response.headers["X-Next-Cursor"]
+
+        searches: list[int] = []
+        original_search = test_vector_store.search
+
+        async def tracking_search(*args: Any, **kwargs: Any) -> list[int]:
+            searches.append(1)
+            return await original_search(*args, **kwargs)
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(test_vector_store, "search", tracking_search)
+            response = await async_client.get(
+                "/api/v1/recipes/search/", params={**params, "cursor": cursor}
+            )
+        second_page = [r["id"] for r in response.json()]
+
+        assert first_page + second_page == expected_ids[:4]
+        if not test_vector_store.backend.supports_sql_join:
+            assert searches == []
+
+        response = await async_client.get(
+            "/api/v1/recipes/search/", params={"q": "soup", "cursor": cursor}
+        )
+        assert response.status_code == 400
+
+    async def test_list_pages_with_keyset_cursor(
+        self, async_client: AsyncClient
+    ) -> None:
+        created_ids = []
+        for i in range(5):
+            payload = self.BASE_RECIPE_DATA.copy()
+            payload["title"] = f"Listed Recipe {i}"
+            response = await async_client.post("/api/v1/recipes/", json=payload)
+            created_ids.append(response.json()["id"])
+
+        pages: list[int] = []
+        params: Dict[str, Any] = {"limit": 2}
+        while True:
+            response = await async_client.get("/api/v1/recipes/", params=params)
+            assert response.status_code == 200
+            pages.extend(r["id"] for r in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+            params["cursor"] = cursor
+
+        assert pages == sorted(created_ids, reverse=True)
+
+        response = await async_client.get(
+            "/api/v1/recipes/", params={"cursor": "not-a-cursor"}
+        )
+        assert response.status_code == 400
+
+    async def test_list_filters_and_sorts_by_cooking_time(
+        self, async_client: AsyncClient
+    ) -> None:
+        for cooking_time, cuisine in [(40, "Italian"), (10, "Italian"), (5, "French")]:
+            payload = self.BASE_RECIPE_DATA.copy()
+            payload["title"] = f"{cuisine} {cooking_time}"
+            payload["cooking_time_in_minutes"] = cooking_time
+            payload["cuisine"] = cuisine
+            response = await async_client.post("/api/v1/recipes/", json=payload)
+            assert response.status_code == 201
+
+        params: Dict[str, Any] = {
+            "cuisine": "Italian",
+            "sort": "cooking_time",
+            "limit": 1,
+        }
+        response = await async_client.get("/api/v1/recipes/", params=params)
+        assert [r["cooking_time_in_minutes"] for r in response.json()] == [10]
+
+        params["cursor"] = response.headers["X-Next-Cursor"]
+        response = await async_client.get("/api/v1/recipes/", params=params)
+        assert [r["cooking_time_in_minutes"] for r in response.json()] == [40]
+        assert "X-Next-Cursor" not in response.headers
+
+        response = await async_client.get(
+            "/api/v1/recipes/", params={**params, "sort": "title"}
+        )
+        assert response.status_code == 400
+
+        # A sort key of the wrong type is rejected before reaching the query
+        forged = encode_cursor({"sort": "cooking_time", "k": "ten", "id": 1})
+        response = await async_client.get(
+            "/api/v1/recipes/", params={**params, "cursor": forged}
+        )
+        assert response.status_code == 400
+
+        response = await async_client.get(
+            "/api/v1/recipes/", params={"max_cooking_time": 10, "sort": "title"}
+        )
+        assert [r["title"] for r in response.json()] == ["French 5", "Italian 10"]
+
+    async def test_facets_follow_writes(self, async_client: AsyncClient) -> None:
+        created = []
+        for cuisine, ingredients in [
+            ("Italian", ["Tomatoes", "basil"]),
+            ("Italian", ["tomatoes", "garlic"]),
+            ("French", ["butter"]),
+        ]:
+            payload = {
+                **self.BASE_RECIPE_DATA,
+                "cuisine": cuisine,
+                "ingredients": ingredients,
+            }
+            response = await async_client.post("/api/v1/recipes/", json=payload)
+            created.append(response.json())
+
+        await async_client.patch(
+            f"/api/v1/recipes/{created[2]['id']}", json={"cuisine": "Italian"}
+        )
+        await async_client.delete(f"/api/v1/recipes/{created[1]['id']}")
+
+        response = await async_client.get("/api/v1/recipes/facets")
+        assert response.status_code == 200
+        facets = response.json()
+        assert facets["total"] == 2
+        assert facets["cuisine"] == [{"value": "Italian", "count": 2}]
+        assert {"value": "tomatoes", "count": 1} in facets["ingredients"]
+        assert all(item["value"] != "garlic" for item in facets["ingredients"])
+
+        response = await async_client.get(
+            "/api/v1/recipes/facets", params={"include_ingredients": "tomato"}
+        )
+        facets = response.json()
+        assert facets["total"] == 1
+        assert [item["value"] for item in facets["ingredients"]] == [
+            "basil",
+            "tomatoes",
+        ]
+
+    async def test_summary_view_leaves_out_instructions(
+        self, async_client: AsyncClient, existing_recipe: Dict[str, Any]
+    ) -> None:
+        response = await async_client.get(
+            "/api/v1/recipes/", params={"view": "summary"}
+        )
+        assert response.status_code == 200
+        summary = response.json()[0]
+        assert summary["id"] == existing_recipe["id"]
+        assert summary["ingredients"] == existing_recipe["ingredients"]
+        assert "instructions" not in summary
+
+        response = await async_client.get(
+            "/api/v1/recipes/search/", params={"q": "standard", "view": "summary"}
+        )
+        assert response.status_code == 200
+        assert all("instructions" not in r for r in response.json())
+
+    async def test_background_mode_queues_vector_changes(
+        self,
+        async_client: AsyncClient,
+        db_engine: AsyncEngine,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(settings, "VECTOR_SYNC_MODE", "background")
+
+        response = await async_client.post(
+            "/api/v1/recipes/", json=self.BASE_RECIPE_DATA
+        )
+        assert response.status_code == 201
+
+        response = await async_client.get("/api/v1/metrics/vector-indexer")
+        assert response.json()["pending"] == 1
+
+        async with async_sessionmaker(bind=db_engine)() as session:
+            assert await recipe_service.drain_vector_outbox(session) == 1
+
+        response = await async_client.get("/api/v1/metrics/vector-indexer")
+        assert response.json()["pending"] == 0
+        response = await async_client.get(
+            "/api/v1/recipes/search/", params={"q": "standard"}
+        )
+        assert response.json()[0]["title"] == self.BASE_RECIPE_DATA["title"]
+
+    async def test_admin_endpoints_require_token(
+        self,
+        async_client: AsyncClient,
+        admin_headers: Dict[str, str],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        url = "/api/v1/admin/reindex/0"
+        response = await async_client.get(url)
+        assert response.status_code == 401
+        response = await async_client.get(url, headers={"X-Admin-Token": "wrong"})
+        assert response.status_code == 401
+        response = await async_client.get(url, headers=admin_headers)
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Reindex job not found"
+
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", "")
+        response = await async_client.post(
+            "/api/v1/admin/reindex", headers={"X-Admin-Token": ""}
+        )
+        assert response.status_code == 404
+
+    async def test_reindex_switches_to_new_collection(
+        self,
+        async_client: AsyncClient,
+        db_engine: AsyncEngine,
+        test_vector_store: VectorStore,
+        admin_headers: Dict[str, str],
+    ) -> None:
+        for title in ("First Reindexed", "Second Reindexed"):
+            response = await async_client.post(
+                "/api/v1/recipes/", json={**self.BASE_RECIPE_DATA, "title": title}
+            )
+            assert response.status_code == 201
+
+        session_factory = async_sessionmaker(bind=db_engine, expire_on_commit=False)
+        async with session_factory() as session:
+            job, should_run = await reindex_service.start_or_resume(session)
+            assert should_run
+            # A failed job is resumed from its checkpoint, not started over
+            job.status = "failed"
+            await session.commit()
+
+        async with session_factory() as session:
+            resumed, should_run = await reindex_service.start_or_resume(session)
+            assert should_run and resumed.id == job.id
+            await reindex_service.run_reindex(session, job=resumed, batch_size=1)
+
+        try:
+            assert test_vector_store.collection_name == job.target_collection
+            response = await async_client.get(
+                f"/api/v1/admin/reindex/{job.id}", headers=admin_headers
+            )
+            status = response.json()
+            assert status["status"] == "completed"
+            assert status["processed"] == status["total"] == 2
+
+            response = await async_client.get(
+                "/api/v1/recipes/search/", params={"q": "reindexed"}
+            )
+            assert len(response.json()) == 2
+        finally:
+            test_vector_store.use_collection(test_vector_store.base_collection_name)
+            test_vector_store.get_backend(job.target_collection).drop()
+
+    async def test_reindex_refuses_model_change(
+        self,
+        async_client: AsyncClient,
+        db_engine: AsyncEngine,
+        test_vector_store: VectorStore,
+        admin_headers: Dict[str, str],
+    ) -> None:
+        session_factory = async_sessionmaker(bind=db_engine, expire_on_commit=False)
+        async with session_factory() as session:
+            session.add(
+                ReindexJob(
+                    base_collection=test_vector_store.base_collection_name,
+                    target_collection=test_vector_store.base_collection_name,
+                    model_id="another/embedding-model",
+                    status="completed",
+                )
+            )
+            await session.commit()
+
+        response = await async_client.post(
+            "/api/v1/admin/reindex", headers=admin_headers
+        )
+        assert response.status_code == 409
+
+        async with session_factory() as session:
+            job, should_run = await reindex_service.start_or_resume(
+                session, allow_model_change=True
+            )
+            assert should_run and job.model_id != "another/embedding-model"
+
+    async def test_failing_outbox_entry_does_not_block_its_batch(
+        self,
+        async_client: AsyncClient,
+        db_engine: AsyncEngine,
+        test_vector_store: VectorStore,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(settings, "VECTOR_SYNC_MODE", "background")
+        monkeypatch.setattr(settings, "VECTOR_OUTBOX_MAX_ATTEMPTS", 1)
+
+        recipe_ids = []
+        for title in ("Rejected Recipe", "Healthy Recipe"):
+            response = await async_client.post(
+                "/api/v1/recipes/", json={**self.BASE_RECIPE_DATA, "title": title}
+            )
+            recipe_ids.append(response.json()["id"])
+        rejected_id, healthy_id = recipe_ids
+
+        original_upsert = test_vector_store.upsert_recipes
+
+        async def rejecting_upsert(batch: Any, *args: Any, **kwargs: Any) -> None:
+            if any(doc.recipe_id == rejected_id for doc in batch):
+                raise ValueError("Document rejected")
+            await original_upsert(batch, *args, **kwargs)
+
+        monkeypatch.setattr(test_vector_store, "upsert_recipes", rejecting_upsert)
+
+        async with async_sessionmaker(bind=db_engine)() as session:
+            assert await recipe_service.sync_vector_outbox(session) == 2
+            # The rejected entry gave up and is no longer claimed
+            assert await recipe_service.sync_vector_outbox(session) == 0
+
+        stats = (await async_client.get("/api/v1/metrics/vector-indexer")).json()
+        assert stats["pending"] == 0
+        assert stats["failed"] == 1
+        assert test_vector_store.backend.get_embeddings([healthy_id])
+        assert not test_vector_store.backend.get_embeddings([rejected_id])
+
     async def test_delete_recipe(
         self, async_client: AsyncClient, existing_recipe: Dict[str, Any]
     ) -> None:
@@ -195,16 +856,18 @@ class BaseTestRecipeEvaluation:
         test_vector_store.clear()
         async with TestSessionLocal() as session:
             await session.execute(delete(Recipe))
+            await session.execute(delete(RecipeFacetCount))
             await session.commit()
 
+            recipes_in = []
             for recipe in self.recipes_sample:
                 r_data = recipe.copy()
                 if "id" in r_data:
                     del r_data["id"]
 
-                recipe_in = RecipeCreate(**r_data)
+                recipes_in.append(RecipeCreate(**r_data))
 
-                await recipe_service.create_recipe(db=session, recipe_in=recipe_in)
+            await recipe_service.create_recipes_bulk(db=session, recipes_in=recipes_in)
         yield
 
         recipe_service.vector_store = original_store
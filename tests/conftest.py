@@ -18,8 +18,13 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy_utils import create_database, database_exists, drop_database
 
 from alembic import command
+from app.core.config import settings
 from app.core.vector_store import VectorStore
 from app.models.recipe import Recipe
+from app.models.recipe_facet_count import RecipeFacetCount
+from app.models.reindex_job import ReindexJob
+from app.models.vector_outbox import VectorOutbox
+from app.services import recipe_service
 from tests.testing_config import testing_settings
 
 
@@ -34,6 +39,8 @@ def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
 def set_testing_settings() -> None:
     os.environ["POSTGRES_DB"] = testing_settings.TEST_DB_NAME
     os.environ["CHROMA_COLLECTION_NAME"] = "recipes_test_collection"
+    # Tests search right after writing, apply vector changes before returning
+    settings.VECTOR_SYNC_MODE = "inline"
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -64,10 +71,12 @@ async def db_engine() -> AsyncGenerator[AsyncEngine, None]:
 
 @pytest.fixture(scope="session")
 def test_vector_store() -> Generator[VectorStore, None, None]:
-    store = VectorStore(force_new=True)
+    store = VectorStore(
+        force_new=True, database_url=testing_settings.SYNC_TEST_DATABASE_ADMIN_URL
+    )
     yield store
     try:
-        store.client.delete_collection(store.collection_name)
+        store.drop()
     except Exception:
         pass
 
@@ -92,8 +101,13 @@ async def async_client(
 
     if not is_eval_test:
         test_vector_store.clear()
+        recipe_service.search_candidates.clear()
+        recipe_service.similar_recipes.clear()
         async with db_engine.begin() as conn:
             await conn.execute(delete(Recipe))
+            await conn.execute(delete(RecipeFacetCount))
+            await conn.execute(delete(VectorOutbox))
+            await conn.execute(delete(ReindexJob))
 
     async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
         async with async_sessionmaker(
@@ -0,0 +1,52 @@
+import time
+
+from app.core.cache import TTLCache
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache: TTLCache[str, int] = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_cache_expires_entries_after_ttl() -> None:
+    cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_cache_counts_hits_and_misses() -> None:
+    cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=60)
+    cache.get("a")
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("a")
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+
+
+def test_cache_discards_matching_entries() -> None:
+    cache: TTLCache[str, list[int]] = TTLCache(max_size=10, ttl_seconds=60)
+    cache.set("a", [1, 2])
+    cache.set("b", [3])
+    cache.set("c", [2, 4])
+
+    assert cache.discard(lambda key, value: 2 in value) == 2
+
+    assert cache.get("a") is None
+    assert cache.get("b") == [3]
+    assert cache.get("c") is None
@@ -0,0 +1,54 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.core.vector_store import EmbeddingBatcher
+
+
+@pytest.mark.asyncio
+async def test_batcher_merges_concurrent_requests() -> None:
+    calls: list[list[str]] = []
+
+    def encode(texts: list[str]) -> np.ndarray:
+        calls.append(texts)
+        return np.array([[float(len(t))] for t in texts])
+
+    batcher = EmbeddingBatcher(encode, max_batch_size=8, max_wait_ms=20)
+    texts = ["a", "bb", "ccc", "dddd"]
+
+    results = await asyncio.gather(*[batcher.submit(t) for t in texts])
+    await batcher.close()
+
+    assert len(calls) == 1
+    assert [r[0] for r in results] == [1.0, 2.0, 3.0, 4.0]
+    stats = batcher.stats()
+    assert stats["batches"] == 1
+    assert stats["items"] == 4
+    assert stats["largest_batch"] == 4
+
+
+@pytest.mark.asyncio
+async def test_batcher_respects_max_batch_size() -> None:
+    calls: list[list[str]] = []
+
+    def encode(texts: list[str]) -> np.ndarray:
+        calls.append(texts)
+        return np.zeros((len(texts), 2))
+
+    batcher = EmbeddingBatcher(encode, max_batch_size=2, max_wait_ms=20)
+    await asyncio.gather(*[batcher.submit(str(i)) for i in range(5)])
+    await batcher.close()
+
+    assert [len(c) for c in calls] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_batcher_propagates_encode_errors() -> None:
+    def encode(texts: list[str]) -> np.ndarray:
+        raise RuntimeError("model failure")
+
+    batcher = EmbeddingBatcher(encode, max_batch_size=4, max_wait_ms=1)
+    with pytest.raises(RuntimeError, match="model failure"):
+        await batcher.submit("query")
+    await batcher.close()
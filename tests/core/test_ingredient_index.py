@@ -0,0 +1,59 @@
+from typing import AsyncIterator, List
+
+import pytest
+
+from app.core.ingredient_index import IndexRow, IngredientIndex
+
+
+async def _batches(rows: List[IndexRow]) -> AsyncIterator[List[IndexRow]]:
+    yield rows[:2]
+    yield rows[2:]
+
+
+@pytest.fixture
+async def index() -> IngredientIndex:
+    index = IngredientIndex()
+    await index.build(
+        _batches(
+            [
+                (1, [["egg", "eggs"], ["milk"]]),
+                (2, [["tomato", "tomatoes"], ["egg", "eggs"]]),
+                (3, [["milk"], ["rice"]]),
+            ]
+        )
+    )
+    return index
+
+
+@pytest.mark.asyncio
+async def test_index_combines_include_and_exclude(index: IngredientIndex) -> None:
+    assert index.filter_ids([["egg", "eggs"]]).tolist() == [1, 2]
+    assert index.filter_ids([["egg"], ["milk"]]).tolist() == [1]
+    assert index.filter_ids([], ["milk"]).tolist() == [2]
+    assert index.filter_ids([["rice"]], ["milk"]).tolist() == []
+
+
+@pytest.mark.asyncio
+async def test_index_applies_incremental_writes(index: IngredientIndex) -> None:
+    index.add(4, [["egg"], ["rice"]])
+    index.update(1, [["egg", "eggs"], ["milk"]], [["rice"]])
+    index.remove(2, [["tomato", "tomatoes"], ["egg", "eggs"]])
+
+    assert index.filter_ids([["egg"]]).tolist() == [4]
+    assert index.filter_ids([["rice"]]).tolist() == [1, 3, 4]
+    assert index.filter_ids([]).tolist() == [1, 3, 4]
+
+    stats = index.stats()
+    assert stats["recipes"] == 3
+    assert stats["ingredients"] == 5
+    assert stats["terms"] == 3
+    assert stats["memory_bytes"] > 0
+
+
+@pytest.mark.asyncio
+async def test_pantry_coverage_counts_ingredients(index: IngredientIndex) -> None:
+    coverage = index.pantry_coverage(["eggs", "egg", "milk"])
+
+    assert coverage.recipe_ids.tolist() == [1, 2, 3]
+    assert coverage.covered.tolist() == [2, 1, 1]
+    assert coverage.totals.tolist() == [2, 2, 2]
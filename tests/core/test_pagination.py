@@ -0,0 +1,16 @@
+import pytest
+
+from app.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip() -> None:
+    cursor = encode_cursor({"s": "abc", "o": 12})
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == {"s": "abc", "o": 12}
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "W10", "ё"])
+def test_malformed_cursor_is_rejected(cursor: str) -> None:
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
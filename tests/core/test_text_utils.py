@@ -0,0 +1,36 @@
+from app.core.text_utils import (
+    compute_word_forms,
+    get_ingredient_terms,
+    get_word_forms,
+    load_vocabulary,
+    word_forms_stats,
+)
+
+
+def test_ingredient_terms_cover_word_sequences() -> None:
+    terms = set(get_ingredient_terms(["Extra-virgin Olive Oil", "Cherry tomatoes"]))
+
+    assert {"olive oil", "oil", "extra virgin olive oil"} <= terms
+    assert {"tomatoes", "tomato", "cherry tomato"} <= terms
+
+
+def test_filter_forms_match_stored_terms() -> None:
+    terms = set(get_ingredient_terms(["помидоры", "Eggs"]))
+
+    assert get_word_forms("помидор") & terms
+    assert get_word_forms("egg") & terms
+    assert not get_word_forms("eggplant") & terms
+
+
+def test_word_forms_prefer_loaded_vocabulary() -> None:
+    try:
+        load_vocabulary({"mozzarella": ["mozzarella", "mozzarelle"]})
+        forms = get_word_forms(" Mozzarella ")
+        forms.add("mutated")
+
+        assert get_word_forms("mozzarella") == {"mozzarella", "mozzarelle"}
+        assert word_forms_stats()["vocabulary_size"] == 1
+    finally:
+        load_vocabulary({})
+
+    assert get_word_forms("mozzarella") == compute_word_forms("mozzarella")
@@ -0,0 +1,55 @@
+import re
+from typing import Any, Dict, List, Tuple
+
+from app.core.token_budget import DocumentSection, TokenBudget
+
+
+class WordTokenizer:
+    """
+    Fast-tokenizer stand-in with one token per word
+    """
+
+    is_fast = True
+
+    def __call__(self, text: str, **kwargs: Any) -> Dict[str, List[Tuple[int, int]]]:
+        return {"offset_mapping": [m.span() for m in re.finditer(r"\S+", text)]}
+
+
+def sections(instructions: str) -> List[DocumentSection]:
+    return [
+        DocumentSection("Title: Soup.", priority=2),
+        DocumentSection("Ingredients: leek, potato.", priority=1),
+        DocumentSection(f"Instructions: {instructions}", priority=0),
+        DocumentSection("Cuisine: French.", priority=2),
+    ]
+
+
+def test_fit_keeps_short_documents_whole() -> None:
+    budget = TokenBudget(WordTokenizer(), max_tokens=50)
+
+    assert budget.fit(sections("Boil.")) == [
+        "Title: Soup. Ingredients: leek, potato. Instructions: Boil. Cuisine: French."
+    ]
+
+
+def test_fit_truncates_instructions_first() -> None:
+    budget = TokenBudget(WordTokenizer(), max_tokens=12)
+
+    (document,) = budget.fit(sections("one two three four five six"))
+
+    # 7 tokens of other sections and 3 separators leave 2 for the instructions
+    assert document == (
+        "Title: Soup. Ingredients: leek, potato. Instructions: one Cuisine: French."
+    )
+
+
+def test_fit_splits_overflow_into_chunks() -> None:
+    budget = TokenBudget(WordTokenizer(), max_tokens=14)
+
+    chunks = budget.fit(sections("one two three four five six seven"), max_chunks=2)
+
+    assert chunks == [
+        "Title: Soup. Ingredients: leek, potato. Instructions: one two three "
+        "Cuisine: French.",
+        "Title: Soup. Ingredients: leek, potato. four five six seven Cuisine: French.",
+    ]
@@ -0,0 +1,95 @@
+from pathlib import Path
+
+import numpy as np
+
+from app.core.vector_backends import EmbeddedBackend
+
+
+def _backend(tmp_path: Path) -> EmbeddedBackend:
+    backend = EmbeddedBackend("recipes_unit", index_path=str(tmp_path))
+    backend.upsert(
+        [1, 2, 3],
+        np.array([[1.0, 0.0], [0.0, 1.0], [0.7, 0.7]], dtype=np.float32),
+        [
+            {"cuisine": "Italian", "cooking_time": 10},
+            {"cuisine": "Thai", "cooking_time": 40},
+            {"cuisine": "Italian", "cooking_time": 60},
+        ],
+        ["a", "b", "c"],
+    )
+    return backend
+
+
+def test_embedded_backend_returns_nearest_first(tmp_path: Path) -> None:
+    backend = _backend(tmp_path)
+
+    results = backend.query(np.array([[1.0, 0.1]], dtype=np.float32), n_results=2)
+
+    assert results == [[1, 3]]
+
+
+def test_embedded_backend_applies_where_filter(tmp_path: Path) -> None:
+    backend = _backend(tmp_path)
+
+    results = backend.query(
+        np.array([[1.0, 0.0]], dtype=np.float32),
+        n_results=5,
+        where={"$and": [{"cuisine": "Italian"}, {"cooking_time": {"$gte": 30}}]},
+    )
+
+    assert results == [[3]]
+
+
+def test_embedded_backend_persists_snapshot(tmp_path: Path) -> None:
+    backend = _backend(tmp_path)
+    backend.delete([1])
+    backend.flush()
+
+    reloaded = EmbeddedBackend("recipes_unit", index_path=str(tmp_path))
+    results = reloaded.query(np.array([[1.0, 0.0]], dtype=np.float32), n_results=5)
+
+    assert reloaded.count() == 2
+    assert results == [[3, 2]]
+
+    reloaded.upsert(
+        [4], np.array([[1.0, 0.0]], dtype=np.float32), [{"cuisine": ""}], ["d"]
+    )
+    assert reloaded.query(np.array([[1.0, 0.0]], dtype=np.float32), 1) == [[4]]
+
+    reloaded.drop()
+    assert not any(tmp_path.iterdir())
+
+
+def test_embedded_backend_ranks_only_requested_ids(tmp_path: Path) -> None:
+    backend = _backend(tmp_path)
+
+    results = backend.query_subset(
+        np.array([1.0, 0.0], dtype=np.float32), [2, 3, 99], n_results=5
+    )
+
+    assert results == [3, 2]
+    assert set(backend.get_embeddings([1, 99])) == {1}
+
+
+def test_embedded_backend_filters_follow_metadata_writes(tmp_path: Path) -> None:
+    backend = _backend(tmp_path)
+    query = np.array([[1.0, 0.0]], dtype=np.float32)
+
+    assert backend.query(query, 5, where={"cuisine": {"$in": ["Thai", "French"]}}) == [
+        [2]
+    ]
+    assert backend.query(
+        query,
+        5,
+        where={"$or": [{"cooking_time": {"$lt": 20}}, {"cuisine": {"$ne": "Italian"}}]},
+    ) == [[1, 2]]
+
+    backend.update_metadata([2], [{"cuisine": "Italian", "cooking_time": 15}])
+    backend.delete([1])
+    assert backend.query(query, 5, where={"cooking_time": {"$lte": 20}}) == [[2]]
+    assert backend.query(query, 5, where={"cuisine": "Italian"}) == [[3, 2]]
+
+    backend.flush()
+    reloaded = EmbeddedBackend("recipes_unit", index_path=str(tmp_path))
+    assert reloaded.query(query, 5, where={"cooking_time": {"$gte": 15}}) == [[3, 2]]
+    assert reloaded.query(query, 5, where={"difficulty": "easy"}) == [[]]
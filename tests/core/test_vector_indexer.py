@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from app.core.vector_indexer import VectorIndexer
+
+
+@pytest.mark.asyncio
+async def test_indexer_drains_backlog_and_survives_failures() -> None:
+    backlog = [3, 2]
+    drained = asyncio.Event()
+    failed = False
+
+    async def sync_batch() -> int:
+        nonlocal failed
+        if not failed:
+            failed = True
+            raise RuntimeError("vector store unavailable")
+        if backlog:
+            return backlog.pop(0)
+        drained.set()
+        return 0
+
+    indexer = VectorIndexer()
+    indexer.start(sync_batch, poll_seconds=60)
+    # The failed batch waits for a poll or a notify before retrying
+    await asyncio.sleep(0.01)
+    indexer.notify()
+    await asyncio.wait_for(drained.wait(), 1)
+    await indexer.stop()
+
+    stats = indexer.stats()
+    assert stats["running"] is False
+    assert stats["batches"] == 2
+    assert stats["entries"] == 5
+    assert stats["failures"] == 1
+    assert stats["last_error"] == "vector store unavailable"
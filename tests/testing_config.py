@@ -16,7 +16,7 @@ class TestingSettings(Settings):
             "avg_f1_score": 0.35,
             "avg_latency": 200,
         },
-        "JSONB GIN Filter": {"accuracy": 90.0, "avg_latency": 5},
+        "Ingredient Terms GIN Filter": {"accuracy": 90.0, "avg_latency": 5},
     }
 
     @property